@@ -1,4 +1,6 @@
 from app.api.routes import policememberroutes
 from app.api.routes import firroutes
 from app.api.routes import citizenroutes
-from app.api.routes import governmentroutes
\ No newline at end of file
+from app.api.routes import governmentroutes
+from app.api.routes import evidenceroutes
+from app.api.routes import auditroutes
\ No newline at end of file
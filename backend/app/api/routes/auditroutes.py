@@ -0,0 +1,51 @@
+# app/api/routes/auditroutes.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_db
+from app.models.audit import AuditLog
+from app.schemas.audit import AuditQueryResponse, AuditVerifyResponse
+from app.services.audit import audit_log, verify_chain
+from app.api.routes.governmentroutes import get_current_government
+
+router = APIRouter()
+
+
+@router.get("/events", response_model=AuditQueryResponse)
+def query_audit_events(
+    fir_id: Optional[str] = None,
+    actor_type: Optional[str] = Query(None, pattern="^(police|citizen|government)$"),
+    actor_id: Optional[str] = None,
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: dict = Depends(get_current_government),
+    db: Session = Depends(get_db),
+):
+    if not fir_id and not (actor_type and actor_id):
+        raise HTTPException(status_code=422, detail="Filter by fir_id or by actor_type and actor_id")
+
+    # Entries recorded moments ago may still be buffered
+    audit_log.flush()
+
+    q = db.query(AuditLog).filter(AuditLog.id > after_id)
+    if fir_id:
+        q = q.filter(AuditLog.fir_id == fir_id)
+    if actor_type and actor_id:
+        q = q.filter(AuditLog.actor_type == actor_type, AuditLog.actor_id == actor_id)
+    entries = q.order_by(AuditLog.id).limit(limit).all()
+    return {
+        "entries": entries,
+        "next_after_id": entries[-1].id if len(entries) == limit else None,
+    }
+
+
+@router.get("/verify", response_model=AuditVerifyResponse)
+def verify_audit_chain(
+    current_user: dict = Depends(get_current_government),
+    db: Session = Depends(get_db),
+):
+    audit_log.flush()
+    broken = verify_chain(db)
+    return {"intact": broken is None, "first_broken_id": broken}
@@ -0,0 +1,57 @@
+# app/api/routes/authroutes.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_db
+from app.services import tokens
+from app.services.audit import audit_log
+from app.utils.security import decode_access_token
+from app.schemas.auth import (
+    RefreshRequest,
+    TokenPair,
+    LogoutRequest,
+    RevokeSubjectRequest,
+    RevokeSubjectResponse,
+)
+from app.api.routes.governmentroutes import get_current_government
+
+router = APIRouter()
+
+# Any role's access token
+bearer = OAuth2PasswordBearer(tokenUrl="/auth/refresh")
+
+
+@router.post("/refresh", response_model=TokenPair)
+def refresh_tokens(body: RefreshRequest, db: Session = Depends(get_db)):
+    try:
+        return tokens.refresh(db, body.refresh_token)
+    except JWTError as e:
+        raise HTTPException(status_code=401, detail=str(e) or "Invalid refresh token")
+
+
+@router.post("/logout")
+def logout(body: LogoutRequest, token: str = Depends(bearer), db: Session = Depends(get_db)):
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    tokens.logout(db, payload, body.refresh_token)
+    return {"message": "Logged out"}
+
+
+@router.post("/revoke", response_model=RevokeSubjectResponse)
+def revoke_subject(
+    body: RevokeSubjectRequest,
+    current_user: dict = Depends(get_current_government),
+    db: Session = Depends(get_db),
+):
+    """Cut off every token a (e.g. compromised) account holds right now."""
+    subject = f"{body.subject_type}:{body.subject_id}"
+    revoked = tokens.revoke_subject(db, subject)
+    audit_log.record(
+        "auth.subject_revoked", "government", current_user["government_member_id"],
+        subject=subject, refresh_tokens_revoked=revoked,
+    )
+    return {"subject": subject, "refresh_tokens_revoked": revoked}
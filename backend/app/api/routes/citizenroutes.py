@@ -1,13 +1,17 @@
 # app/api/routes/citizenroutes.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database.connection import get_db
-from app.utils.security import create_access_token, verify_access_token
+from app.utils.security import verify_access_token
+from app.utils.http_cache import compute_etag, etag_matches, not_modified
+from app.services.audit import audit_log
+from app.services import tokens
 
 from app.models.citizen import citizen  # user table
-from app.models.firregistation import FirRegistration
+from app.models.firregistation import FirRegistration, FIRProgress, closedFir
 from app.models.government import Escalation  # canonical escalation table
 
 from app.schemas.citizen import (
@@ -17,6 +21,7 @@ from app.schemas.citizen import (
     citizenauthresponse,
     EscalationCreate,
     EscalationRecord,
+    CitizenDashboardResponse,
 )
 
 router = APIRouter()
@@ -83,12 +88,10 @@ def citizenauth(citizen_member: citizenAuth, db: Session = Depends(get_db)):
         # Avoid leaking which field failed
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = create_access_token(
-        {"citizen_id": member.citizen_id, "aadhar_no": member.aadhar_no}
-    )
+    issued = tokens.issue(db, {"citizen_id": member.citizen_id, "aadhar_no": member.aadhar_no})
+    db.commit()
     return {
-        "access_token": access_token,
-        "token_type": "bearer",
+        **issued,
         "citizen_id": member.citizen_id,
         "aadhar_no": member.aadhar_no,
     }
@@ -127,6 +130,9 @@ def citizen_escalate_fir(
         db.add(existing)
         db.commit()
         db.refresh(existing)
+        audit_log.record(
+            "escalation.updated", "citizen", current_user.get("citizen_id") or aadhar_no, fir_id=fir_id
+        )
         return {
             "fir_id": existing.fir_id,
             "aadhar_no": existing.aadhar_no,
@@ -143,4 +149,100 @@ def citizen_escalate_fir(
     db.add(esc)
     db.commit()
     db.refresh(esc)
+    audit_log.record(
+        "escalation.created", "citizen", current_user.get("citizen_id") or aadhar_no, fir_id=fir_id
+    )
     return {"fir_id": esc.fir_id, "aadhar_no": esc.aadhar_no, "reason": esc.reason}
+
+
+# ----------------- Citizen dashboard -----------------
+# One call for everything CitizenDashboard.jsx needs. The query count is fixed
+# (count, page, progress aggregate, closed ids, escalations) regardless of how
+# many FIRs the citizen has, and unchanged pages revalidate with a 304.
+@router.get("/dashboard", response_model=CitizenDashboardResponse)
+def citizen_dashboard(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_citizen),
+    db: Session = Depends(get_db),
+):
+    aadhar_no = _norm_str(current_user["aadhar_no"])
+
+    total = (
+        db.query(func.count(FirRegistration.id))
+        .filter(FirRegistration.id_proof_value == aadhar_no)
+        .scalar()
+    ) or 0
+
+    firs = (
+        db.query(FirRegistration)
+        .filter(FirRegistration.id_proof_value == aadhar_no)
+        .order_by(FirRegistration.incident_date.desc(), FirRegistration.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    fir_ids = [f.id for f in firs]
+
+    latest = {}
+    closed_ids = set()
+    escalations = {}
+    if fir_ids:
+        # Latest entry + count per FIR in a single grouped join
+        agg = (
+            db.query(
+                FIRProgress.fir_id.label("fir_id"),
+                func.max(FIRProgress.id).label("latest_id"),
+                func.count(FIRProgress.id).label("progress_count"),
+            )
+            .filter(FIRProgress.fir_id.in_(fir_ids))
+            .group_by(FIRProgress.fir_id)
+            .subquery()
+        )
+        rows = (
+            db.query(FIRProgress, agg.c.progress_count)
+            .join(agg, FIRProgress.id == agg.c.latest_id)
+            .all()
+        )
+        latest = {p.fir_id: (p, count) for p, count in rows}
+
+        closed_ids = {
+            fir_id
+            for (fir_id,) in db.query(closedFir.fir_id).filter(closedFir.fir_id.in_(fir_ids)).all()
+        }
+        escalations = {
+            fir_id: status
+            for fir_id, status in db.query(Escalation.fir_id, Escalation.status)
+            .filter(Escalation.fir_id.in_(fir_ids), Escalation.aadhar_no == aadhar_no)
+            .all()
+        }
+
+    items = []
+    for f in firs:
+        progress, count = latest.get(f.id, (None, 0))
+        items.append(
+            {
+                "fir_id": f.id,
+                "fullname": f.fullname,
+                "offence_type": f.offence_type,
+                "incident_location": f.incident_location,
+                "incident_date": f.incident_date,
+                "status": "closed" if f.id in closed_ids else getattr(f, "status", "active"),
+                "station_id": f.Stationid,
+                "progress_count": count,
+                "latest_progress": progress,
+                "escalation_status": escalations.get(f.id),
+            }
+        )
+
+    payload = CitizenDashboardResponse.model_validate(
+        {"total": total, "limit": limit, "offset": offset, "firs": items},
+        from_attributes=True,
+    )
+    etag = compute_etag(payload)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return payload
@@ -0,0 +1,173 @@
+# app/api/routes/evidenceroutes.py
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from jose import JWTError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_db
+from app.models.evidence import Evidence
+from app.models.firregistation import FirRegistration
+from app.schemas.evidence import EvidenceRecord, EvidenceUploadResponse
+from app.services.outbox import enqueue
+from app.services.evidence_store import (
+    evidence_store,
+    parse_range,
+    EvidenceTooLarge,
+    RangeNotSatisfiable,
+)
+from app.api.routes.firroutes import (
+    get_current_police,
+    police_oauth,
+    citizen_oauth,
+)
+from app.utils.security import decode_access_token
+
+router = APIRouter()
+
+
+def _authorized_evidence(
+    evidence_id: int,
+    db: Session,
+    citizen_token: Optional[str],
+    police_token: Optional[str],
+) -> Evidence:
+    """Police may read any evidence; a citizen only evidence on their own FIR."""
+    e = db.query(Evidence).filter(Evidence.id == evidence_id).first()
+    if not e:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+
+    if police_token:
+        try:
+            decode_access_token(police_token)
+            return e
+        except JWTError:
+            pass
+
+    if citizen_token:
+        try:
+            payload = decode_access_token(citizen_token)
+            aadhar = str(payload.get("aadhar_no", "")).strip()
+            owner = db.query(FirRegistration.id_proof_value).filter(FirRegistration.id == e.fir_id).scalar()
+            if aadhar and aadhar == (owner or "").strip():
+                return e
+        except JWTError:
+            pass
+
+    raise HTTPException(status_code=403, detail="Not authorized to view this evidence")
+
+
+def _attached(db: Session, fir_id: str, digest: str) -> Optional[Evidence]:
+    return db.query(Evidence).filter(Evidence.fir_id == fir_id, Evidence.sha256 == digest).first()
+
+
+@router.post("/upload", response_model=EvidenceUploadResponse)
+def upload_evidence(
+    fir_id: str = Form(...),
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
+    fir = db.query(FirRegistration).filter(FirRegistration.id == fir_id).first()
+    if not fir:
+        raise HTTPException(status_code=404, detail="FIR not found")
+
+    try:
+        digest, size, _ = evidence_store.put_stream(file.file)
+    except EvidenceTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+
+    existing = _attached(db, fir_id, digest)
+    if existing:
+        return {"message": "Evidence already attached", "deduplicated": True, "evidence": existing}
+
+    content_type = file.content_type or "application/octet-stream"
+    e = Evidence(
+        fir_id=fir_id,
+        sha256=digest,
+        size=size,
+        content_type=content_type,
+        filename=file.filename,
+        uploaded_by=current_user["id"],
+        thumbnail_ready=os.path.exists(evidence_store.thumbnail_path(digest)),
+    )
+    db.add(e)
+    if content_type.startswith("image/") and not e.thumbnail_ready:
+        enqueue(db, "evidence.uploaded", {"sha256": digest})
+    try:
+        db.commit()
+    except IntegrityError:
+        # The same file was attached by a concurrent upload
+        db.rollback()
+        existing = _attached(db, fir_id, digest)
+        if existing is None:
+            raise
+        return {"message": "Evidence already attached", "deduplicated": True, "evidence": existing}
+    db.refresh(e)
+    return {"message": "Evidence uploaded successfully", "deduplicated": False, "evidence": e}
+
+
+@router.get("/{evidence_id}/meta", response_model=EvidenceRecord)
+def get_evidence_meta(
+    evidence_id: int,
+    db: Session = Depends(get_db),
+    citizen_token: Optional[str] = Depends(citizen_oauth),
+    police_token: Optional[str] = Depends(police_oauth),
+):
+    return _authorized_evidence(evidence_id, db, citizen_token, police_token)
+
+
+@router.get("/{evidence_id}")
+def download_evidence(
+    evidence_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    citizen_token: Optional[str] = Depends(citizen_oauth),
+    police_token: Optional[str] = Depends(police_oauth),
+):
+    e = _authorized_evidence(evidence_id, db, citizen_token, police_token)
+    if not evidence_store.exists(e.sha256):
+        raise HTTPException(status_code=410, detail="Evidence content missing from store")
+
+    size = evidence_store.size(e.sha256)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{e.sha256}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except RangeNotSatisfiable:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+
+    body = evidence_store.iter_range(e.sha256, start, end) if size else iter(())
+    return StreamingResponse(body, status_code=status_code, media_type=e.content_type, headers=headers)
+
+
+@router.get("/{evidence_id}/thumbnail")
+def get_evidence_thumbnail(
+    evidence_id: int,
+    db: Session = Depends(get_db),
+    citizen_token: Optional[str] = Depends(citizen_oauth),
+    police_token: Optional[str] = Depends(police_oauth),
+):
+    e = _authorized_evidence(evidence_id, db, citizen_token, police_token)
+    path = evidence_store.thumbnail_path(e.sha256)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Thumbnail not ready")
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from app.database.connection import get_db
+from app.database.routing import read_only
 from app.schemas.Fir import (
     FirCreate,
     FirResponse,
     FIRProgressUpdate,
+    FIRProgressBatch,
+    FIRProgressBatchResponse,
     FIRProgressRequest,
     FIRProgressResponse,
     FIRCloseRequest,
     FIRCloseResponse,
+    FIRAssignRequest,
+    FIRAssignResponse,
     FIRDetailsResponse,
+    CulpritSearchResult,
 )
 from app.models.firregistation import FirRegistration, closedFir, FIRProgress, Culprit
-from datetime import datetime
+from app.models.evidence import Evidence
+from app.services.outbox import enqueue
+from app.services.audit import audit_log
+from app.services import archive, assignment, culprit_search, dedup, fir_query, geo, versions
+from app.services.read_model import FirSummary, closed_ids, read_model
+from app.services.suggest import suggest_from_db, suggester
+from app.utils.http_cache import is_fresh, not_modified, set_validators, version_etag
+from datetime import datetime, date, timedelta
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
+from app.utils.security import decode_access_token
 from typing import Optional, List
 
 router = APIRouter()
@@ -24,13 +39,10 @@ police_oauth = OAuth2PasswordBearer(tokenUrl="/policeauth")
 citizen_oauth = OAuth2PasswordBearer(tokenUrl="/citizenAuth")
 government_oauth = OAuth2PasswordBearer(tokenUrl="/governmentAuth")
 
-SECRET_KEY = "hackathon-secret-key"
-ALGORITHM = "HS256"
-
 
 def get_current_police(token: str = Depends(police_oauth)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id = payload.get("sub")
         user_name = payload.get("name")
         station_id = payload.get("station_id")
@@ -47,7 +59,7 @@ def get_current_police(token: str = Depends(police_oauth)):
 
 def get_current_citizen(token: str = Depends(citizen_oauth)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         citizen_id = payload.get("citizen_id")
         aadhar_no = payload.get("aadhar_no")
         if citizen_id is None or not aadhar_no:
@@ -62,7 +74,7 @@ def get_current_government(token: str = Depends(government_oauth)):
     Minimal check: token must decode and contain government_member_id.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         gov_id = payload.get("government_member_id")
         if not gov_id:
             raise HTTPException(status_code=401, detail="Invalid token")
@@ -71,6 +83,34 @@ def get_current_government(token: str = Depends(government_oauth)):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+CONFLICT_DETAIL = "FIR was modified by another request; reload and retry"
+
+
+def _check_writable(db: Session, fir_id: str, version: int, expected_version: Optional[int]):
+    if expected_version is not None and expected_version != version:
+        raise HTTPException(
+            status_code=409, detail=f"FIR is at version {version}, not {expected_version}; reload and retry"
+        )
+    if db.query(closedFir.id).filter(closedFir.fir_id == fir_id).first():
+        raise HTTPException(status_code=409, detail="FIR is closed")
+
+
+def _date_bounded(q, date_from: Optional[date], date_to: Optional[date]):
+    # Explicit incident_date bounds let MySQL prune yearly partitions
+    # (see app/database/partitioning.py) instead of touching every year.
+    if date_from:
+        q = q.filter(FirRegistration.incident_date >= date_from)
+    if date_to:
+        q = q.filter(FirRegistration.incident_date <= date_to)
+    return q
+
+
+def _summaries(db: Session, firs: List[FirRegistration]) -> List[dict]:
+    """Database fallback for the list endpoints; same rows as the read model."""
+    closed = closed_ids(db, [f.id for f in firs])
+    return [FirSummary.of(f, f.id in closed).row() for f in firs]
+
+
 @router.post("/register_incident", response_model=FirResponse)
 def register_incident(
     report: FirCreate,
@@ -94,17 +134,46 @@ def register_incident(
         Stationid=current_user["station_id"],
         member_id=current_user["id"],
     )
+    geo.locate(new_report, report.latitude, report.longitude)
+    # Looked up before the insert; the new FIR is indexed by a flush hook
+    duplicates = dedup.find_duplicates(db, new_report)
     db.add(new_report)
+    versions.bump_station(db, current_user["station_id"])
+    db.flush()
+    enqueue(db, "fir.registered", {"fir_id": new_report.id, "station_id": new_report.Stationid})
     db.commit()
     db.refresh(new_report)
+    read_model.add(new_report)
+    suggester.add(new_report)
+    audit_log.record(
+        "fir.registered", "police", current_user["id"], fir_id=new_report.id,
+        station_id=current_user["station_id"], offence_type=report.offence_type,
+    )
     return {
         "message": "Incident registered successfully",
         "report_id": new_report.id,
         "registered_by_id": current_user["id"],
         "registered_by_name": current_user["name"],
+        "possible_duplicates": duplicates,
     }
 
 
+def _new_culprit(fir_id: str, station_id: int, member_id, data) -> Culprit:
+    return Culprit(
+        fir_id=fir_id,
+        station_id=station_id,
+        member_id=member_id,
+        name=data.name,
+        age=data.age,
+        gender=data.gender,
+        address=data.address,
+        identity_marks=data.identity_marks,
+        custody_status=data.custody_status,
+        details=data.details,
+        last_known_location=data.last_known_location,
+    )
+
+
 @router.post("/add_progress", response_model=FIRProgressResponse)
 def add_progress(
     progress_update: FIRProgressUpdate,
@@ -114,22 +183,22 @@ def add_progress(
     fir = db.query(FirRegistration).filter(FirRegistration.id == progress_update.fir_id).first()
     if not fir:
         raise HTTPException(status_code=404, detail="FIR not found")
+    _check_writable(db, fir.id, fir.version, progress_update.expected_version)
+
+    evidence = []
+    if progress_update.evidence_ids:
+        wanted = set(progress_update.evidence_ids)
+        evidence = (
+            db.query(Evidence)
+            .filter(Evidence.id.in_(wanted), Evidence.fir_id == fir.id)
+            .all()
+        )
+        if len(evidence) != len(wanted):
+            raise HTTPException(status_code=422, detail="Unknown evidence id for this FIR")
 
     culprit_id = None
     if getattr(progress_update, "culprit", None) and progress_update.culprit.name:
-        c = Culprit(
-            fir_id=fir.id,
-            station_id=fir.Stationid,
-            member_id=current_user["id"],
-            name=progress_update.culprit.name,
-            age=progress_update.culprit.age,
-            gender=progress_update.culprit.gender,
-            address=progress_update.culprit.address,
-            identity_marks=progress_update.culprit.identity_marks,
-            custody_status=progress_update.culprit.custody_status,
-            details=progress_update.culprit.details,
-            last_known_location=progress_update.culprit.last_known_location,
-        )
+        c = _new_culprit(fir.id, fir.Stationid, current_user["id"], progress_update.culprit)
         db.add(c)
         db.flush()
         culprit_id = c.id
@@ -143,8 +212,20 @@ def add_progress(
         other_info=progress_update.other_info,
         culprit_id=culprit_id,
     )
+    new_progress.evidence = evidence
     db.add(new_progress)
-    db.commit()
+    versions.touch_fir(fir)
+    try:
+        db.flush()
+        enqueue(db, "fir.progress_added", {"fir_id": fir.id, "progress_id": new_progress.id})
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    audit_log.record(
+        "fir.progress_added", "police", current_user["id"], fir_id=fir.id,
+        progress_id=new_progress.id, culprit_id=culprit_id, evidence_ids=progress_update.evidence_ids,
+    )
 
     records: List[FIRProgress] = (
         db.query(FIRProgress).filter(FIRProgress.fir_id == fir.id).order_by(FIRProgress.id.desc()).all()
@@ -152,11 +233,100 @@ def add_progress(
     return {"progress": records}
 
 
+@router.post("/add_progress_batch", response_model=FIRProgressBatchResponse)
+def add_progress_batch(
+    batch: FIRProgressBatch,
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
+    """
+    Many progress entries and culprits, across FIRs, in one transaction.
+    FIRs and evidence are validated with one IN query each; nothing is
+    written unless everything is valid. Returns only the new ids.
+    """
+    if not batch.progress and not batch.culprits:
+        raise HTTPException(status_code=422, detail="Empty batch")
+
+    fir_ids = {e.fir_id for e in batch.progress} | {c.fir_id for c in batch.culprits}
+    rows = (
+        db.query(FirRegistration.id, FirRegistration.Stationid, FirRegistration.version)
+        .filter(FirRegistration.id.in_(fir_ids))
+        .all()
+    )
+    stations = {r.id: r.Stationid for r in rows}
+    read_versions = {r.id: r.version for r in rows}
+    missing = sorted(fir_ids - stations.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"FIR not found: {', '.join(missing)}")
+    for e in batch.progress:
+        if e.expected_version is not None and e.expected_version != read_versions[e.fir_id]:
+            raise HTTPException(status_code=409, detail=f"FIR {e.fir_id} is at version {read_versions[e.fir_id]}")
+    closed = sorted(fid for (fid,) in db.query(closedFir.fir_id).filter(closedFir.fir_id.in_(fir_ids)).all())
+    if closed:
+        raise HTTPException(status_code=409, detail=f"FIR is closed: {', '.join(closed)}")
+
+    wanted = {i for e in batch.progress for i in (e.evidence_ids or ())}
+    evidence = {}
+    if wanted:
+        evidence = {ev.id: ev for ev in db.query(Evidence).filter(Evidence.id.in_(wanted)).all()}
+    for e in batch.progress:
+        if any(i not in evidence or evidence[i].fir_id != e.fir_id for i in (e.evidence_ids or ())):
+            raise HTTPException(status_code=422, detail=f"Unknown evidence id for FIR {e.fir_id}")
+
+    culprits = [_new_culprit(c.fir_id, stations[c.fir_id], current_user["id"], c) for c in batch.culprits]
+    entries = []
+    for e in batch.progress:
+        p = FIRProgress(
+            fir_id=e.fir_id,
+            progress_text=e.progress_text,
+            evidence_text=e.evidence_text,
+            evidence_photos=e.evidence_photos,
+            witness_info=e.witness_info,
+            other_info=e.other_info,
+        )
+        if e.culprit and e.culprit.name:
+            p.culprit = _new_culprit(e.fir_id, stations[e.fir_id], current_user["id"], e.culprit)
+        p.evidence = [evidence[i] for i in (e.evidence_ids or ())]
+        entries.append(p)
+
+    db.add_all(culprits + entries)
+    if not versions.touch_firs(db, read_versions):
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    db.flush()
+    for p in entries:
+        enqueue(db, "fir.progress_added", {"fir_id": p.fir_id, "progress_id": p.id})
+    db.commit()
+    for p, e in zip(entries, batch.progress):
+        audit_log.record(
+            "fir.progress_added", "police", current_user["id"], fir_id=p.fir_id,
+            progress_id=p.id, culprit_id=p.culprit_id, evidence_ids=e.evidence_ids,
+        )
+    for c in culprits:
+        audit_log.record("fir.culprit_added", "police", current_user["id"], fir_id=c.fir_id, culprit_id=c.id)
+
+    return {
+        "progress_ids": [p.id for p in entries],
+        "progress_culprit_ids": [p.culprit_id for p in entries],
+        "culprit_ids": [c.id for c in culprits],
+    }
+
+
 @router.post("/get_progress", response_model=FIRProgressResponse)
-def get_progress(progress_request: FIRProgressRequest, db: Session = Depends(get_db)):
-    fir = db.query(FirRegistration).filter(FirRegistration.id == progress_request.fir_id).first()
-    if not fir:
+@read_only
+def get_progress(
+    progress_request: FIRProgressRequest,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    current = versions.fir_version(db, progress_request.fir_id)
+    if not current:
         raise HTTPException(status_code=404, detail="FIR not found")
+    etag = version_etag("progress", progress_request.fir_id, current[0])
+    if is_fresh(request, etag, current[1]):
+        return not_modified(etag, current[1])
+    set_validators(response, etag, current[1])
     records: List[FIRProgress] = (
         db.query(FIRProgress)
         .filter(FIRProgress.fir_id == progress_request.fir_id)
@@ -166,11 +336,31 @@ def get_progress(progress_request: FIRProgressRequest, db: Session = Depends(get
     return {"progress": records}
 
 
+def _archived_detail(request: Request, response: Response, case: dict):
+    """Detail of a case in the cold archive; its version is frozen at archiving."""
+    fir = case["fir"]
+    etag = version_etag("fir", fir["id"], fir["version"])
+    last_modified = archive.updated_at(case)
+    if is_fresh(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    return archive.detail(case)
+
+
 @router.get("/details", response_model=FIRDetailsResponse)
-def get_fir_details(fir_id: str, db: Session = Depends(get_db)):
+def get_fir_details(fir_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    # Revalidation reads only the version; the aggregate is built on a miss
+    current = versions.fir_version(db, fir_id)
+    if not current:
+        case = archive.cold_archive.get(db, fir_id)
+        if case is None:
+            raise HTTPException(status_code=404, detail="FIR not found")
+        return _archived_detail(request, response, case)
+    etag = version_etag("fir", fir_id, current[0])
+    if is_fresh(request, etag, current[1]):
+        return not_modified(etag, current[1])
     f = db.query(FirRegistration).filter(FirRegistration.id == fir_id).first()
-    if not f:
-        raise HTTPException(status_code=404, detail="FIR not found")
+    set_validators(response, version_etag("fir", fir_id, f.version), f.updated_at)
     status_val = getattr(f, "status", "active")
     progress: List[FIRProgress] = (
         db.query(FIRProgress).filter(FIRProgress.fir_id == fir_id).order_by(FIRProgress.id.desc()).all()
@@ -192,6 +382,7 @@ def get_fir_details(fir_id: str, db: Session = Depends(get_db)):
         "case_narrative": f.case_narrative,
         "station_id": f.Stationid,
         "member_id": f.member_id,
+        "assigned_member_id": getattr(f, "assigned_member_id", None),
         "status": status_val,
         "progress": progress,
         "culprits": culprits,
@@ -199,10 +390,15 @@ def get_fir_details(fir_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/close_fir", response_model=FIRCloseResponse)
-def close_fir(close_request: FIRCloseRequest, db: Session = Depends(get_db)):
+def close_fir(
+    close_request: FIRCloseRequest,
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
     fir = db.query(FirRegistration).filter(FirRegistration.id == close_request.fir_id).first()
     if not fir:
         raise HTTPException(status_code=404, detail="FIR not found")
+    _check_writable(db, fir.id, fir.version, close_request.expected_version)
     c = closedFir(
         fir_id=fir.id,
         fullname=fir.fullname,
@@ -225,29 +421,79 @@ def close_fir(close_request: FIRCloseRequest, db: Session = Depends(get_db)):
     if hasattr(fir, "status"):
         fir.status = "closed"
         db.add(fir)
-    db.commit()
+    versions.touch_fir(fir)
+    versions.bump_station(db, fir.Stationid)
+    assignment.on_close(db, fir)
+    enqueue(db, "fir.closed", {"fir_id": fir.id, "station_id": fir.Stationid})
+    try:
+        db.commit()
+    except StaleDataError:
+        # A concurrent close or progress entry won; our closed_fir row is discarded
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     db.refresh(c)
+    read_model.mark_closed(fir.id)
+    audit_log.record("fir.closed", "police", current_user["id"], fir_id=fir.id, closed_fir_id=c.id)
     return {"message": "FIR closed successfully"}
 
 
-@router.get("/list")
-def list_all_firs(
+@router.post("/assign", response_model=FIRAssignResponse)
+def assign_fir(
+    assign_request: FIRAssignRequest,
+    current_user: dict = Depends(get_current_police),
     db: Session = Depends(get_db),
-    # Accept either a police or a government token:
-    police_token: Optional[str] = Depends(police_oauth),
-    government_token: Optional[str] = Depends(government_oauth),
 ):
-    """
-    Authorized for:
-    - Police (any station)  -> full list
-    - Government            -> full list
-    """
+    """Assign, reassign, or (without member_id) auto-assign to the least-loaded officer."""
+    fir = db.query(FirRegistration).filter(FirRegistration.id == assign_request.fir_id).first()
+    if not fir:
+        raise HTTPException(status_code=404, detail="FIR not found")
+    if fir.Stationid != current_user["station_id"]:
+        raise HTTPException(status_code=403, detail="FIR belongs to another station")
+    if assign_request.expected_version is not None and assign_request.expected_version != fir.version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"FIR is at version {fir.version}, not {assign_request.expected_version}; reload and retry",
+        )
+    try:
+        previous = assignment.assign(db, fir, assign_request.member_id)
+    except assignment.CaseClosed as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except assignment.AssignmentError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    changed = fir.assigned_member_id != previous
+    if changed:
+        enqueue(db, "fir.assigned", {
+            "fir_id": fir.id, "station_id": fir.Stationid,
+            "member_id": fir.assigned_member_id, "previous_member_id": previous,
+        })
+    try:
+        db.commit()
+    except StaleDataError:
+        # A concurrent assignment or close won; our counter updates roll back with it
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    if changed:
+        audit_log.record(
+            "fir.assigned", "police", current_user["id"], fir_id=fir.id,
+            member_id=fir.assigned_member_id, previous_member_id=previous,
+        )
+    return {
+        "message": "FIR already assigned to this officer" if not changed
+        else "FIR assigned" if previous is None else "FIR reassigned",
+        "fir_id": fir.id,
+        "assigned_member_id": fir.assigned_member_id,
+        "previous_member_id": previous,
+        "version": fir.version,
+    }
+
+
+def _require_police_or_government(police_token: Optional[str], government_token: Optional[str]):
     authorized = False
 
     # Try police token
     if police_token:
         try:
-            jwt.decode(police_token, SECRET_KEY, algorithms=[ALGORITHM])
+            decode_access_token(police_token)
             authorized = True
         except JWTError:
             authorized = False
@@ -255,7 +501,7 @@ def list_all_firs(
     # If not police, try government token
     if not authorized and government_token:
         try:
-            payload = jwt.decode(government_token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = decode_access_token(government_token)
             if payload.get("government_member_id"):
                 authorized = True
         except JWTError:
@@ -264,145 +510,259 @@ def list_all_firs(
     if not authorized:
         raise HTTPException(status_code=401, detail="Not authorized")
 
-    firs = db.query(FirRegistration).all()
-    return [
-        {
-            "fir_id": f.id,
-            "fullname": f.fullname,
-            "offence_type": f.offence_type,
-            "incident_location": f.incident_location,
-            "status": getattr(f, "status", "active"),
-            "incident_date": f.incident_date,
-            "station_id": f.Stationid,
-        }
-        for f in firs
-    ]
+
+@router.get("/list")
+def list_all_firs(
+    db: Session = Depends(get_db),
+    # Accept either a police or a government token:
+    police_token: Optional[str] = Depends(police_oauth),
+    government_token: Optional[str] = Depends(government_oauth),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """
+    Authorized for:
+    - Police (any station)  -> full list
+    - Government            -> full list
+    """
+    _require_police_or_government(police_token, government_token)
+    rows = read_model.list_all(date_from, date_to)
+    if rows is None:
+        rows = _summaries(db, _date_bounded(db.query(FirRegistration), date_from, date_to).all())
+    return rows
+
+
+@router.get("/query")
+def query_firs(
+    db: Session = Depends(get_db),
+    police_token: Optional[str] = Depends(police_oauth),
+    government_token: Optional[str] = Depends(government_oauth),
+    station_id: Optional[int] = None,
+    status: Optional[str] = Query(None, pattern="^(active|closed)$"),
+    offence_type: Optional[str] = None,
+    member_id: Optional[int] = None,
+    assigned_member_id: Optional[int] = None,
+    region: Optional[str] = Query(None, min_length=1),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sort: str = Query("newest", pattern="^(newest|oldest)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+):
+    """
+    Any combination of filters, ordered by incident date; pass next_cursor
+    back as ``cursor`` for the following page. Police or government token.
+    """
+    _require_police_or_government(police_token, government_token)
+    filters = fir_query.FirFilters(
+        station_id=station_id, offence_type=offence_type, member_id=member_id,
+        assigned_member_id=assigned_member_id, status=status, region=region,
+        date_from=date_from, date_to=date_to,
+    )
+    try:
+        rows, next_cursor, _ = fir_query.run(db, filters, sort == "newest", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+@router.get("/suggest/{field}")
+def suggest_values(
+    field: str = Path(..., pattern="^(offence_type|incident_location|fullname)$"),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db),
+    police_token: Optional[str] = Depends(police_oauth),
+    government_token: Optional[str] = Depends(government_oauth),
+):
+    """Values already used in FIRs that start with ``q``, most used first."""
+    _require_police_or_government(police_token, government_token)
+    found = suggester.suggest(field, q, limit)
+    if found is None:
+        found = suggest_from_db(db, field, q, limit)
+    return {"field": field, "suggestions": found}
 
 
 @router.get("/list_by_station")
-def list_firs_by_station(current_user: dict = Depends(get_current_police), db: Session = Depends(get_db)):
+def list_firs_by_station(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
     station_id = current_user["station_id"]
-    firs = db.query(FirRegistration).filter(FirRegistration.Stationid == station_id).all()
-    active = [f for f in firs if getattr(f, "status", "active") != "closed"]
-    closed = [f for f in firs if getattr(f, "status", "active") == "closed"]
+    list_version, list_updated = versions.station_version(db, station_id)
+    etag = version_etag("station", station_id, list_version)
+    if is_fresh(request, etag, list_updated):
+        return not_modified(etag, list_updated)
+    set_validators(response, etag, list_updated)
+    rows = None
+    # The model may lag other workers' writes; never serve it under a newer ETag
+    synced = read_model.station_version(station_id)
+    if synced is not None and synced >= list_version:
+        rows = read_model.by_station(station_id, date_from, date_to)
+    if rows is None:
+        rows = _summaries(db, _date_bounded(
+            db.query(FirRegistration).filter(FirRegistration.Stationid == station_id), date_from, date_to
+        ).all())
     return {
-        "active": [
-            {
-                "fir_id": f.id,
-                "fullname": f.fullname,
-                "incident_location": f.incident_location,
-                "offence_type": f.offence_type,
-                "status": getattr(f, "status", "active"),
-                "incident_date": f.incident_date,
-                "station_id": f.Stationid,
-            }
-            for f in active
-        ],
-        "closed": [
-            {
-                "fir_id": f.id,
-                "fullname": f.fullname,
-                "incident_location": f.incident_location,
-                "offence_type": f.offence_type,
-                "status": "closed",
-                "incident_date": f.incident_date,
-                "station_id": f.Stationid,
-            }
-            for f in closed
-        ],
-        "all": [
-            {
-                "fir_id": f.id,
-                "fullname": f.fullname,
-                "incident_location": f.incident_location,
-                "offence_type": f.offence_type,
-                "status": getattr(f, "status", "active"),
-                "incident_date": f.incident_date,
-                "station_id": f.Stationid,
-            }
-            for f in firs
-        ],
+        "active": [r for r in rows if r["status"] != "closed"],
+        "closed": [r for r in rows if r["status"] == "closed"],
+        "all": rows,
     }
 
 
 @router.get("/search")
-def search_firs(q: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+def search_firs(
+    q: str = Query(..., min_length=1),
+    db: Session = Depends(get_db),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    rows = read_model.search(q, date_from, date_to)
+    if rows is not None:
+        return rows
     pattern = f"%{q}%"
-    results = (
-        db.query(FirRegistration)
-        .filter(
+    results = _date_bounded(
+        db.query(FirRegistration).filter(
             (FirRegistration.fullname.ilike(pattern))
             | (FirRegistration.offence_type.ilike(pattern))
             | (FirRegistration.incident_location.ilike(pattern))
-        )
-        .all()
+        ),
+        date_from,
+        date_to,
+    ).all()
+    return _summaries(db, results)
+
+
+@router.get("/culprits/search", response_model=List[CulpritSearchResult])
+def search_culprits(
+    name: Optional[str] = Query(None, max_length=100),
+    identity_marks: Optional[str] = Query(None, max_length=300),
+    address: Optional[str] = Query(None, max_length=200),
+    station_id: Optional[int] = None,
+    custody_status: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
+    """Has this person appeared in other FIRs? Fuzzy across spellings and stations."""
+    if not (name or identity_marks or address):
+        raise HTTPException(status_code=422, detail="Provide name, identity_marks or address")
+    return culprit_search.search(
+        db,
+        name=name,
+        identity_marks=identity_marks,
+        address=address,
+        station_id=station_id,
+        custody_status=custody_status,
+        limit=limit,
     )
+
+
+def _geo_row(f: FirRegistration) -> dict:
+    return {
+        "fir_id": f.id,
+        "fullname": f.fullname,
+        "offence_type": f.offence_type,
+        "incident_location": f.incident_location,
+        "incident_date": f.incident_date,
+        "station_id": f.Stationid,
+        "latitude": f.latitude,
+        "longitude": f.longitude,
+    }
+
+
+@router.get("/nearby")
+def firs_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(2.0, gt=0, le=50),
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
+    """FIRs within ``radius_km`` of a point, nearest first; ``days`` = last N days."""
+    if days:
+        date_from = max(date_from or date.min, date.today() - timedelta(days=days))
     return [
-        {
-            "fir_id": f.id,
-            "fullname": f.fullname,
-            "offence_type": f.offence_type,
-            "incident_location": f.incident_location,
-            "status": getattr(f, "status", "active"),
-            "incident_date": f.incident_date,
-            "station_id": f.Stationid,
-        }
-        for f in results
+        {**_geo_row(f), "distance_km": round(d, 3)}
+        for f, d in geo.nearby(db, lat, lon, radius_km, date_from=date_from, date_to=date_to)
     ]
 
 
+@router.get("/within")
+def firs_within(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: dict = Depends(get_current_police),
+    db: Session = Depends(get_db),
+):
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=422, detail="Bounding box corners are reversed")
+    return [_geo_row(f) for f in geo.within(db, min_lat, min_lon, max_lat, max_lon, date_from, date_to)]
+
+
 @router.get("/list_by_aadhar")
 def list_firs_for_citizen(current_citizen: dict = Depends(get_current_citizen), db: Session = Depends(get_db)):
     aadhar = str(current_citizen["aadhar_no"]).strip()
-    firs = db.query(FirRegistration).filter(FirRegistration.id_proof_value == aadhar).all()
-    if not firs:
-        return []
-    closed_ids = {row.fir_id for row in db.query(closedFir).filter(closedFir.fir_id.in_([f.id for f in firs])).all()}
-    return [
-        {
-            "fir_id": f.id,
-            "fullname": f.fullname,
-            "offence_type": f.offence_type,
-            "incident_location": f.incident_location,
-            "incident_date": f.incident_date,
-            "status": "closed" if f.id in closed_ids else getattr(f, "status", "active"),
-            "station_id": f.Stationid,
-        }
-        for f in firs
-    ]
+    rows = read_model.by_aadhar(aadhar)
+    if rows is None:
+        firs = db.query(FirRegistration).filter(FirRegistration.id_proof_value == aadhar).all()
+        rows = _summaries(db, firs) if firs else []
+    return rows
 
 
 @router.get("/detail/{fir_id}", response_model=FIRDetailsResponse)
 def citizen_or_police_fir_detail(
     fir_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     citizen_token: Optional[str] = Depends(citizen_oauth),
     police_token: Optional[str] = Depends(police_oauth),
 ):
     f = db.query(FirRegistration).filter(FirRegistration.id == fir_id).first()
-    if not f:
+    case = archive.cold_archive.get(db, fir_id) if not f else None
+    if not f and case is None:
         raise HTTPException(status_code=404, detail="FIR not found")
+    owner_aadhar = f.id_proof_value if f else case["fir"]["id_proof_value"]
 
     authorized = False
 
     if police_token:
         try:
-            jwt.decode(police_token, SECRET_KEY, algorithms=[ALGORITHM])
+            decode_access_token(police_token)
             authorized = True
         except JWTError:
             pass
 
     if not authorized and citizen_token:
         try:
-            payload = jwt.decode(citizen_token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = decode_access_token(citizen_token)
             aadhar = str(payload.get("aadhar_no", "")).strip()
-            if aadhar and aadhar == (f.id_proof_value or "").strip():
+            if aadhar and aadhar == (owner_aadhar or "").strip():
                 authorized = True
         except JWTError:
             pass
 
     if not authorized:
         raise HTTPException(status_code=403, detail="Not authorized to view this FIR")
+    if case is not None:
+        return _archived_detail(request, response, case)
+
+    etag = version_etag("fir", f.id, f.version)
+    if is_fresh(request, etag, f.updated_at):
+        return not_modified(etag, f.updated_at)
+    set_validators(response, etag, f.updated_at)
 
     status_val = getattr(f, "status", "active")
     progress: List[FIRProgress] = (
@@ -425,6 +785,7 @@ def citizen_or_police_fir_detail(
         "case_narrative": f.case_narrative,
         "station_id": f.Stationid,
         "member_id": f.member_id,
+        "assigned_member_id": getattr(f, "assigned_member_id", None),
         "status": status_val,
         "progress": progress,
         "culprits": culprits,
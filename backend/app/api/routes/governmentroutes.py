@@ -1,11 +1,16 @@
 # app/api/routes/governmentroutes.py
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from datetime import datetime
 
 from app.database.connection import get_db
-from app.utils.security import create_access_token, verify_access_token
+from app.database.routing import read_only
+from app.utils.security import verify_access_token
+from app.services.audit import audit_log
+from app.services import tokens
 
 from app.models.government import government, Escalation
 from app.models.firregistation import FirRegistration
@@ -19,6 +24,8 @@ from app.schemas.goverment import (
     governmentsearchfirresponse,
     escalateFIRRequest,   # kept for lookup
     escalateFIRResponse,  # kept for lookup
+    EscalationBulkStatusRequest,
+    EscalationBulkStatusResponse,
 )
 
 router = APIRouter()
@@ -62,11 +69,13 @@ def governmentauth(government_member: governmentAuth, db: Session = Depends(get_
     if not member:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = create_access_token({"government_member_id": member.government_member_id})
-    return {"access_token": access_token, "token_type": "bearer"}
+    issued = tokens.issue(db, {"government_member_id": member.government_member_id})
+    db.commit()
+    return issued
 
 
 @router.post("/governmentsearchfir", response_model=governmentsearchfirresponse)
+@read_only
 def search_fir(
     search: governmentsearchfir,
     current_user: dict = Depends(get_current_government),
@@ -78,6 +87,15 @@ def search_fir(
 
 # ---------- Escalation moderation (Government) ----------
 
+# Status -> statuses it may move to. Closed outcomes can only be reopened
+# for review, never flipped straight to the other outcome.
+ESCALATION_TRANSITIONS = {
+    "pending": {"in_review", "resolved", "rejected"},
+    "in_review": {"pending", "resolved", "rejected"},
+    "resolved": {"in_review"},
+    "rejected": {"in_review"},
+}
+
 @router.get("/escalations")
 def list_escalations(
     status: str = Query("pending", pattern="^(pending|in_review|resolved|rejected|all)$"),
@@ -110,13 +128,23 @@ def update_escalation_status(
     current_user: dict = Depends(get_current_government),
     db: Session = Depends(get_db),
 ):
-    e = db.query(Escalation).filter(Escalation.id == escalation_id).first()
+    # Row lock: the transition is checked against the status we overwrite
+    e = db.query(Escalation).filter(Escalation.id == escalation_id).with_for_update().first()
     if not e:
         raise HTTPException(status_code=404, detail="Escalation not found")
-    e.status = new_status
-    db.add(e)
-    db.commit()
-    db.refresh(e)
+    old_status = e.status
+    if new_status not in ESCALATION_TRANSITIONS[old_status] and new_status != old_status:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Cannot move from {old_status} to {new_status}")
+    if new_status != old_status:
+        e.status = new_status
+        db.add(e)
+        db.commit()
+        db.refresh(e)
+        audit_log.record(
+            "escalation.status_changed", "government", current_user["government_member_id"],
+            fir_id=e.fir_id, escalation_id=e.id, from_status=old_status, to_status=new_status,
+        )
     return {
         "id": e.id,
         "fir_id": e.fir_id,
@@ -129,8 +157,90 @@ def update_escalation_status(
     }
 
 
+@router.patch("/escalations/status", response_model=EscalationBulkStatusResponse)
+def bulk_update_escalation_status(
+    request: EscalationBulkStatusRequest,
+    current_user: dict = Depends(get_current_government),
+    db: Session = Depends(get_db),
+):
+    """
+    Move many escalations to one status: one SELECT ... IN ... FOR UPDATE to
+    validate each transition, one UPDATE for all valid ones, one commit.
+    Invalid ids do not block the rest; every id gets an outcome.
+    """
+    new_status = request.status
+    ids = list(dict.fromkeys(request.ids))
+    current = {
+        r.id: r
+        for r in db.query(Escalation.id, Escalation.fir_id, Escalation.status)
+        .filter(Escalation.id.in_(ids))
+        .with_for_update()
+        .all()
+    }
+    allowed_from = sorted(s for s, targets in ESCALATION_TRANSITIONS.items() if new_status in targets)
+
+    results = {}
+    candidates = []
+    for i in ids:
+        row = current.get(i)
+        if row is None:
+            results[i] = {"id": i, "outcome": "not_found"}
+        elif row.status == new_status:
+            results[i] = {"id": i, "outcome": "unchanged", "from_status": row.status}
+        elif row.status not in allowed_from:
+            results[i] = {
+                "id": i, "outcome": "invalid_transition", "from_status": row.status,
+                "detail": f"Cannot move from {row.status} to {new_status}",
+            }
+        else:
+            candidates.append(i)
+
+    updated = []
+    if candidates:
+        now = datetime.utcnow()
+        # Compare-and-swap on the status each row was validated at: with the
+        # row locks this always matches; without them (SQLite) a row another
+        # request moved since the SELECT is left alone
+        count = (
+            db.query(Escalation)
+            .filter(tuple_(Escalation.id, Escalation.status).in_([(i, current[i].status) for i in candidates]))
+            .update({Escalation.status: new_status, Escalation.updated_at: now}, synchronize_session=False)
+        )
+        if count == len(candidates):
+            updated = candidates
+        else:
+            at_target = {
+                r.id
+                for r in db.query(Escalation.id)
+                .filter(Escalation.id.in_(candidates), Escalation.status == new_status)
+                .all()
+            }
+            if len(at_target) == count:
+                # Every row at the target is one this UPDATE moved
+                updated = [i for i in candidates if i in at_target]
+            else:
+                # Another request also moved some of them to new_status and
+                # which ones are ours is unknowable: undo ours, report all
+                db.rollback()
+            for i in candidates:
+                if i not in updated:
+                    results[i] = {
+                        "id": i, "outcome": "conflict", "from_status": current[i].status,
+                        "detail": "Escalation was changed by another request; reload and retry",
+                    }
+        db.commit()
+    for i in updated:
+        results[i] = {"id": i, "outcome": "updated", "from_status": current[i].status}
+        audit_log.record(
+            "escalation.status_changed", "government", current_user["government_member_id"],
+            fir_id=current[i].fir_id, escalation_id=i, from_status=current[i].status, to_status=new_status,
+        )
+    return {"status": new_status, "updated": len(updated), "results": [results[i] for i in ids]}
+
+
 # Optional lookup helper: does NOT create an escalation.
 @router.post("/escalatefir/lookup", response_model=escalateFIRResponse)
+@read_only
 def escalate_fir_lookup(
     request: escalateFIRRequest,
     current_user: dict = Depends(get_current_government),
@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.database.connection import get_db
-from app.utils.security import create_access_token, verify_access_token
+from app.utils.security import verify_access_token
+from app.services import assignment, tokens
 from app.models.policemember import PoliceMember
 from app.schemas.PoliceMemberCreate import (
     PoliceMemberCreate,
@@ -67,16 +68,17 @@ def policeauth(police: PoliceAuth, db: Session = Depends(get_db)):
     if not member:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = create_access_token(
+    issued = tokens.issue(
+        db,
         {
             "sub": str(member.member_id),
             "name": member.name,
             "station_id": member.station_id,
-        }
+        },
     )
+    db.commit()
     return {
-        "access_token": access_token,
-        "token_type": "bearer",
+        **issued,
         "police_member_id": member.member_id,
         "station_id": member.station_id,
         "name": member.name,
@@ -85,6 +87,5 @@ def policeauth(police: PoliceAuth, db: Session = Depends(get_db)):
 
 @router.get("/allmembers", response_model=List[MemberDetails])
 def get_all_members(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    station_id = int(current_user["station_id"])
-    members = db.query(PoliceMember).filter(PoliceMember.station_id == station_id).all()
-    return members
+    # Workloads come from the officer_workloads counters, not a count over the FIRs
+    return assignment.workloads(db, int(current_user["station_id"]))
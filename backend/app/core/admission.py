@@ -0,0 +1,196 @@
+# app/core/admission.py
+"""
+Admission control and load shedding.
+
+Every request is put into a route class (auth, write, read, bulk). A shared
+pool of ``capacity`` slots bounds how many requests reach the database at
+once; each class additionally has its own concurrency cap and a bounded wait
+queue. When a slot frees up it goes to the highest-priority class with a
+waiter, so logins and writes keep moving while bulk reads queue behind them.
+Requests that find their queue full, or that wait longer than the class
+allows, are rejected immediately with 503 + Retry-After instead of piling
+onto an already saturated pool.
+"""
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+from app.core.config import (
+    ADMISSION_CAPACITY,
+    ADMISSION_ENABLED,
+    ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+
+@dataclass
+class RouteClass:
+    name: str
+    priority: int  # lower is served first
+    limit: int
+    max_queue: int
+    max_wait: float
+    in_flight: int = 0
+    admitted: int = 0
+    rejected_queue_full: int = 0
+    rejected_timeout: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+
+DEFAULT_CLASSES = (
+    RouteClass("auth", priority=0, limit=8, max_queue=64, max_wait=5.0),
+    RouteClass("write", priority=0, limit=12, max_queue=128, max_wait=5.0),
+    RouteClass("read", priority=1, limit=12, max_queue=64, max_wait=2.0),
+    RouteClass("bulk", priority=2, limit=4, max_queue=16, max_wait=1.0),
+)
+
+AUTH_PATHS = {
+    "/citizen/citizenAuth", "/policeauth/policeauth", "/government/governmentAuth", "/auth/refresh",
+}
+BULK_PATHS = {"/fir/list", "/fir/search", "/government/governmentsearchfir", "/government/escalations"}
+EXEMPT_PATHS = {"/", "/docs", "/redoc", "/openapi.json", "/admission/stats", "/outbox/stats"}
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Route class for a request, or None when it bypasses admission."""
+    if path in EXEMPT_PATHS or method == "OPTIONS":
+        return None
+    if path in AUTH_PATHS:
+        return "auth"
+    if path in BULK_PATHS:
+        return "bulk"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+class AdmissionController:
+    def __init__(self, capacity: int = ADMISSION_CAPACITY, classes=DEFAULT_CLASSES):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.classes: Dict[str, RouteClass] = {
+            c.name: RouteClass(c.name, c.priority, c.limit, c.max_queue, c.max_wait) for c in classes
+        }
+        self._by_priority = sorted(self.classes.values(), key=lambda c: c.priority)
+
+    def _can_run(self, rc: RouteClass) -> bool:
+        return self.in_flight < self.capacity and rc.in_flight < rc.limit
+
+    def _grant(self, rc: RouteClass):
+        self.in_flight += 1
+        rc.in_flight += 1
+        rc.admitted += 1
+
+    def _has_priority_waiters(self, rc: RouteClass) -> bool:
+        # Only waiters blocked on shared capacity count; a class stuck on its
+        # own cap must not hold back everyone else.
+        return any(
+            c.waiters and c.in_flight < c.limit for c in self._by_priority if c.priority <= rc.priority
+        )
+
+    async def acquire(self, name: str) -> bool:
+        """Wait for a slot; False means the request should be shed."""
+        rc = self.classes[name]
+        if self._can_run(rc) and not self._has_priority_waiters(rc):
+            self._grant(rc)
+            return True
+        if len(rc.waiters) >= rc.max_queue:
+            rc.rejected_queue_full += 1
+            return False
+
+        fut = asyncio.get_running_loop().create_future()
+        rc.waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), rc.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            if fut.done():  # granted in the same tick we timed out
+                return True
+            fut.cancel()
+            rc.waiters.remove(fut)
+            rc.rejected_timeout += 1
+            return False
+        except asyncio.CancelledError:
+            # Client gone or server stopping: a slot granted meanwhile must
+            # go back, otherwise nobody ever releases it
+            if fut.done() and not fut.cancelled():
+                self.release(name)
+            else:
+                fut.cancel()
+                rc.waiters.remove(fut)
+            raise
+
+    def release(self, name: str):
+        rc = self.classes[name]
+        self.in_flight -= 1
+        rc.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.in_flight < self.capacity:
+            for rc in self._by_priority:
+                if rc.waiters and rc.in_flight < rc.limit:
+                    fut = rc.waiters.popleft()
+                    self._grant(rc)
+                    fut.set_result(True)
+                    break
+            else:
+                return
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "classes": {
+                c.name: {
+                    "in_flight": c.in_flight,
+                    "queue_depth": len(c.waiters),
+                    "admitted": c.admitted,
+                    "rejected_queue_full": c.rejected_queue_full,
+                    "rejected_timeout": c.rejected_timeout,
+                }
+                for c in self._by_priority
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware so shed requests never touch the app or the DB."""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None, enabled: bool = ADMISSION_ENABLED):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            return await self.app(scope, receive, send)
+        name = classify(scope["method"], scope["path"])
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        if not await self.controller.acquire(name):
+            return await self._shed(send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+    async def _shed(self, send):
+        body = json.dumps({"detail": "Server busy, please retry shortly"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(ADMISSION_RETRY_AFTER_SECONDS).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,129 @@
+# app/core/config.py
+# Runtime settings. Everything here can be overridden from the environment;
+# defaults match a single-machine development setup.
+import os
+
+# ---------- Evidence store ----------
+EVIDENCE_STORE_DIR = os.getenv("EVIDENCE_STORE_DIR", os.path.join(os.getcwd(), "evidence_store"))
+EVIDENCE_MAX_BYTES = int(os.getenv("EVIDENCE_MAX_BYTES", str(25 * 1024 * 1024)))
+EVIDENCE_CHUNK_BYTES = 64 * 1024
+EVIDENCE_THUMBNAIL_PX = int(os.getenv("EVIDENCE_THUMBNAIL_PX", "256"))
+
+# ---------- Admission control ----------
+# Total in-flight requests allowed to reach the DB layer. The default matches
+# SQLAlchemy's default pool (pool_size=5 + max_overflow=10).
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", "15"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+# ---------- Outbox ----------
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "2"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "2"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "300"))
+
+
+def testing() -> bool:
+    # Read at call time: conftest sets TESTING=1 after the app is imported
+    return os.getenv("TESTING") == "1"
+
+
+def outbox_inprocess_enabled() -> bool:
+    # Tests drain the outbox explicitly
+    return os.getenv("OUTBOX_INPROCESS", "1") == "1" and not testing()
+
+# ---------- Audit log ----------
+AUDIT_FLUSH_SIZE = int(os.getenv("AUDIT_FLUSH_SIZE", "100"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0"))
+
+# ---------- Read replica ----------
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# Reads go back to the primary when the replica is further behind than this
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# After a client's own write, its reads stay on the primary at least this long
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_PROBE_SECONDS = float(os.getenv("REPLICA_PROBE_SECONDS", "2"))
+
+# ---------- Geocoding ----------
+# CSV of name,latitude,longitude[,alias|alias]; missing file = no geocoding
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(os.getcwd(), "gazetteer.csv"))
+# Geohash length stored in Fir_Registration.geo_cell (7 ~ 150 m cells)
+GEO_CELL_PRECISION = int(os.getenv("GEO_CELL_PRECISION", "7"))
+
+# ---------- Duplicate FIR detection ----------
+# Candidates must have an incident_date within this many days of the new FIR
+DEDUP_DATE_WINDOW_DAYS = int(os.getenv("DEDUP_DATE_WINDOW_DAYS", "7"))
+DEDUP_MIN_SCORE = float(os.getenv("DEDUP_MIN_SCORE", "0.5"))
+DEDUP_MAX_RESULTS = int(os.getenv("DEDUP_MAX_RESULTS", "5"))
+
+# ---------- Idempotency keys ----------
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+# How long a duplicate waits for the original request before giving up (409)
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+# An in_progress claim older than this is treated as abandoned by a dead worker
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120"))
+
+# ---------- Database pool / workers ----------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+# Connections the database allows this service in total, across all workers
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "150"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))  # 0 = derive from CPUs
+
+# ---------- Request profiling ----------
+# Off by default: the middleware is not even installed unless enabled
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+# Requests carrying "X-Profile: <token>" are always profiled; empty = header disabled
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+# Fraction of all other requests profiled at random (0.01 = 1 in 100)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "2"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(os.getcwd(), "profiles"))
+
+# ---------- FIR summary read model ----------
+READ_MODEL_ENABLED = os.getenv("READ_MODEL_ENABLED", "1") == "1"
+# Estimated heap the summaries and their indexes may use; above it the model
+# switches itself off and the list endpoints read from the database again
+READ_MODEL_MAX_BYTES = int(os.getenv("READ_MODEL_MAX_BYTES", str(64 * 1024 * 1024)))
+# How often each worker picks up FIRs registered or closed by other workers
+READ_MODEL_SYNC_SECONDS = float(os.getenv("READ_MODEL_SYNC_SECONDS", "2"))
+
+# ---------- Tokens ----------
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# How often each worker pulls revocations made by other workers
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "2"))
+# Bloom filter size in bits (1 << 20 = 128 KB, ~1% false positives at 100k entries)
+REVOCATION_BLOOM_BITS = int(os.getenv("REVOCATION_BLOOM_BITS", str(1 << 20)))
+
+# ---------- Slow-query log ----------
+SLOW_QUERY_ENABLED = os.getenv("SLOW_QUERY_ENABLED", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# JSON lines, rotated at SLOW_QUERY_LOG_MAX_BYTES keeping SLOW_QUERY_LOG_BACKUPS files
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", os.path.join(os.getcwd(), "logs", "slow_queries.jsonl"))
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+
+# ---------- FIR typeahead ----------
+SUGGEST_ENABLED = os.getenv("SUGGEST_ENABLED", "1") == "1"
+# Full rebuild interval; also how long other workers' new values take to show up
+SUGGEST_REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", "300"))
+
+# ---------- Cold archive ----------
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.getcwd(), "archive"))
+# Closed cases whose closed_at is older than this move to the archive
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", str(3 * 365)))
+# zstd (needs the zstandard package) or gzip
+ARCHIVE_CODEC = os.getenv("ARCHIVE_CODEC", "zstd")
+# Cases per segment file / per compressed block / per delete transaction
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_BLOCK_RECORDS = int(os.getenv("ARCHIVE_BLOCK_RECORDS", "32"))
+ARCHIVE_DELETE_CHUNK = int(os.getenv("ARCHIVE_DELETE_CHUNK", "100"))
+# Rehydrated cases kept in memory per worker
+ARCHIVE_CACHE_SIZE = int(os.getenv("ARCHIVE_CACHE_SIZE", "256"))
@@ -0,0 +1,344 @@
+# app/core/idempotency.py
+"""
+Idempotency-Key support for retried POSTs.
+
+A POST to one of IDEMPOTENT_PATHS carrying an ``Idempotency-Key`` header is
+executed at most once per (caller, path, key). The caller is the token's
+subject ("police:12"), not the token itself, so a retry sent with a freshly
+refreshed access token is still recognised. The first request
+claims the key by inserting an ``in_progress`` row, runs, and stores its
+response; a retry gets the stored response back (with
+``Idempotent-Replayed: true``) without re-running the handler.
+
+- Duplicates arriving while the original is still running wait for it:
+  in-process on an asyncio.Event, across workers by polling the claim row.
+- Completed responses are kept in a bounded in-memory LRU in front of the
+  table; both expire after IDEMPOTENCY_TTL_SECONDS.
+- Reusing a key with a different body is a client bug and gets 422.
+- 5xx responses, crashes and the 4xx answers that ask the client to try
+  again (RETRY_STATUSES: expired token, stale-version conflict, rate
+  limit...) release the claim, so the retry actually runs.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import (
+    IDEMPOTENCY_TTL_SECONDS,
+    IDEMPOTENCY_CACHE_SIZE,
+    IDEMPOTENCY_WAIT_SECONDS,
+    IDEMPOTENCY_LOCK_SECONDS,
+)
+from app.models.idempotency import IdempotencyRecord
+from app.utils.security import decode_access_token, subject_of
+
+IDEMPOTENT_PATHS = {
+    "/fir/register_incident",
+    "/fir/add_progress",
+    "/fir/add_progress_batch",
+    "/fir/assign",
+    "/citizen/addcitizen",
+    "/citizen/escalatefir",
+}
+# Never stored: the client is expected to retry, possibly with the same key
+RETRY_STATUSES = {401, 408, 409, 425, 429}
+MAX_KEY_LENGTH = 255
+POLL_SECONDS = 0.1
+PURGE_EVERY_SECONDS = 300
+
+# (status code, content type, body)
+StoredResponse = Tuple[int, str, bytes]
+
+
+class IdempotencyStore:
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL_SECONDS, cache_size: int = IDEMPOTENCY_CACHE_SIZE):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.session_factory = None
+        self._cache: "OrderedDict[str, Tuple[float, str, StoredResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        # scope -> Event set when the in-process original finishes
+        self.inflight: Dict[str, asyncio.Event] = {}
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.database.connection import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    # ---------- in-memory front cache ----------
+
+    def cached(self, scope: str) -> Optional[Tuple[str, StoredResponse]]:
+        with self._lock:
+            hit = self._cache.get(scope)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                del self._cache[scope]
+                return None
+            self._cache.move_to_end(scope)
+            return hit[1], hit[2]
+
+    def remember(self, scope: str, request_hash: str, response: StoredResponse):
+        with self._lock:
+            self._cache[scope] = (time.monotonic() + self.ttl, request_hash, response)
+            self._cache.move_to_end(scope)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    # ---------- table (blocking; call from a worker thread) ----------
+
+    def claim(self, scope: str, request_hash: str) -> Tuple[str, Optional[str], Optional[StoredResponse]]:
+        """("claimed", ..) to run the request, ("done", hash, response) to replay, ("busy", hash, None) to wait."""
+        db = self._session()
+        try:
+            for _ in range(3):
+                now = datetime.utcnow()
+                db.add(IdempotencyRecord(
+                    scope_hash=scope, request_hash=request_hash, status="in_progress",
+                    created_at=now, expires_at=now + timedelta(seconds=self.ttl),
+                ))
+                try:
+                    db.commit()
+                    return "claimed", request_hash, None
+                except IntegrityError:
+                    db.rollback()
+
+                rec = db.query(IdempotencyRecord).filter(IdempotencyRecord.scope_hash == scope).first()
+                if rec is None:
+                    continue
+                if rec.expires_at < now:
+                    db.delete(rec)
+                    db.commit()
+                    continue
+                if rec.status == "done":
+                    return "done", rec.request_hash, (rec.status_code, rec.content_type, (rec.body or "").encode())
+                if rec.created_at < now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS):
+                    # Abandoned by a worker that died mid-request: take it over
+                    taken = (
+                        db.query(IdempotencyRecord)
+                        .filter(IdempotencyRecord.id == rec.id, IdempotencyRecord.created_at == rec.created_at)
+                        .update({IdempotencyRecord.created_at: now}, synchronize_session=False)
+                    )
+                    db.commit()
+                    if taken:
+                        return "claimed", rec.request_hash, None
+                return "busy", rec.request_hash, None
+            return "busy", None, None
+        finally:
+            db.close()
+
+    def complete(self, scope: str, response: StoredResponse):
+        db = self._session()
+        try:
+            db.query(IdempotencyRecord).filter(IdempotencyRecord.scope_hash == scope).update(
+                {
+                    IdempotencyRecord.status: "done",
+                    IdempotencyRecord.status_code: response[0],
+                    IdempotencyRecord.content_type: response[1],
+                    IdempotencyRecord.body: response[2].decode("utf-8", "replace"),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+        self._maybe_purge()
+
+    def release(self, scope: str):
+        db = self._session()
+        try:
+            db.query(IdempotencyRecord).filter(
+                IdempotencyRecord.scope_hash == scope, IdempotencyRecord.status == "in_progress"
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete expired rows in small batches so the table never takes a long lock."""
+        db = self._session()
+        purged = 0
+        try:
+            while True:
+                ids = [
+                    i for (i,) in db.query(IdempotencyRecord.id)
+                    .filter(IdempotencyRecord.expires_at < datetime.utcnow())
+                    .limit(batch_size)
+                    .all()
+                ]
+                if not ids:
+                    return purged
+                db.query(IdempotencyRecord).filter(IdempotencyRecord.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                purged += len(ids)
+        finally:
+            db.close()
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        if now - self._last_purge >= PURGE_EVERY_SECONDS:
+            self._last_purge = now
+            self.purge_expired()
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _header(scope, name: bytes) -> bytes:
+    for k, v in scope.get("headers", ()):
+        if k == name:
+            return v
+    return b""
+
+
+def _caller(scope) -> bytes:
+    """Who is asking: the token's subject, or the raw header when it does not decode."""
+    authorization = _header(scope, b"authorization")
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = subject_of(decode_access_token(token))
+        except JWTError:
+            subject = None
+        if subject:
+            return subject.encode()
+    return authorization
+
+
+async def _send_json(send, status: int, detail: str):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI so a replay never reaches the route or opens a request session."""
+
+    def __init__(self, app, store: Optional[IdempotencyStore] = None, paths=IDEMPOTENT_PATHS):
+        self.app = app
+        self.store = store or idempotency_store
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        key = _header(scope, b"idempotency-key")
+        if not key:
+            return await self.app(scope, receive, send)
+        if len(key) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, "Idempotency-Key is too long")
+
+        messages, body = [], b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        request_hash = hashlib.sha256(body).hexdigest()
+        key_scope = hashlib.sha256(
+            b"\n".join([_caller(scope), scope["path"].encode(), key])
+        ).hexdigest()
+
+        while True:
+            hit = self.store.cached(key_scope)
+            if hit:
+                return await self._replay(send, hit[0], request_hash, hit[1])
+            running = self.store.inflight.get(key_scope)
+            if running is None:
+                break
+            try:
+                await asyncio.wait_for(running.wait(), IDEMPOTENCY_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                return await _send_json(send, 409, "A request with this Idempotency-Key is still being processed")
+
+        done = asyncio.Event()
+        self.store.inflight[key_scope] = done
+        claimed = False
+        try:
+            deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+            while True:
+                state, stored_hash, stored = await run_in_threadpool(self.store.claim, key_scope, request_hash)
+                if state != "busy":
+                    break
+                if time.monotonic() > deadline:
+                    return await _send_json(send, 409, "A request with this Idempotency-Key is still being processed")
+                await asyncio.sleep(POLL_SECONDS)
+            if state == "done":
+                self.store.remember(key_scope, stored_hash, stored)
+                return await self._replay(send, stored_hash, request_hash, stored)
+            claimed = True
+            if stored_hash != request_hash:
+                await run_in_threadpool(self.store.release, key_scope)
+                return await _send_json(send, 422, "Idempotency-Key was already used with a different request")
+
+            response = await self._execute(scope, messages, send)
+            if response[0] < 500 and response[0] not in RETRY_STATUSES:
+                await run_in_threadpool(self.store.complete, key_scope, response)
+                self.store.remember(key_scope, request_hash, response)
+            else:
+                await run_in_threadpool(self.store.release, key_scope)
+        except BaseException:
+            if claimed:
+                await run_in_threadpool(self.store.release, key_scope)
+            raise
+        finally:
+            self.store.inflight.pop(key_scope, None)
+            done.set()
+
+    async def _execute(self, scope, messages, send) -> StoredResponse:
+        pending = list(messages)
+        status, content_type, chunks = 500, "application/json", []
+
+        async def replay_receive():
+            if pending:
+                return pending.pop(0)
+            return {"type": "http.disconnect"}
+
+        async def capture_send(message):
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for k, v in message.get("headers", ()):
+                    if k == b"content-type":
+                        content_type = v.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+        return status, content_type, b"".join(chunks)
+
+    async def _replay(self, send, stored_hash: str, request_hash: str, response: StoredResponse):
+        if stored_hash != request_hash:
+            return await _send_json(send, 422, "Idempotency-Key was already used with a different request")
+        status, content_type, body = response
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode("latin-1")),
+                (b"content-length", str(len(body)).encode()),
+                (b"idempotent-replayed", b"true"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,219 @@
+# app/core/profiling.py
+"""
+On-demand statistical profiling of individual requests.
+
+Installed only when PROFILING_ENABLED=1. A request is profiled when it
+carries ``X-Profile: <PROFILING_TOKEN>`` or is picked at random with
+probability PROFILING_SAMPLE_RATE; every other request pays one header scan.
+
+While a profiled request runs, a sampler thread wakes every
+PROFILING_INTERVAL_MS and records the stack of each thread that can be
+serving it and is executing code from the ``app`` package: the event loop
+thread while it runs middleware and async code, and the threadpool workers
+running sync endpoints (JWT decoding, pydantic validation, ORM hydration and
+driver calls all happen below those frames). The app's own background
+threads (outbox, audit writer, read model, suggester...) are never sampled,
+and idle workers and the loop waiting in ``select`` have no app frames, so
+the profile is wall time spent working, not waiting. Concurrent requests in
+the same worker can contribute samples too; profile under light load when
+precision matters.
+
+Each profile is written to PROFILING_DIR as a collapsed-stack ``.folded``
+file (one ``frame;frame;frame count`` line per distinct stack), which
+flamegraph.pl, speedscope and inferno render directly, and a summary of
+the hottest frames and packages is logged to ``app.profiling``.
+"""
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import PROFILING_DIR, PROFILING_INTERVAL_MS, PROFILING_SAMPLE_RATE, PROFILING_TOKEN
+
+logger = logging.getLogger("app.profiling")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TESTS_DIR = os.path.join(APP_DIR, "tests")
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+TOP_FRAMES = 8
+# anyio names the threads that run sync endpoints and dependencies this way
+THREADPOOL_NAME = "AnyIO worker thread"
+
+
+def _short_path(filename: str) -> str:
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.rsplit(marker, 1)[1]
+    if filename.startswith(APP_DIR):
+        return "app" + filename[len(APP_DIR):]
+    return os.path.basename(filename)
+
+
+def _is_app_code(filename: str) -> bool:
+    return filename.startswith(APP_DIR) and not filename.startswith(_TESTS_DIR)
+
+
+class Sampler(threading.Thread):
+    """Counts collapsed stacks of the request's threads while they run app code."""
+
+    def __init__(self, interval: float, loop_thread: Optional[int] = None):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.loop_thread = loop_thread
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._halt = threading.Event()
+        self._labels: Dict[object, Tuple[str, bool]] = {}
+
+    def _label(self, code) -> Tuple[str, bool]:
+        hit = self._labels.get(code)
+        if hit is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+            hit = self._labels[code] = (label, _is_app_code(code.co_filename))
+        return hit
+
+    def sample(self):
+        workers = {t.ident for t in threading.enumerate() if t.name.startswith(THREADPOOL_NAME)}
+        for tid, frame in sys._current_frames().items():
+            if tid != self.loop_thread and tid not in workers:
+                continue
+            stack, in_app = [], False
+            while frame is not None:
+                label, app_code = self._label(frame.f_code)
+                stack.append(label)
+                in_app = in_app or app_code
+                frame = frame.f_back
+            if in_app:
+                stack.reverse()
+                self.counts[";".join(stack)] += 1
+        self.samples += 1
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+def collapsed(counts: Counter) -> str:
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items()))
+
+
+def top_frames(counts: Counter, limit: int = TOP_FRAMES) -> List[Tuple[str, float, float]]:
+    """(frame, self %, total %) for the frames with the most self samples."""
+    total = sum(counts.values())
+    if not total:
+        return []
+    own, inclusive = Counter(), Counter()
+    for stack, n in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] += n
+        for f in set(frames):
+            inclusive[f] += n
+    return [
+        (f, round(100.0 * n / total, 1), round(100.0 * inclusive[f] / total, 1))
+        for f, n in own.most_common(limit)
+    ]
+
+
+def by_package(counts: Counter, limit: int = TOP_FRAMES) -> List[Tuple[str, float]]:
+    """Self time per top-level package (app, sqlalchemy, pydantic, jose, pymysql, ...)."""
+    total = sum(counts.values())
+    if not total:
+        return []
+    packages = Counter()
+    for stack, n in counts.items():
+        leaf = stack.rsplit(";", 1)[-1]
+        path = leaf[leaf.rfind("(") + 1:].split(":", 1)[0]
+        packages[path.split("/", 1)[0] if "/" in path else path] += n
+    return [(p, round(100.0 * n / total, 1)) for p, n in packages.most_common(limit)]
+
+
+def _header(scope, name: bytes) -> bytes:
+    for k, v in scope.get("headers", ()):
+        if k == name:
+            return v
+    return b""
+
+
+class ProfilingMiddleware:
+    """Pure ASGI; unselected requests go straight through."""
+
+    def __init__(
+        self,
+        app,
+        token: str = PROFILING_TOKEN,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        directory: str = PROFILING_DIR,
+        interval_ms: float = PROFILING_INTERVAL_MS,
+    ):
+        self.app = app
+        self.token = token.encode()
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.interval = interval_ms / 1000.0
+
+    def selected(self, scope) -> bool:
+        if self.token:
+            given = _header(scope, b"x-profile")
+            if given and hmac.compare_digest(given, self.token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.selected(scope):
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid.uuid4().hex[:12]
+        status = 500
+
+        async def tagged_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", ()), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = Sampler(self.interval, loop_thread=threading.get_ident())
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, tagged_send)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            await run_in_threadpool(self._report, scope, profile_id, status, elapsed_ms, sampler)
+
+    def _report(self, scope, profile_id: str, status: int, elapsed_ms: float, sampler: Sampler) -> Optional[str]:
+        path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            slug = _SLUG.sub("_", scope["path"]).strip("_") or "root"
+            name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{scope['method']}-{slug}-{profile_id}.folded"
+            path = os.path.join(self.directory, name)
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(collapsed(sampler.counts))
+        except OSError:
+            logger.exception("profile %s: could not write %s", profile_id, path)
+            path = None
+
+        frames = "; ".join(f"{f} self={s}% total={t}%" for f, s, t in top_frames(sampler.counts))
+        packages = ", ".join(f"{p} {pct}%" for p, pct in by_package(sampler.counts))
+        logger.info(
+            "profile %s %s %s -> %s in %.1f ms, %d samples (%d stacks), file=%s\n  packages: %s\n  top frames: %s",
+            profile_id, scope["method"], scope["path"], status, elapsed_ms, sampler.samples,
+            sum(sampler.counts.values()), path, packages or "-", frames or "-",
+        )
+        return path
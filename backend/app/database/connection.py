@@ -1,14 +1,72 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+import os
 
+from app.core.config import DATABASE_REPLICA_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE_SECONDS
+from app.database.routing import replica_router, is_read_only, client_key
 
-SQLALCHEMY_DATABASE_URL = "mysql+pymysql://root:@127.0.0.1:3306/digital_police_db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@127.0.0.1:3306/digital_police_db")
+# Pool settings are per process: with N workers the server holds up to
+# N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections (see app/server.py)
+def _pool_kwargs(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return dict(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_pool_kwargs(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
-def get_db():
-    db = SessionLocal()
+
+# Optional read replica; without DATABASE_REPLICA_URL every session is a primary one
+replica_engine = (
+    create_engine(DATABASE_REPLICA_URL, **_pool_kwargs(DATABASE_REPLICA_URL)) if DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+)
+
+
+def dispose_engines_after_fork():
+    """
+    Drop pooled connections inherited from the parent process.
+
+    close=False: the sockets still belong to the parent, so the child only
+    forgets them (closing would send a QUIT on the parent's connection).
+    Each worker then opens its own connections on first use.
+    """
+    for e in (engine, replica_engine):
+        if e is not None:
+            e.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    # Covers every pre-forking server (gunicorn --preload, multiprocessing)
+    os.register_at_fork(after_in_child=dispose_engines_after_fork)
+
+
+def get_db(request: Request = None):
+    if (
+        request is not None
+        and ReplicaSessionLocal is not None
+        and is_read_only(request)
+        and not replica_router.is_sticky(client_key(request))
+        and replica_router.replica_usable(replica_engine)
+    ):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+        if request is not None and ReplicaSessionLocal is not None:
+            key = client_key(request)
+            event.listen(db, "after_commit", lambda session: replica_router.mark_write(key))
     try:
         yield db
     finally:
@@ -0,0 +1,42 @@
+# app/database/explain.py
+import re
+from typing import Iterable, List, Optional
+
+from app.database.connection import Base
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def explain(conn, statement: str, parameters=None) -> List[dict]:
+    """Return the query plan for a raw DBAPI statement as a list of dicts."""
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    result = conn.exec_driver_sql(prefix + statement, parameters or ())
+    return [dict(row._mapping) for row in result]
+
+
+def plan_problems(dialect: str, plan: Iterable[dict], tables: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Full table scans and filesorts found in a plan.
+
+    Only real tables are checked (scans of derived tables / subqueries are
+    fine); pass ``tables`` to override the default set of mapped tables.
+    """
+    names = {t.lower() for t in (tables or Base.metadata.tables.keys())}
+    problems = []
+    for row in plan:
+        if dialect == "sqlite":
+            detail = row.get("detail", "")
+            m = _SQLITE_SCAN.match(detail)
+            if m and m.group(1).lower() in names:
+                problems.append(f"full scan: {detail}")
+            if detail.startswith("USE TEMP B-TREE"):
+                problems.append(f"filesort: {detail}")
+        else:
+            table = (row.get("table") or "").lower()
+            extra = row.get("Extra") or ""
+            if row.get("type") == "ALL" and table in names:
+                problems.append(f"full scan: {table}")
+            if "Using filesort" in extra:
+                problems.append(f"filesort: {table} ({extra})")
+    return problems
@@ -0,0 +1,56 @@
+# app/database/migrations.py
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from app.database.connection import Base
+
+
+def apply_column_migrations(bind) -> List[str]:
+    """
+    Add model columns the live tables lack.
+
+    Only columns that can be added without touching existing rows are
+    handled: nullable ones, or ones with a server default. Returns
+    "table.column" for every column it added.
+    """
+    insp = inspect(bind)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                continue
+            ddl = CreateColumn(column).compile(dialect=bind.dialect)
+            table_name = bind.dialect.identifier_preparer.quote(table.name)
+            with bind.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def apply_index_migrations(bind) -> List[str]:
+    """
+    Create every index declared on the models that the live schema lacks.
+
+    create_all() only emits indexes together with a brand-new table, so a
+    database created before an index was added to a model never gets it.
+    Safe to run on every startup; returns the names of indexes it created.
+    """
+    insp = inspect(bind)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(bind=bind)
+            created.append(index.name)
+    return created
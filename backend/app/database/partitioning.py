@@ -0,0 +1,240 @@
+# app/database/partitioning.py
+"""
+MySQL partitioning for the case tables.
+
+    Fir_Registration  RANGE COLUMNS(incident_date), one partition per year,
+                      optionally SUBPARTITION BY HASH(Stationid)
+    fir_progress      RANGE COLUMNS(created_at), one partition per year
+    culprit           HASH(station_id)
+
+MySQL requires the partitioning columns to be part of every unique key, so
+the primary keys become (id, <partition columns>) and other unique indexes
+are made non-unique. Partitioned InnoDB tables cannot take part in foreign
+keys, so the FKs that point at these tables are dropped (the ORM
+relationships keep working, they only need the metadata), and
+``guard_foreign_keys`` keeps create_all from adding new ones for tables
+created after the migration. The migration is opt-in and never runs at
+startup:
+
+    python -m app.database.partitioning migrate --first-year 2015 [--station-subpartitions 8]
+    python -m app.database.partitioning add-year 2027
+    python -m app.database.partitioning detach Fir_Registration p2016
+
+Retention uses EXCHANGE PARTITION: the old partition is swapped into an
+empty standalone table (a metadata-only operation) and the empty partition
+is then dropped, so retiring a year never rewrites the live table. MySQL can
+only exchange leaf partitions, so with station subpartitions each one is
+swapped into its own archive table.
+
+On other dialects (SQLite in tests) every function is a no-op.
+"""
+import argparse
+from datetime import date
+from typing import List, Set
+
+from sqlalchemy import inspect, text
+
+CULPRIT_HASH_PARTITIONS = 16
+
+# table -> (range column or None for pure hash, primary key after migration)
+PARTITIONED_TABLES = {
+    "Fir_Registration": ("incident_date", ("id", "incident_date")),
+    "fir_progress": ("created_at", ("id", "created_at")),
+    "culprit": (None, ("id", "station_id")),
+}
+
+
+def primary_key(table: str, station_subpartitions: int = 0) -> tuple:
+    pk = PARTITIONED_TABLES[table][1]
+    if table == "Fir_Registration" and station_subpartitions:
+        pk += ("Stationid",)
+    return pk
+
+
+def _pk_ddl(table: str, station_subpartitions: int = 0) -> str:
+    cols = ", ".join(f"`{c}`" for c in primary_key(table, station_subpartitions))
+    return f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY ({cols})"
+
+
+def _year_partitions(first_year: int, last_year: int) -> str:
+    parts = [f"PARTITION p{y} VALUES LESS THAN ('{y + 1}-01-01')" for y in range(first_year, last_year + 1)]
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return ",\n  ".join(parts)
+
+
+def partition_ddl(first_year: int, last_year: int, station_subpartitions: int = 0) -> List[str]:
+    """ALTER statements that partition the three tables (PKs first)."""
+    subpartition = (
+        f"SUBPARTITION BY HASH(`Stationid`) SUBPARTITIONS {station_subpartitions} "
+        if station_subpartitions
+        else ""
+    )
+    return [
+        _pk_ddl("Fir_Registration", station_subpartitions),
+        "ALTER TABLE `Fir_Registration`\n"
+        "PARTITION BY RANGE COLUMNS(`incident_date`)\n"
+        f"{subpartition}(\n  "
+        + _year_partitions(first_year, last_year)
+        + "\n)",
+        _pk_ddl("fir_progress"),
+        "ALTER TABLE `fir_progress`\nPARTITION BY RANGE COLUMNS(`created_at`) (\n  "
+        + _year_partitions(first_year, last_year)
+        + "\n)",
+        _pk_ddl("culprit"),
+        f"ALTER TABLE `culprit` PARTITION BY HASH(`station_id`) PARTITIONS {CULPRIT_HASH_PARTITIONS}",
+    ]
+
+
+def add_year_ddl(table: str, year: int) -> str:
+    """Split the catch-all pmax so ``year`` gets its own partition."""
+    return (
+        f"ALTER TABLE `{table}` REORGANIZE PARTITION pmax INTO (\n"
+        f"  PARTITION p{year} VALUES LESS THAN ('{year + 1}-01-01'),\n"
+        "  PARTITION pmax VALUES LESS THAN (MAXVALUE)\n)"
+    )
+
+
+def detach_ddl(table: str, partition: str, subpartitions: int = 0) -> List[str]:
+    """Swap a partition out into archive table(s) and drop the emptied partition."""
+    # MySQL names hash subpartitions <partition>sp0, <partition>sp1, ...
+    leaves = [f"{partition}sp{i}" for i in range(subpartitions)] if subpartitions else [partition]
+    stmts = []
+    for leaf in leaves:
+        archive = f"{table}_{leaf}"
+        stmts += [
+            f"CREATE TABLE `{archive}` LIKE `{table}`",
+            f"ALTER TABLE `{archive}` REMOVE PARTITIONING",
+            f"ALTER TABLE `{table}` EXCHANGE PARTITION `{leaf}` WITH TABLE `{archive}` WITHOUT VALIDATION",
+        ]
+    stmts.append(f"ALTER TABLE `{table}` DROP PARTITION `{partition}`")
+    return stmts
+
+
+def _drop_fk_ddl(insp) -> List[str]:
+    """Every FK that references or lives on a table being partitioned."""
+    stmts = []
+    for table in insp.get_table_names():
+        for fk in insp.get_foreign_keys(table):
+            if fk.get("name") and (table in PARTITIONED_TABLES or fk["referred_table"] in PARTITIONED_TABLES):
+                stmts.append(f"ALTER TABLE `{table}` DROP FOREIGN KEY `{fk['name']}`")
+    return stmts
+
+
+def _unique_index_ddl(insp, station_subpartitions: int = 0) -> List[str]:
+    """Unique indexes must contain the partition columns; rebuild the rest as plain indexes."""
+    stmts = []
+    for table in PARTITIONED_TABLES:
+        pk = primary_key(table, station_subpartitions)
+        for ix in insp.get_indexes(table):
+            if ix.get("unique") and not set(pk[1:]) <= set(ix["column_names"]):
+                cols = ", ".join(f"`{c}`" for c in ix["column_names"])
+                stmts.append(f"ALTER TABLE `{table}` DROP INDEX `{ix['name']}`, ADD INDEX `{ix['name']}` ({cols})")
+    return stmts
+
+
+def _subpartition_count(engine, table: str, partition: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT COUNT(SUBPARTITION_NAME) FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND PARTITION_NAME = :p"
+            ),
+            {"t": table, "p": partition},
+        ).scalar()
+
+
+def partitioned_tables(engine) -> Set[str]:
+    """Which of PARTITIONED_TABLES the database has actually partitioned."""
+    if engine.dialect.name != "mysql":
+        return set()
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT DISTINCT TABLE_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND PARTITION_NAME IS NOT NULL"
+            )
+        ).all()
+    return {name for (name,) in rows} & set(PARTITIONED_TABLES)
+
+
+def guard_foreign_keys(metadata, engine) -> int:
+    """
+    On a partitioned database, make create_all leave out every FK that
+    touches a partitioned table (MySQL error 1506), e.g. on a table added
+    after the migration. The FKs stay in the metadata, so relationships
+    keep their join conditions. Returns how many FKs were switched off.
+    """
+    partitioned = partitioned_tables(engine)
+    skipped = 0
+    if not partitioned:
+        return skipped
+    for table in metadata.tables.values():
+        for fk in table.foreign_key_constraints:
+            if partitioned & {table.name, fk.referred_table.name}:
+                fk.ddl_if(callable_=lambda *args, **kw: False)
+                skipped += 1
+    return skipped
+
+
+def _run(engine, statements: List[str]) -> List[str]:
+    if engine.dialect.name != "mysql":
+        return []
+    with engine.begin() as conn:
+        for stmt in statements:
+            conn.execute(text(stmt))
+    return statements
+
+
+def migrate(engine, first_year: int, last_year: int = None, station_subpartitions: int = 0) -> List[str]:
+    if engine.dialect.name != "mysql":
+        return []
+    last_year = last_year or date.today().year + 1
+    insp = inspect(engine)
+    return _run(
+        engine,
+        _drop_fk_ddl(insp)
+        + _unique_index_ddl(insp, station_subpartitions)
+        + partition_ddl(first_year, last_year, station_subpartitions),
+    )
+
+
+def add_year(engine, year: int) -> List[str]:
+    return _run(engine, [add_year_ddl(t, year) for t, (col, _) in PARTITIONED_TABLES.items() if col])
+
+
+def detach(engine, table: str, partition: str) -> List[str]:
+    if table not in PARTITIONED_TABLES or PARTITIONED_TABLES[table][0] is None:
+        raise ValueError(f"{table} is not range-partitioned")
+    if engine.dialect.name != "mysql":
+        return []
+    return _run(engine, detach_ddl(table, partition, _subpartition_count(engine, table, partition)))
+
+
+def main(argv=None):
+    from app.database.connection import engine
+
+    parser = argparse.ArgumentParser(prog="python -m app.database.partitioning")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("migrate")
+    m.add_argument("--first-year", type=int, required=True)
+    m.add_argument("--last-year", type=int)
+    m.add_argument("--station-subpartitions", type=int, default=0)
+    a = sub.add_parser("add-year")
+    a.add_argument("year", type=int)
+    d = sub.add_parser("detach")
+    d.add_argument("table")
+    d.add_argument("partition")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "migrate":
+        done = migrate(engine, args.first_year, args.last_year, args.station_subpartitions)
+    elif args.cmd == "add-year":
+        done = add_year(engine, args.year)
+    else:
+        done = detach(engine, args.table, args.partition)
+    for stmt in done or ["(not MySQL: nothing to do)"]:
+        print(stmt + ";")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# app/database/routing.py
+"""
+Primary/replica session routing.
+
+Read-only requests (GET/HEAD, or endpoints marked with ``@read_only``) get a
+replica session unless
+
+- the client committed a write recently (read-your-writes stickiness: the
+  client key stays pinned to the primary for a while after a commit),
+- the replica is lagging more than REPLICA_MAX_LAG_SECONDS, or
+- the replica failed its last health probe.
+
+Everything else gets the primary. The probe is throttled to one round trip
+every REPLICA_PROBE_SECONDS per process.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import (
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_STICKY_SECONDS,
+    REPLICA_PROBE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+def read_only(fn):
+    """Mark a non-GET endpoint (e.g. a search taking a JSON body) as safe for the replica."""
+    fn.__read_only__ = True
+    return fn
+
+
+def is_read_only(request) -> bool:
+    endpoint = request.scope.get("endpoint")
+    if endpoint is not None and getattr(endpoint, "__read_only__", False):
+        return True
+    return request.method in READ_METHODS
+
+
+def client_key(request) -> str:
+    auth = request.headers.get("authorization")
+    if auth:
+        return hashlib.sha1(auth.encode("utf-8")).hexdigest()
+    return request.client.host if request.client else "anonymous"
+
+
+def mysql_replica_lag(conn) -> Optional[float]:
+    """Seconds behind the source, or None if replication is not running."""
+    try:
+        row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        field = "Seconds_Behind_Source"
+    except Exception:
+        row = conn.execute(text("SHOW SLAVE STATUS")).mappings().first()
+        field = "Seconds_Behind_Master"
+    if row is None or row.get(field) is None:
+        return None
+    return float(row[field])
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        sticky_seconds: float = REPLICA_STICKY_SECONDS,
+        probe_seconds: float = REPLICA_PROBE_SECONDS,
+    ):
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.probe_seconds = probe_seconds
+        self.lag_seconds = 0.0
+        self.healthy = True
+        self._last_probe = 0.0
+        self._sticky: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Dialects without a lag query (e.g. two local SQLite files) report 0
+        self.lag_probe: Callable = lambda conn: mysql_replica_lag(conn) if conn.dialect.name == "mysql" else 0.0
+
+    def mark_write(self, key: str):
+        pin = max(self.sticky_seconds, self.lag_seconds + 1.0)
+        with self._lock:
+            self._sticky[key] = time.monotonic() + pin
+            if len(self._sticky) > 10000:
+                now = time.monotonic()
+                self._sticky = {k: t for k, t in self._sticky.items() if t > now}
+
+    def is_sticky(self, key: str) -> bool:
+        until = self._sticky.get(key)
+        return until is not None and until > time.monotonic()
+
+    def probe(self, engine, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_probe < self.probe_seconds:
+            return
+        self._last_probe = now
+        try:
+            with engine.connect() as conn:
+                lag = self.lag_probe(conn)
+            self.healthy = lag is not None
+            self.lag_seconds = lag if lag is not None else float("inf")
+        except Exception:
+            logger.warning("replica probe failed; routing reads to primary", exc_info=True)
+            self.healthy = False
+
+    def replica_usable(self, engine) -> bool:
+        self.probe(engine)
+        return self.healthy and self.lag_seconds <= self.max_lag
+
+    def stats(self) -> dict:
+        return {"healthy": self.healthy, "lag_seconds": self.lag_seconds, "sticky_clients": len(self._sticky)}
+
+
+replica_router = ReplicaRouter()
@@ -0,0 +1,330 @@
+# app/database/slow_queries.py
+"""
+Slow-query log.
+
+Cursor events time every statement; one that takes SLOW_QUERY_MS or longer
+is written as a JSON line to SLOW_QUERY_LOG (rotated by size) with
+
+    ts, duration_ms, route, fingerprint, statement, params, rows, plan
+
+- ``route`` is the matched route template ("GET /fir/detail/{fir_id}"),
+  taken from the request scope that QueryRouteMiddleware puts in a
+  context variable (thread-pool endpoints inherit it).
+- ``params`` are redacted: binds whose column looks personal (Aadhaar,
+  contact number, names, passwords...) and any 12-digit number are
+  replaced by "***". The raw values are used for EXPLAIN only and are
+  never written.
+- ``plan`` is the EXPLAIN of SELECTs, run by the writer thread on its own
+  connection, at most once per fingerprint every EXPLAIN_TTL_SECONDS, so
+  the request that was slow does not also pay for the EXPLAIN.
+
+Rank the worst offenders by total time with
+
+    python -m app.database.slow_queries [--log PATH] [--top 20] [--route /fir/search]
+"""
+import argparse
+import contextvars
+import glob
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import (
+    SLOW_QUERY_MS,
+    SLOW_QUERY_LOG,
+    SLOW_QUERY_LOG_MAX_BYTES,
+    SLOW_QUERY_LOG_BACKUPS,
+    SLOW_QUERY_EXPLAIN,
+)
+from app.database.explain import explain, plan_problems
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_TTL_SECONDS = 600
+MAX_STATEMENT_CHARS = 4000
+_PII_NAME = re.compile(
+    r"aadha?a?r|id_proof|contact|phone|password|fullname|^name|address|narrative|identity_marks|witness",
+    re.IGNORECASE,
+)
+_AADHAAR_LIKE = re.compile(r"\b\d{12}\b")
+_PLACEHOLDERS = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_SPACE = re.compile(r"\s+")
+REDACTED = "***"
+
+# Scope of the request being served; set by QueryRouteMiddleware
+current_scope: contextvars.ContextVar = contextvars.ContextVar("slow_query_scope", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: literals and IN-list lengths do not matter."""
+    shape = _SPACE.sub(" ", statement.strip())
+    shape = _LITERALS.sub("?", shape)
+    shape = _PLACEHOLDERS.sub("(...)", shape)
+    return hashlib.sha1(shape.lower().encode()).hexdigest()[:16]
+
+
+def _redact_value(name: Optional[str], value):
+    if name and _PII_NAME.search(name):
+        return REDACTED
+    if isinstance(value, str):
+        return _AADHAAR_LIKE.sub(REDACTED, value)
+    if isinstance(value, int) and not isinstance(value, bool) and len(str(abs(value))) == 12:
+        return REDACTED
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return str(value)
+
+
+def redact(parameters, context=None):
+    """JSON-safe copy of the bound parameters with personal data masked."""
+    if isinstance(parameters, dict):
+        return {k: _redact_value(k, v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the first row is enough to reproduce the shape
+            return {"first": redact(parameters[0], context), "rows": len(parameters)}
+        compiled = getattr(context, "compiled", None)
+        names = list(getattr(compiled, "positiontup", None) or [])
+        return [_redact_value(names[i] if i < len(names) else None, v) for i, v in enumerate(parameters)]
+    return None
+
+
+def _route() -> Optional[str]:
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    path = scope.get("path", "")
+    template = getattr(scope.get("route"), "path", None)
+    if template:
+        # Included routers keep their own (unprefixed) template; the prefix
+        # is whatever the request path has in front of it
+        depth = len(path.rstrip("/").split("/")) - len(template.rstrip("/").split("/"))
+        prefix = "/".join(path.split("/")[:depth + 1]) if depth > 0 else ""
+        path = prefix + template
+    return f"{scope.get('method')} {path}"
+
+
+class QueryRouteMiddleware:
+    """Pure ASGI: exposes the request scope to the cursor events."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        path: str = SLOW_QUERY_LOG,
+        max_bytes: int = SLOW_QUERY_LOG_MAX_BYTES,
+        backups: int = SLOW_QUERY_LOG_BACKUPS,
+        explain_plans: bool = SLOW_QUERY_EXPLAIN,
+    ):
+        self.threshold_ms = threshold_ms
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.explain_plans = explain_plans
+        self.recorded = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=1000)
+        self._plans: Dict[str, tuple] = {}
+        self._handler: Optional[RotatingFileHandler] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ---------- cursor events ----------
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, so a statement that raises leaves nothing behind
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < self.threshold_ms or statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        entry = {
+            "ts": datetime.utcnow().isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed_ms, 2),
+            "route": _route(),
+            "fingerprint": fingerprint(statement),
+            "statement": statement[:MAX_STATEMENT_CHARS],
+            "params": redact(parameters, context),
+            "rows": cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None,
+        }
+        raw = None if executemany else parameters
+        try:
+            self._queue.put_nowait((entry, conn.engine, statement, raw))
+        except queue.Full:
+            logger.warning("slow-query log: queue full, dropping %s", entry["fingerprint"])
+            return
+        self.recorded += 1
+        self._ensure_writer()
+
+    def install(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def uninstall(self, engine):
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    # ---------- writer thread ----------
+
+    def _ensure_writer(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._drain, name="slow-query-log", daemon=True)
+            self._thread.start()
+
+    def _plan(self, engine, statement: str, parameters, fp: str) -> Optional[List[dict]]:
+        if not self.explain_plans or statement.lstrip()[:6].upper() != "SELECT":
+            return None
+        cached = self._plans.get(fp)
+        if cached and time.monotonic() - cached[0] < EXPLAIN_TTL_SECONDS:
+            return cached[1]
+        try:
+            with engine.connect() as conn:
+                plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = [{"error": str(e)[:200]}]
+        plan = json.loads(json.dumps(plan, default=str))
+        self._plans[fp] = (time.monotonic(), plan)
+        return plan
+
+    def _write(self, entry: dict):
+        if self._handler is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"
+            )
+        record = logging.makeLogRecord({"msg": json.dumps(entry, default=str), "levelno": logging.INFO})
+        self._handler.emit(record)
+
+    def _drain(self):
+        while True:
+            entry, engine, statement, parameters = self._queue.get()
+            try:
+                plan = self._plan(engine, statement, parameters, entry["fingerprint"])
+                if plan is not None:
+                    entry["plan"] = plan
+                    entry["plan_problems"] = plan_problems(engine.dialect.name, plan)
+                self._write(entry)
+            except Exception:
+                logger.exception("slow-query log: could not write entry")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued entry is written."""
+        self._queue.join()
+        if self._handler is not None:
+            self._handler.flush()
+
+
+slow_query_log = SlowQueryLog()
+
+
+# ---------- CLI ----------
+
+def _log_files(path: str) -> List[str]:
+    """The log and its rotated backups (path.1 is the newest backup), oldest first."""
+    rotated = [p for p in glob.glob(path + ".*") if p.rsplit(".", 1)[1].isdigit()]
+    rotated.sort(key=lambda p: int(p.rsplit(".", 1)[1]), reverse=True)
+    return rotated + [path]
+
+
+def read_entries(path: str) -> List[dict]:
+    entries = []
+    for name in _log_files(path):
+        try:
+            with open(name, encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue
+        except FileNotFoundError:
+            continue
+    return entries
+
+
+def rank(entries: List[dict], route: Optional[str] = None, top: int = 20) -> List[dict]:
+    """Statements grouped by fingerprint, worst total time first."""
+    groups: Dict[str, dict] = {}
+    for e in entries:
+        if route and route not in (e.get("route") or ""):
+            continue
+        g = groups.setdefault(e["fingerprint"], {
+            "fingerprint": e["fingerprint"], "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "routes": set(), "statement": e["statement"], "plan_problems": [],
+        })
+        g["count"] += 1
+        g["total_ms"] += e["duration_ms"]
+        g["max_ms"] = max(g["max_ms"], e["duration_ms"])
+        if e.get("route"):
+            g["routes"].add(e["route"])
+        if e.get("plan_problems"):
+            g["plan_problems"] = e["plan_problems"]
+    ranked = sorted(groups.values(), key=lambda g: -g["total_ms"])[:top]
+    for g in ranked:
+        g["avg_ms"] = round(g["total_ms"] / g["count"], 2)
+        g["total_ms"] = round(g["total_ms"], 2)
+        g["routes"] = sorted(g["routes"])
+    return ranked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.database.slow_queries")
+    parser.add_argument("--log", default=SLOW_QUERY_LOG)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--route", help="only entries whose route contains this")
+    args = parser.parse_args(argv)
+
+    ranked = rank(read_entries(args.log), route=args.route, top=args.top)
+    if not ranked:
+        print("no slow queries recorded")
+        return
+    for i, g in enumerate(ranked, 1):
+        print(
+            f"{i:>2}. total {g['total_ms']:>10.1f} ms  count {g['count']:>5}  "
+            f"avg {g['avg_ms']:>8.1f} ms  max {g['max_ms']:>8.1f} ms  [{g['fingerprint']}]"
+        )
+        print(f"    routes: {', '.join(g['routes']) or '-'}")
+        if g["plan_problems"]:
+            print(f"    plan:   {'; '.join(g['plan_problems'])}")
+        print(f"    {_SPACE.sub(' ', g['statement'])[:300]}")
+
+
+if __name__ == "__main__":
+    main()
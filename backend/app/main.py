@@ -1,18 +1,83 @@
 # app/main.py
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database.connection import engine, Base
+from app.database.connection import engine, replica_engine, Base
+from app.database.migrations import apply_column_migrations, apply_index_migrations
+from app.database.partitioning import guard_foreign_keys
+from app.database.slow_queries import QueryRouteMiddleware, slow_query_log
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.profiling import ProfilingMiddleware
 from app.api.routes import (
     policememberroutes,
     firroutes,
     citizenroutes,
     governmentroutes,
+    evidenceroutes,
+    auditroutes,
+    authroutes,
+)
+from app.core.config import (
+    PROFILING_ENABLED,
+    READ_MODEL_ENABLED,
+    SLOW_QUERY_ENABLED,
+    SUGGEST_ENABLED,
+    outbox_inprocess_enabled,
+    testing,
 )
+from app.database.connection import SessionLocal
+from app.services.outbox import outbox_pool
+from app.services.audit import audit_log
+from app.services.read_model import read_model
+from app.services.revocation import revocation_list
+from app.services.suggest import suggester
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if outbox_inprocess_enabled():
+        outbox_pool.start()
+    if not testing():
+        audit_log.start()
+        revocation_list.start()
+    if READ_MODEL_ENABLED and not testing():
+        # Warms in the background; the list routes use the database until it is ready
+        read_model.start()
+    if SUGGEST_ENABLED and not testing():
+        suggester.start()
+    yield
+    read_model.stop()
+    suggester.stop()
+    outbox_pool.stop()
+    if not testing():
+        # Drains the audit buffer: nothing is lost on a graceful shutdown
+        audit_log.stop()
+        revocation_list.stop()
+
+
+app = FastAPI(title="Digital Police Station API", version="1.0", lifespan=lifespan)
+
+
+def init_schema():
+    guard_foreign_keys(Base.metadata, engine)
+    Base.metadata.create_all(bind=engine)
+    apply_column_migrations(engine)
+    apply_index_migrations(engine)
 
-app = FastAPI(title="Digital Police Station API", version="1.0")
 
-Base.metadata.create_all(bind=engine)
+# app/server.py runs this once in the parent and sets SKIP_SCHEMA_INIT for
+# the workers, so N workers do not repeat the introspection N times.
+if os.getenv("SKIP_SCHEMA_INIT") != "1":
+    init_schema()
+
+if SLOW_QUERY_ENABLED:
+    for _engine in (engine, replica_engine):
+        if _engine is not None:
+            slow_query_log.install(_engine)
 
 origins = [
     "http://localhost:5173",
@@ -21,6 +86,10 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
+# Added first so CORS wraps it and shed 503s still carry CORS headers
+app.add_middleware(AdmissionMiddleware)
+# Outside admission control: replays are answered without taking a slot
+app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -28,14 +97,42 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if SLOW_QUERY_ENABLED:
+    # Lets the cursor events tag each slow statement with its route
+    app.add_middleware(QueryRouteMiddleware)
+if PROFILING_ENABLED:
+    # Outermost, so work done in the other middlewares is profiled too
+    app.add_middleware(ProfilingMiddleware)
 
 # Mounted prefixes (these define the full paths)
 app.include_router(policememberroutes.router, prefix="/policeauth", tags=["Police Authentication"])
 app.include_router(firroutes.router, prefix="/fir", tags=["FIR Registration"])
 app.include_router(citizenroutes.router, prefix="/citizen", tags=["Citizen"])
 app.include_router(governmentroutes.router, prefix="/government", tags=["Government"])
+app.include_router(evidenceroutes.router, prefix="/evidence", tags=["Evidence"])
+app.include_router(auditroutes.router, prefix="/audit", tags=["Audit"])
+app.include_router(authroutes.router, prefix="/auth", tags=["Authentication"])
 
 
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Backend is working fine 🚀"}
+
+
+@app.get("/admission/stats", tags=["Root"])
+def admission_stats():
+    return admission_controller.stats()
+
+
+@app.get("/outbox/stats", tags=["Root"])
+def outbox_stats():
+    db = SessionLocal()
+    try:
+        return outbox_pool.stats(db)
+    finally:
+        db.close()
+
+
+@app.get("/read_model/stats", tags=["Root"])
+def read_model_stats():
+    return read_model.stats()
@@ -2,4 +2,14 @@
 from .policemember import PoliceMember
 from .firregistation import FirRegistration
 from .citizen import citizen
-from .government import government   
\ No newline at end of file
+from .government import government
+from .evidence import Evidence
+from .outbox import OutboxEvent
+from .audit import AuditLog
+from .culprit_index import CulpritSearchTerm
+from .fir_dedup import FirSignature, FirBlockingKey
+from .station_version import StationListVersion
+from .idempotency import IdempotencyRecord
+from .auth_token import RefreshToken, RevokedToken
+from .workload import OfficerWorkload
+from .archive import ArchivedFir
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from app.database.connection import Base
+from datetime import datetime
+
+
+class ArchivedFir(Base):
+    """
+    Where a closed case moved to the cold archive (see
+    app/services/archive.py): the segment file and the compressed block
+    holding its aggregate, and which line of that block it is.
+    """
+    __tablename__ = "archived_firs"
+
+    fir_id = Column(String(36), primary_key=True)
+    segment = Column(String(100), nullable=False)
+    offset = Column(Integer, nullable=False)
+    length = Column(Integer, nullable=False)
+    line = Column(Integer, nullable=False)
+    station_id = Column(Integer, nullable=False)
+    # FirRegistration.version when archived; the hot rows are only deleted
+    # if nothing changed them since
+    version = Column(Integer, nullable=False)
+    closed_at = Column(Date, nullable=True)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_archived_firs_segment", "segment"),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.database.connection import Base
+from datetime import datetime
+
+
+class AuditLog(Base):
+    """
+    Append-only record of case mutations. Each row carries the hash of the
+    previous row, so editing or deleting any entry breaks the chain from
+    that point on.
+    """
+    __tablename__ = "audit_log"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    actor_type = Column(String(20), nullable=False)  # police|citizen|government
+    actor_id = Column(String(100), nullable=False)
+    action = Column(String(50), nullable=False)
+    fir_id = Column(String(36), nullable=True)
+    details = Column(Text, nullable=True)  # JSON
+    prev_hash = Column(String(64), nullable=False)
+    entry_hash = Column(String(64), nullable=False)
+
+    __table_args__ = (
+        Index("ix_audit_fir", "fir_id", "id"),
+        Index("ix_audit_actor", "actor_type", "actor_id", "id"),
+    )
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.database.connection import Base
+from datetime import datetime
+
+
+class RefreshToken(Base):
+    """
+    One row per refresh token issued. Tokens rotate: using one marks it
+    used and issues the next in the same family, so a second use of the
+    same token means it was stolen and the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(32), nullable=False, unique=True)
+    family = Column(String(32), nullable=False, index=True)
+    # "police:12", "citizen:7", "government:3"
+    subject = Column(String(64), nullable=False, index=True)
+    # Claims copied into every access token minted from this family (JSON)
+    claims = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class RevokedToken(Base):
+    """
+    Append-only revocation feed that every worker tails into memory.
+    kind "jti": one token; kind "subject": every token of ``value`` issued
+    at or before ``not_after_iat``. Rows are purged once ``expires_at`` has
+    passed, i.e. once every token they cover has expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(10), nullable=False)
+    value = Column(String(64), nullable=False)
+    not_after_iat = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires", "expires_at"),
+    )
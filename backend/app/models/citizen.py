@@ -5,7 +5,7 @@ class citizen(Base):
     __tablename__ = "citizen_login"
 
     citizen_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    aadhar_no = Column(String(100), nullable=False)
+    aadhar_no = Column(String(100), nullable=False, index=True)
     password = Column(String(100), nullable=False)
 
 
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database.connection import Base
+
+
+class CulpritSearchTerm(Base):
+    """
+    Inverted index over culprit records: one row per (term, culprit).
+    station_id and custody_status are copied in so filtered lookups are
+    answered from the index alone.
+    """
+    __tablename__ = "culprit_search_terms"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    term = Column(String(32), nullable=False)
+    culprit_id = Column(Integer, ForeignKey("culprit.id"), nullable=False)
+    station_id = Column(Integer, nullable=False)
+    custody_status = Column(String(50), nullable=True)
+
+    __table_args__ = (
+        Index("ix_culprit_terms_term_station", "term", "station_id", "culprit_id"),
+    )
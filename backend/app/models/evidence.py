@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Table, UniqueConstraint
+from app.database.connection import Base
+from datetime import datetime
+
+
+# Links progress entries to the evidence they cite (many-to-many: one photo can
+# back several entries, one entry can carry several photos).
+progress_evidence = Table(
+    "fir_progress_evidence",
+    Base.metadata,
+    Column("progress_id", Integer, ForeignKey("fir_progress.id"), primary_key=True),
+    Column("evidence_id", Integer, ForeignKey("evidence.id"), primary_key=True, index=True),
+)
+
+
+class Evidence(Base):
+    __tablename__ = "evidence"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), nullable=False, index=True)
+    # Bytes live in the content-addressed store under this digest; identical
+    # uploads share one blob on disk.
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=False)
+    filename = Column(String(255), nullable=True)
+    uploaded_by = Column(Integer, ForeignKey("PoliceMember.member_id"), nullable=True)
+    thumbnail_ready = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("fir_id", "sha256", name="uq_evidence_fir_sha256"),)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from app.database.connection import Base
+
+
+class FirSignature(Base):
+    """MinHash signature of an FIR's case_narrative (hex, 8 chars per slot)."""
+    __tablename__ = "fir_signatures"
+
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), primary_key=True)
+    signature = Column(String(1024), nullable=False)
+
+
+class FirBlockingKey(Base):
+    """
+    Duplicate-detection buckets: one row per (key, FIR). Keys are LSH band
+    hashes of the narrative signature plus complainant-name and location
+    blocking keys; incident_date is copied in so the date window is applied
+    inside the index.
+    """
+    __tablename__ = "fir_blocking_keys"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    key = Column(String(40), nullable=False)
+    incident_date = Column(Date, nullable=False)
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_fir_blocking_key_date", "key", "incident_date", "fir_id"),
+    )
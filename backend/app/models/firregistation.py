@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Time, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Date, Time, ForeignKey, DateTime, Index, Float
 from app.database.connection import Base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -22,6 +22,41 @@ class FirRegistration(Base):
     case_narrative = Column(String(1000), nullable=False)
     Stationid = Column(Integer, nullable=False)
     member_id = Column(Integer, ForeignKey("PoliceMember.member_id"))
+    # Officer handling the case (member_id is who registered it); see
+    # app/services/assignment.py
+    assigned_member_id = Column(Integer, ForeignKey("PoliceMember.member_id"), nullable=True)
+    assigned_at = Column(DateTime, nullable=True)
+    # Optional; filled from the gazetteer when the officer gives no coordinates
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # Geohash of (latitude, longitude); see app/services/geo.py
+    geo_cell = Column(String(12), nullable=True)
+    # Bumped by every change to the FIR or its timeline; drives the ETags and
+    # optimistic concurrency (see __mapper_args__)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=True, default=datetime.utcnow)
+
+    __table_args__ = (
+        # list_by_aadhar / citizen dashboard: filter by Aadhaar, newest first
+        Index("ix_fir_aadhar_date", "id_proof_value", "incident_date", "id"),
+        # list_by_station, optionally bounded by incident_date. InnoDB appends
+        # the primary key to every secondary index anyway; naming id lets
+        # SQLite walk it in /fir/query's (incident_date, id) order too
+        Index("ix_fir_station_date", "Stationid", "incident_date", "id"),
+        # /fir/nearby and /fir/within: geohash prefix ranges, then the time window
+        Index("ix_fir_geo_cell_date", "geo_cell", "incident_date"),
+        # /fir/query's designed set (see app/services/fir_query.py): an
+        # equality prefix, then the (incident_date, id) sort key
+        Index("ix_fir_assignee", "assigned_member_id", "incident_date", "id"),
+        Index("ix_fir_station_offence_date", "Stationid", "offence_type", "incident_date", "id"),
+        Index("ix_fir_offence_date", "offence_type", "incident_date", "id"),
+        Index("ix_fir_member_date", "member_id", "incident_date", "id"),
+        Index("ix_fir_date", "incident_date", "id"),
+    )
+
+    # Every ORM UPDATE of this row is "... WHERE id = ? AND version = ?" and
+    # bumps version; a writer that lost the race gets StaleDataError.
+    __mapper_args__ = {"version_id_col": version}
 
     progress_updates = relationship("FIRProgress", back_populates="fir", cascade="all, delete-orphan")
     closed_entry = relationship("closedFir", back_populates="original_fir", uselist=False, cascade="all, delete-orphan")
@@ -30,7 +65,7 @@ class FirRegistration(Base):
 class FIRProgress(Base):
     __tablename__ = "fir_progress"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"))
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), index=True)
     progress_text = Column(String(1000), nullable=True)
     evidence_text = Column(String(1000), nullable=True)
     evidence_photos = Column(String(2000), nullable=True)
@@ -41,12 +76,18 @@ class FIRProgress(Base):
 
     fir = relationship("FirRegistration", back_populates="progress_updates")
     culprit = relationship("Culprit", back_populates="progress_entries", foreign_keys=[culprit_id])
+    # selectin: one batched query per timeline instead of one per entry
+    evidence = relationship("Evidence", secondary="fir_progress_evidence", lazy="selectin")
+
+    @property
+    def evidence_ids(self):
+        return [e.id for e in self.evidence]
 
 class Culprit(Base):
     __tablename__ = "culprit"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"))
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), index=True)
     station_id = Column(Integer, nullable=False)
     member_id = Column(Integer, ForeignKey("PoliceMember.member_id"))
     name = Column(String(100), nullable=False)
@@ -65,7 +106,7 @@ class closedFir(Base):
     __tablename__ = "closed_fir"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"))
+    fir_id = Column(String(36), ForeignKey("Fir_Registration.id"), index=True)
     fullname = Column(String(100), nullable=False)
     age = Column(Integer, nullable=False)
     gender = Column(String(20), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from app.database.connection import Base
 from datetime import datetime
 
@@ -25,3 +25,8 @@ class Escalation(Base):
     status = Column(String(20), nullable=False, default="pending")  # pending|in_review|resolved|rejected
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # /government/escalations filters by status and sorts newest first
+    __table_args__ = (
+        Index("ix_escalations_status_created", "status", "created_at"),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.database.connection import Base
+from datetime import datetime
+
+
+class IdempotencyRecord(Base):
+    """
+    Stored outcome of a POST sent with an Idempotency-Key. A row is inserted
+    as "in_progress" before the request runs (the unique scope_hash is the
+    cross-process lock) and filled with the response once it completes.
+    """
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # sha256 of caller credentials + path + key
+    scope_hash = Column(String(64), nullable=False, unique=True)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress|done
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_expires", "expires_at"),
+    )
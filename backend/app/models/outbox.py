@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.database.connection import Base
+from datetime import datetime
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+
+    status = Column(String(20), nullable=False, default="pending")  # pending|done|dead
+    attempts = Column(Integer, nullable=False, default=0)
+    # Next time the event may be picked up. Claiming pushes it out by the
+    # lease, failures push it out by the backoff; a crashed worker's claim
+    # simply expires and the event is delivered again.
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(String(1000), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_status_available", "status", "available_at", "id"),
+    )
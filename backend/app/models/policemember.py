@@ -8,4 +8,4 @@ class PoliceMember(Base):
     member_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False)
     password = Column(String(100), nullable=False)
-    station_id = Column(Integer, nullable=False)
+    station_id = Column(Integer, nullable=False, index=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, DateTime
+from app.database.connection import Base
+from datetime import datetime
+
+
+class StationListVersion(Base):
+    """
+    Bumped whenever a station's FIR list changes (registration, closure), so
+    /fir/list_by_station can answer If-None-Match from one primary-key read.
+    """
+    __tablename__ = "station_list_versions"
+
+    station_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
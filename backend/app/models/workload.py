@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from app.database.connection import Base
+from datetime import datetime
+
+
+class OfficerWorkload(Base):
+    """
+    Open cases currently assigned to an officer. Maintained in the same
+    transaction as every assignment and closure (see
+    app/services/assignment.py), so reading a station's workloads is one row
+    per member instead of a count over Fir_Registration.
+    """
+    __tablename__ = "officer_workloads"
+
+    member_id = Column(Integer, ForeignKey("PoliceMember.member_id"), primary_key=True, autoincrement=False)
+    station_id = Column(Integer, nullable=False, index=True)
+    open_cases = Column(Integer, nullable=False, default=0)
+    # Every assignment ever made to the officer, closed cases included
+    assigned_total = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
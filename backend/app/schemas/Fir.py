@@ -15,16 +15,28 @@ class FirCreate(BaseModel):
     offence_type: str = Field(..., example="Theft")
     incident_location: str = Field(..., example="Downtown Market")
     case_narrative: str = Field(..., example="Detailed description of the incident...")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, example=12.9716)
+    longitude: Optional[float] = Field(None, ge=-180, le=180, example=77.5946)
     StationId: Optional[int] = None
     member_id: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
+class DuplicateCandidate(BaseModel):
+    fir_id: str
+    fullname: str
+    incident_date: date
+    incident_location: str
+    station_id: int
+    score: float
+    narrative_similarity: float
+
 class FirResponse(BaseModel):
     message: str
     report_id: str
     registered_by_id: int
     registered_by_name: str
+    possible_duplicates: List[DuplicateCandidate] = []
 
     model_config = {"from_attributes": True}
 
@@ -47,10 +59,29 @@ class FIRProgressUpdate(BaseModel):
     evidence_photos: Optional[str] = None
     witness_info: Optional[str] = None
     other_info: Optional[str] = None
+    evidence_ids: Optional[List[int]] = None
     culprit: Optional[CulpritCreate] = None
+    # Optional compare-and-swap: reject with 409 unless the FIR is still at this version
+    expected_version: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
+class BatchCulpritCreate(CulpritCreate):
+    fir_id: str
+
+class FIRProgressBatch(BaseModel):
+    progress: List[FIRProgressUpdate] = Field(default_factory=list, max_length=200)
+    culprits: List[BatchCulpritCreate] = Field(default_factory=list, max_length=200)
+
+    model_config = {"from_attributes": True}
+
+class FIRProgressBatchResponse(BaseModel):
+    progress_ids: List[int]
+    # Parallel to progress_ids: the culprit created with that entry, if any
+    progress_culprit_ids: List[Optional[int]]
+    # Parallel to the request's standalone culprits
+    culprit_ids: List[int]
+
 class FIRProgressRecord(BaseModel):
     id: int
     progress_text: Optional[str] = None
@@ -59,6 +90,7 @@ class FIRProgressRecord(BaseModel):
     witness_info: Optional[str] = None
     other_info: Optional[str] = None
     culprit_id: Optional[int] = None
+    evidence_ids: List[int] = []
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -75,6 +107,7 @@ class FIRProgressResponse(BaseModel):
 
 class FIRCloseRequest(BaseModel):
     fir_id: str
+    expected_version: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
@@ -83,6 +116,23 @@ class FIRCloseResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class FIRAssignRequest(BaseModel):
+    fir_id: str
+    # None: the least-loaded officer at the FIR's station
+    member_id: Optional[int] = None
+    expected_version: Optional[int] = None
+
+    model_config = {"from_attributes": True}
+
+class FIRAssignResponse(BaseModel):
+    message: str
+    fir_id: str
+    assigned_member_id: int
+    previous_member_id: Optional[int] = None
+    version: int
+
+    model_config = {"from_attributes": True}
+
 class CulpritRecord(BaseModel):
     id: int
     name: str
@@ -96,6 +146,18 @@ class CulpritRecord(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class CulpritSearchResult(BaseModel):
+    culprit_id: int
+    fir_id: Optional[str] = None
+    station_id: int
+    name: str
+    identity_marks: Optional[str] = None
+    address: Optional[str] = None
+    custody_status: Optional[str] = None
+    score: float
+
+    model_config = {"from_attributes": True}
+
 class FIRDetailsResponse(BaseModel):
     fir_id: str
     fullname: str
@@ -112,6 +174,7 @@ class FIRDetailsResponse(BaseModel):
     case_narrative: str
     station_id: int
     member_id: int
+    assigned_member_id: Optional[int] = None
     status: str
     progress: List[FIRProgressRecord]
     culprits: List[CulpritRecord]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class PoliceMemberCreate(BaseModel):
     name: str
@@ -29,6 +30,8 @@ class PoliceAuth(BaseModel):
 class PoliceAuthResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     police_member_id: int
     station_id: int
     name: str
@@ -38,7 +41,10 @@ class PoliceAuthResponse(BaseModel):
     }    
     
 class MemberDetails(BaseModel):
+    member_id: Optional[int] = None
     name: str
+    open_cases: int = 0
+    assigned_total: int = 0
     model_config = {
         "from_attributes": True
     }    
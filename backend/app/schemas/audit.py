@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class AuditEntryRecord(BaseModel):
+    id: int
+    created_at: datetime
+    actor_type: str
+    actor_id: str
+    action: str
+    fir_id: Optional[str] = None
+    details: Optional[str] = None
+    prev_hash: str
+    entry_hash: str
+
+    model_config = {"from_attributes": True}
+
+
+class AuditQueryResponse(BaseModel):
+    entries: List[AuditEntryRecord]
+    next_after_id: Optional[int] = None
+
+    model_config = {"from_attributes": True}
+
+
+class AuditVerifyResponse(BaseModel):
+    intact: bool
+    first_broken_id: Optional[int] = None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class RevokeSubjectRequest(BaseModel):
+    subject_type: Literal["police", "citizen", "government"]
+    subject_id: str = Field(..., min_length=1, max_length=50)
+
+
+class RevokeSubjectResponse(BaseModel):
+    subject: str
+    refresh_tokens_revoked: int
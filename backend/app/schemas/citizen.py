@@ -1,6 +1,9 @@
 # app/schemas/citizen.py
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Optional, List
+from datetime import date
+
+from app.schemas.Fir import FIRProgressRecord
 
 
 # ---------- Helpers ----------
@@ -43,6 +46,8 @@ class citizenAuth(BaseModel):
 class citizenauthresponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     citizen_id: int
     aadhar_no: str
     model_config = {"from_attributes": True}
@@ -67,3 +72,27 @@ class EscalationRecord(BaseModel):
     aadhar_no: str
     reason: str
     model_config = {"from_attributes": True}
+
+
+# ---------- Dashboard (one-call aggregate) ----------
+
+class CitizenDashboardFIR(BaseModel):
+    fir_id: str
+    fullname: str
+    offence_type: str
+    incident_location: str
+    incident_date: date
+    status: str
+    station_id: int
+    progress_count: int = 0
+    latest_progress: Optional[FIRProgressRecord] = None
+    escalation_status: Optional[str] = None
+    model_config = {"from_attributes": True}
+
+
+class CitizenDashboardResponse(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    firs: List[CitizenDashboardFIR]
+    model_config = {"from_attributes": True}
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class EvidenceRecord(BaseModel):
+    id: int
+    fir_id: str
+    sha256: str
+    size: int
+    content_type: str
+    filename: Optional[str] = None
+    thumbnail_ready: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class EvidenceUploadResponse(BaseModel):
+    message: str
+    deduplicated: bool
+    evidence: EvidenceRecord
+
+    model_config = {"from_attributes": True}
@@ -26,6 +26,8 @@ class governmentAuth(BaseModel):
 class governmentauthresponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
@@ -75,3 +77,28 @@ class EscalationRecord(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class EscalationBulkStatusRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: str = Field(..., pattern="^(pending|in_review|resolved|rejected)$")
+
+    model_config = {"from_attributes": True}
+
+
+class EscalationStatusOutcome(BaseModel):
+    id: int
+    # updated | unchanged | not_found | invalid_transition | conflict
+    outcome: str
+    from_status: Optional[str] = None
+    detail: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class EscalationBulkStatusResponse(BaseModel):
+    status: str
+    updated: int
+    results: List[EscalationStatusOutcome]
+
+    model_config = {"from_attributes": True}
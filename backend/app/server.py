@@ -0,0 +1,164 @@
+# app/server.py
+"""
+Multi-process runner.
+
+    python -m app.server [--workers N] [--bind 0.0.0.0:8000]
+    python -m app.server bench [--max-workers 8] [--path /] [--requests 4000]
+
+Gunicorn (when installed) pre-forks uvicorn workers from a preloaded app;
+otherwise uvicorn's own process manager is used. Either way:
+
+- the schema is created/migrated once, in the parent, and workers start
+  with SKIP_SCHEMA_INIT=1 so they skip create_all and introspection;
+- the parent disposes its pool before forking, and every child drops any
+  inherited connections (app.database.connection registers an
+  after-fork hook), so no socket is ever shared between processes;
+- outbox workers, the audit flusher and all caches are started per worker
+  in the app lifespan, so workers share nothing but the database.
+
+The default worker count is 2 * CPUs + 1, capped so that
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays within DB_MAX_CONNECTIONS.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import DB_MAX_CONNECTIONS, DB_MAX_OVERFLOW, DB_POOL_SIZE, WEB_CONCURRENCY
+
+
+def default_workers(cpus: int = None) -> int:
+    if WEB_CONCURRENCY:
+        return WEB_CONCURRENCY
+    cpus = cpus or os.cpu_count() or 1
+    by_connections = max(DB_MAX_CONNECTIONS // max(DB_POOL_SIZE + DB_MAX_OVERFLOW, 1), 1)
+    return max(1, min(2 * cpus + 1, by_connections))
+
+
+def prepare_parent():
+    """Import the app once, migrate, and leave no open connections behind."""
+    os.environ.pop("SKIP_SCHEMA_INIT", None)
+    from app.main import app
+    from app.database.connection import engine, replica_engine
+
+    engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
+    os.environ["SKIP_SCHEMA_INIT"] = "1"
+    return app
+
+
+def _run_gunicorn(app, bind: str, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    class _Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", bind)
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("graceful_timeout", 30)
+            # Recycle workers now and then so slow leaks cannot accumulate
+            self.cfg.set("max_requests", 10000)
+            self.cfg.set("max_requests_jitter", 1000)
+
+        def load(self):
+            return app
+
+    _Server().run()
+
+
+def serve(bind: str = "0.0.0.0:8000", workers: int = None):
+    workers = workers or default_workers()
+    app = prepare_parent()
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        import uvicorn
+
+        host, _, port = bind.rpartition(":")
+        # Spawned workers re-import app.main; SKIP_SCHEMA_INIT is inherited
+        uvicorn.run("app.main:app", host=host or "0.0.0.0", port=int(port), workers=workers)
+        return
+    _run_gunicorn(app, bind, workers)
+
+
+# ---------- Benchmark ----------
+
+def _load(url: str, total: int, concurrency: int, headers: dict) -> float:
+    import httpx
+
+    with httpx.Client(headers=headers, timeout=30) as client:
+        client.get(url)  # warm up
+
+        def hit(_):
+            return client.get(url).status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            codes = list(pool.map(hit, range(total)))
+        elapsed = time.perf_counter() - started
+    failed = sum(c >= 500 for c in codes)
+    if failed:
+        print(f"  warning: {failed} responses were 5xx", file=sys.stderr)
+    return total / elapsed
+
+
+def bench(max_workers: int, path: str, total: int, concurrency: int, port: int, token: str = None):
+    """Requests/second against a fresh server for 1, 2, 4 ... max_workers workers."""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    counts = sorted({1, *[2 ** i for i in range(1, max_workers.bit_length())], max_workers})
+    results = []
+    for n in counts:
+        env = {**os.environ, "ADMISSION_ENABLED": "0"}
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--workers", str(n), "--bind", f"127.0.0.1:{port}"], env=env
+        )
+        try:
+            _wait_until_up(f"http://127.0.0.1:{port}/")
+            rps = _load(f"http://127.0.0.1:{port}{path}", total, concurrency, headers)
+        finally:
+            proc.terminate()
+            proc.wait(30)
+        results.append((n, rps))
+        print(f"workers={n:<3} {rps:10.1f} req/s  x{rps / results[0][1]:.2f}")
+    return results
+
+
+def _wait_until_up(url: str, timeout: float = 30):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not come up at {url}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bind", default="0.0.0.0:8000")
+    sub = parser.add_subparsers(dest="cmd")
+    b = sub.add_parser("bench")
+    b.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    b.add_argument("--path", default="/")
+    b.add_argument("--requests", type=int, default=4000)
+    b.add_argument("--concurrency", type=int, default=64)
+    b.add_argument("--port", type=int, default=8765)
+    b.add_argument("--token", help="Bearer token for authenticated paths")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "bench":
+        bench(args.max_workers, args.path, args.requests, args.concurrency, args.port, args.token)
+    else:
+        serve(args.bind, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+# app/services/archive.py
+"""
+Cold archive for old closed cases.
+
+A closed case whose closed_at is older than ARCHIVE_RETENTION_DAYS moves
+out of the hot tables as one JSON aggregate (the FIR, its closed_fir row,
+progress, culprits and settled escalations) into a segment file under
+ARCHIVE_DIR:
+
+    <utc time>-<random>.jsonl.zst|gz     blocks of ARCHIVE_BLOCK_RECORDS
+                                         aggregates, each block its own
+                                         zstd frame / gzip member
+    <segment>.idx                        fir_id, offset, length, line
+
+Concatenated frames are still one valid stream, so ``zstdcat``/``zcat``
+read a whole segment. ``archived_firs`` holds the same offsets, so
+reading one case decompresses one block. /fir/detail reads archived cases
+through a per-worker LRU (ARCHIVE_CACHE_SIZE).
+
+A run works in two idempotent phases, so a crash at any point only leaves
+work for the next run:
+
+1. archive: pick up to ARCHIVE_BATCH_SIZE eligible cases, write their
+   segment (fsync, then rename), then commit their archived_firs rows;
+2. purge: delete the hot rows of archived cases in transactions of
+   ARCHIVE_DELETE_CHUNK cases. A case whose FIR version moved since it
+   was archived, or that gained evidence or an open escalation, is
+   un-archived instead and picked up again later.
+
+Cases with evidence stay hot: the evidence routes serve blobs by
+evidence row. Audit entries are never touched; the chain must stay whole.
+Archived cases leave the list, search and duplicate-detection indexes.
+
+    python -m app.services.archive [--days N] [--max-batches N]
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    ARCHIVE_DIR,
+    ARCHIVE_RETENTION_DAYS,
+    ARCHIVE_CODEC,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_BLOCK_RECORDS,
+    ARCHIVE_DELETE_CHUNK,
+    ARCHIVE_CACHE_SIZE,
+)
+from app.models.archive import ArchivedFir
+from app.models.citizen import CitizenEscalation
+from app.models.culprit_index import CulpritSearchTerm
+from app.models.evidence import Evidence, progress_evidence
+from app.models.fir_dedup import FirBlockingKey, FirSignature
+from app.models.firregistation import FirRegistration, FIRProgress, Culprit, closedFir
+from app.models.government import Escalation
+from app.services import versions
+from app.services.read_model import read_model
+
+try:
+    import zstandard
+except ImportError:  # gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+OPEN_ESCALATION = ("pending", "in_review")
+_EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+
+# ---------- segment files ----------
+
+def _codec(requested: str = ARCHIVE_CODEC) -> str:
+    if requested == "zstd" and zstandard is None:
+        logger.warning("archive: zstandard is not installed, writing gzip segments")
+        return "gzip"
+    return requested
+
+
+def _codec_of(segment: str) -> str:
+    return "zstd" if segment.endswith(_EXTENSIONS["zstd"]) else "gzip"
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd archive segments")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def write_segment(
+    directory: str, cases: List[Tuple[str, dict]], codec: str, block_records: int = ARCHIVE_BLOCK_RECORDS,
+) -> Tuple[str, List[Tuple[str, int, int, int]]]:
+    """Write (fir_id, aggregate) pairs; returns the segment name and (fir_id, offset, length, line)."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}{_EXTENSIONS[codec]}"
+    path = os.path.join(directory, name)
+    entries = []
+    with open(path + ".tmp", "wb") as fh:
+        offset = 0
+        for start in range(0, len(cases), block_records):
+            block = cases[start:start + block_records]
+            data = b"".join(
+                json.dumps(case, default=str, separators=(",", ":")).encode() + b"\n" for _, case in block
+            )
+            blob = _compress(codec, data)
+            fh.write(blob)
+            entries += [(fir_id, offset, len(blob), line) for line, (fir_id, _) in enumerate(block)]
+            offset += len(blob)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(path + ".tmp", path)
+    # The offset index again, next to the data: archived_firs can be rebuilt from disk
+    with open(path + ".idx", "w", encoding="utf-8") as fh:
+        for fir_id, offset, length, line in entries:
+            fh.write(json.dumps({"fir_id": fir_id, "offset": offset, "length": length, "line": line}) + "\n")
+    return name, entries
+
+
+def read_case(directory: str, segment: str, offset: int, length: int, line: int) -> dict:
+    with open(os.path.join(directory, segment), "rb") as fh:
+        fh.seek(offset)
+        blob = fh.read(length)
+    return json.loads(_decompress(_codec_of(segment), blob).split(b"\n")[line])
+
+
+# ---------- aggregates ----------
+
+def _columns(obj) -> dict:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _by_fir(rows: Iterable, fir_ids: List[str]) -> Dict[str, list]:
+    grouped: Dict[str, list] = {fid: [] for fid in fir_ids}
+    for r in rows:
+        grouped[r.fir_id].append(_columns(r))
+    return grouped
+
+
+def aggregates(db: Session, fir_ids: List[str]) -> Dict[str, dict]:
+    """Everything the hot tables hold about each case, one IN query per table."""
+    firs = db.query(FirRegistration).filter(FirRegistration.id.in_(fir_ids)).all()
+    progress = _by_fir(
+        db.query(FIRProgress).filter(FIRProgress.fir_id.in_(fir_ids)).order_by(FIRProgress.id).all(), fir_ids
+    )
+    culprits = _by_fir(db.query(Culprit).filter(Culprit.fir_id.in_(fir_ids)).order_by(Culprit.id).all(), fir_ids)
+    closed = _by_fir(db.query(closedFir).filter(closedFir.fir_id.in_(fir_ids)).all(), fir_ids)
+    escalations = _by_fir(
+        db.query(Escalation).filter(Escalation.fir_id.in_(fir_ids)).order_by(Escalation.id).all(), fir_ids
+    )
+    citizen_escalations = _by_fir(
+        db.query(CitizenEscalation).filter(CitizenEscalation.fir_id.in_(fir_ids)).all(), fir_ids
+    )
+    return {
+        f.id: {
+            "fir": _columns(f),
+            "closed": closed[f.id],
+            # Cases with evidence are never archived, so no entry cites any
+            "progress": [dict(p, evidence_ids=[]) for p in progress[f.id]],
+            "culprits": culprits[f.id],
+            "escalations": escalations[f.id],
+            "citizen_escalations": citizen_escalations[f.id],
+        }
+        for f in firs
+    }
+
+
+def _still_eligible():
+    """Conditions a closed case must meet to leave (or stay out of) the hot tables."""
+    return (
+        ~exists().where(Evidence.fir_id == FirRegistration.id),
+        ~exists().where(Escalation.fir_id == FirRegistration.id, Escalation.status.in_(OPEN_ESCALATION)),
+    )
+
+
+def candidates(db: Session, cutoff, limit: int) -> List[str]:
+    return [
+        fid
+        for (fid,) in db.query(FirRegistration.id)
+        .join(closedFir, closedFir.fir_id == FirRegistration.id)
+        .filter(
+            closedFir.closed_at < cutoff,
+            ~exists().where(ArchivedFir.fir_id == FirRegistration.id),
+            *_still_eligible(),
+        )
+        .distinct()
+        .order_by(FirRegistration.id)
+        .limit(limit)
+        .all()
+    ]
+
+
+def _delete_hot_rows(db: Session, fir_ids: List[str]):
+    progress_ids = select(FIRProgress.id).where(FIRProgress.fir_id.in_(fir_ids))
+    culprit_ids = select(Culprit.id).where(Culprit.fir_id.in_(fir_ids))
+    db.execute(delete(progress_evidence).where(progress_evidence.c.progress_id.in_(progress_ids)))
+    db.execute(delete(CulpritSearchTerm).where(CulpritSearchTerm.culprit_id.in_(culprit_ids)))
+    # Children first: progress cites culprits, everything cites the FIR
+    for model in (FIRProgress, Culprit, closedFir, Escalation, CitizenEscalation, FirSignature, FirBlockingKey):
+        db.execute(delete(model).where(model.fir_id.in_(fir_ids)))
+    db.execute(delete(FirRegistration).where(FirRegistration.id.in_(fir_ids)))
+
+
+def detail(case: dict) -> dict:
+    """An archived aggregate in the shape of FIRDetailsResponse."""
+    f = case["fir"]
+    return {
+        "fir_id": f["id"],
+        "fullname": f["fullname"],
+        "age": f["age"],
+        "gender": f["gender"],
+        "address": f["address"],
+        "contact_number": f["contact_number"],
+        "id_proof_type": f["id_proof_type"],
+        "id_proof_value": f["id_proof_value"],
+        "incident_date": f["incident_date"],
+        "incident_time": f["incident_time"],
+        "offence_type": f["offence_type"],
+        "incident_location": f["incident_location"],
+        "case_narrative": f["case_narrative"],
+        "station_id": f["Stationid"],
+        "member_id": f["member_id"],
+        "assigned_member_id": f.get("assigned_member_id"),
+        "status": "closed",
+        # Newest first, as the hot detail routes return them
+        "progress": case["progress"][::-1],
+        "culprits": case["culprits"],
+    }
+
+
+def updated_at(case: dict) -> Optional[datetime]:
+    value = case["fir"].get("updated_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+# ---------- archive ----------
+
+class ColdArchive:
+    def __init__(
+        self,
+        directory: str = ARCHIVE_DIR,
+        cache_size: int = ARCHIVE_CACHE_SIZE,
+        codec: str = ARCHIVE_CODEC,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        block_records: int = ARCHIVE_BLOCK_RECORDS,
+        delete_chunk: int = ARCHIVE_DELETE_CHUNK,
+    ):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.codec = codec
+        self.batch_size = batch_size
+        self.block_records = block_records
+        self.delete_chunk = delete_chunk
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------- reads ----------
+
+    def get(self, db: Session, fir_id: str) -> Optional[dict]:
+        """The archived aggregate of ``fir_id``, or None if it is not archived."""
+        with self._lock:
+            case = self._cache.get(fir_id)
+            if case is not None:
+                self._cache.move_to_end(fir_id)
+                self.hits += 1
+                return case
+        entry = db.query(ArchivedFir).filter(ArchivedFir.fir_id == fir_id).first()
+        if entry is None:
+            return None
+        case = read_case(self.directory, entry.segment, entry.offset, entry.length, entry.line)
+        with self._lock:
+            self.misses += 1
+            self._cache[fir_id] = case
+            self._cache.move_to_end(fir_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return case
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    # ---------- phase 1: write segments ----------
+
+    def archive_batch(self, db: Session, cutoff) -> int:
+        fir_ids = candidates(db, cutoff, self.batch_size)
+        if not fir_ids:
+            return 0
+        cases = aggregates(db, fir_ids)
+        segment, entries = write_segment(
+            self.directory, [(fid, cases[fid]) for fid in fir_ids], _codec(self.codec), self.block_records,
+        )
+        now = datetime.utcnow()
+        for fir_id, offset, length, line in entries:
+            fir, closed = cases[fir_id]["fir"], cases[fir_id]["closed"]
+            db.add(ArchivedFir(
+                fir_id=fir_id, segment=segment, offset=offset, length=length, line=line,
+                station_id=fir["Stationid"], version=fir["version"],
+                closed_at=closed[0]["closed_at"] if closed else None, archived_at=now,
+            ))
+        db.commit()
+        logger.info("archive: wrote %s cases to %s", len(entries), segment)
+        return len(entries)
+
+    # ---------- phase 2: purge the hot tables ----------
+
+    def purge(self, db: Session) -> Tuple[int, int]:
+        """Delete hot rows of archived cases; returns (deleted, un-archived)."""
+        deleted = unarchived = 0
+        while True:
+            pending = (
+                db.query(ArchivedFir.fir_id, ArchivedFir.version, ArchivedFir.station_id)
+                .join(FirRegistration, FirRegistration.id == ArchivedFir.fir_id)
+                .order_by(ArchivedFir.fir_id)
+                .limit(self.delete_chunk)
+                .all()
+            )
+            if not pending:
+                return deleted, unarchived
+            current = dict(
+                db.query(FirRegistration.id, FirRegistration.version)
+                .filter(FirRegistration.id.in_([p.fir_id for p in pending]), *_still_eligible())
+                .with_for_update()
+                .all()
+            )
+            ok = [p for p in pending if current.get(p.fir_id) == p.version]
+            stale = [p.fir_id for p in pending if current.get(p.fir_id) != p.version]
+            if stale:
+                # Changed after its segment was written: archive it again later
+                db.execute(delete(ArchivedFir).where(ArchivedFir.fir_id.in_(stale)))
+                with self._lock:
+                    for fir_id in stale:
+                        self._cache.pop(fir_id, None)
+            if ok:
+                _delete_hot_rows(db, [p.fir_id for p in ok])
+                for station_id in sorted({p.station_id for p in ok}):
+                    versions.bump_station(db, station_id)
+            db.commit()
+            read_model.remove([p.fir_id for p in ok])
+            deleted += len(ok)
+            unarchived += len(stale)
+
+    def run(self, db: Session, retention_days: int = ARCHIVE_RETENTION_DAYS, max_batches: Optional[int] = None) -> dict:
+        cutoff = datetime.utcnow().date() - timedelta(days=retention_days)
+        totals = {"archived": 0, "deleted": 0, "unarchived": 0}
+        # Leftovers of an interrupted run first
+        deleted, unarchived = self.purge(db)
+        totals["deleted"] += deleted
+        totals["unarchived"] += unarchived
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            archived = self.archive_batch(db, cutoff)
+            if not archived:
+                break
+            deleted, unarchived = self.purge(db)
+            totals["archived"] += archived
+            totals["deleted"] += deleted
+            totals["unarchived"] += unarchived
+            batches += 1
+        return totals
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+cold_archive = ColdArchive()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.services.archive")
+    parser.add_argument("--days", type=int, default=ARCHIVE_RETENTION_DAYS, help="archive cases closed before this")
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from app.database.connection import SessionLocal
+
+    session = SessionLocal()
+    try:
+        totals = cold_archive.run(session, args.days, args.max_batches)
+    finally:
+        session.close()
+    print(f"archived {totals['archived']}, deleted {totals['deleted']} from the hot tables, "
+          f"{totals['unarchived']} changed and left for the next run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# app/services/assignment.py
+"""
+Case assignment and per-officer workload counters.
+
+``FirRegistration.assigned_member_id`` is the officer handling a case.
+``officer_workloads`` keeps, per officer, how many open cases they hold.
+Every change to that number happens in the caller's transaction, next to
+the change that causes it:
+
+    assign / reassign   +1 on the new officer, -1 on the previous one
+    close_fir           -1 on the assignee
+
+so the counters commit or roll back together with the FIR. The FIR's
+version is bumped too, which makes two concurrent reassignments of one
+case a compare-and-swap: the loser gets StaleDataError and its counter
+updates are rolled back with it.
+
+Counters are ``col = col + 1`` updates, never read-modify-write, so
+assignments to one officer from different cases do not lose updates.
+``rebuild`` recounts from the FIRs if they ever drift.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.firregistation import FirRegistration, closedFir
+from app.models.policemember import PoliceMember
+from app.models.workload import OfficerWorkload
+from app.services import versions
+
+
+class AssignmentError(Exception):
+    pass
+
+
+class CaseClosed(AssignmentError):
+    pass
+
+
+def _adjust(db: Session, member_id: int, station_id: int, delta: int):
+    now = datetime.utcnow()
+    values = {OfficerWorkload.open_cases: OfficerWorkload.open_cases + delta, OfficerWorkload.updated_at: now}
+    if delta > 0:
+        values[OfficerWorkload.assigned_total] = OfficerWorkload.assigned_total + delta
+    q = db.query(OfficerWorkload).filter(OfficerWorkload.member_id == member_id)
+    if delta < 0:
+        # A case assigned before the counters existed was never counted
+        q = q.filter(OfficerWorkload.open_cases >= -delta)
+    if q.update(values, synchronize_session=False) or delta < 0:
+        return
+    try:
+        with db.begin_nested():
+            db.add(OfficerWorkload(
+                member_id=member_id, station_id=station_id, open_cases=delta, assigned_total=delta, updated_at=now,
+            ))
+    except IntegrityError:
+        # Another writer created the row first
+        q.update(values, synchronize_session=False)
+
+
+def least_loaded(db: Session, station_id: int, exclude: Optional[int] = None) -> Optional[int]:
+    """
+    Member of ``station_id`` with the fewest open cases (lowest id on a
+    tie). Two simultaneous auto-assignments can pick the same officer; the
+    counters stay exact, the balance is off by one case.
+    """
+    open_cases = func.coalesce(OfficerWorkload.open_cases, 0)
+    q = (
+        db.query(PoliceMember.member_id)
+        .outerjoin(OfficerWorkload, OfficerWorkload.member_id == PoliceMember.member_id)
+        .filter(PoliceMember.station_id == station_id)
+    )
+    if exclude is not None:
+        q = q.filter(PoliceMember.member_id != exclude)
+    row = q.order_by(open_cases, PoliceMember.member_id).first()
+    return row[0] if row else None
+
+
+def assign(db: Session, fir: FirRegistration, member_id: Optional[int] = None) -> Optional[int]:
+    """
+    Assign ``fir`` to ``member_id``, or to the least-loaded officer of its
+    station when None. Returns the previous assignee; the caller commits.
+    Raises CaseClosed for a closed case and AssignmentError if the officer
+    is not at the FIR's station.
+    """
+    if db.query(closedFir.id).filter(closedFir.fir_id == fir.id).first():
+        raise CaseClosed("FIR is closed")
+    previous = fir.assigned_member_id
+    if member_id is None:
+        member_id = least_loaded(db, fir.Stationid, exclude=previous)
+        if member_id is None:
+            raise AssignmentError("No other officer at this station to assign to")
+    else:
+        station = db.query(PoliceMember.station_id).filter(PoliceMember.member_id == member_id).scalar()
+        if station is None:
+            raise AssignmentError("Officer not found")
+        if station != fir.Stationid:
+            raise AssignmentError("Officer is not posted at the FIR's station")
+    if member_id == previous:
+        return previous
+    if previous is not None:
+        _adjust(db, previous, fir.Stationid, -1)
+    _adjust(db, member_id, fir.Stationid, +1)
+    fir.assigned_member_id = member_id
+    fir.assigned_at = datetime.utcnow()
+    versions.touch_fir(fir)
+    return previous
+
+
+def on_close(db: Session, fir: FirRegistration):
+    """The case leaves its assignee's open count; call in the closing transaction."""
+    if fir.assigned_member_id is not None:
+        _adjust(db, fir.assigned_member_id, fir.Stationid, -1)
+
+
+def workloads(db: Session, station_id: int) -> List[dict]:
+    """Every member of the station with their counters: one indexed join, no FIR scan."""
+    rows = (
+        db.query(
+            PoliceMember.member_id,
+            PoliceMember.name,
+            OfficerWorkload.open_cases,
+            OfficerWorkload.assigned_total,
+        )
+        .outerjoin(OfficerWorkload, OfficerWorkload.member_id == PoliceMember.member_id)
+        .filter(PoliceMember.station_id == station_id)
+        .order_by(PoliceMember.member_id)
+        .all()
+    )
+    return [
+        {
+            "member_id": r.member_id,
+            "name": r.name,
+            "open_cases": r.open_cases or 0,
+            "assigned_total": r.assigned_total or 0,
+        }
+        for r in rows
+    ]
+
+
+def rebuild(db: Session, station_id: Optional[int] = None) -> int:
+    """
+    Recount open cases from the FIRs. assigned_total cannot be recovered
+    from the tables, so it is only raised to at least open_cases.
+    Commits; returns the number of officers updated.
+    """
+    open_q = (
+        db.query(
+            FirRegistration.assigned_member_id, func.min(FirRegistration.Stationid), func.count(FirRegistration.id)
+        )
+        .outerjoin(closedFir, closedFir.fir_id == FirRegistration.id)
+        .filter(FirRegistration.assigned_member_id.isnot(None), closedFir.id.is_(None))
+    )
+    counter_q = db.query(OfficerWorkload)
+    if station_id is not None:
+        open_q = open_q.filter(FirRegistration.Stationid == station_id)
+        counter_q = counter_q.filter(OfficerWorkload.station_id == station_id)
+    counts: Dict[int, tuple] = {
+        member: (station, n)
+        for member, station, n in open_q.group_by(FirRegistration.assigned_member_id)
+    }
+    now = datetime.utcnow()
+    updated = 0
+    for row in counter_q.all():
+        _, n = counts.pop(row.member_id, (row.station_id, 0))
+        row.open_cases = n
+        row.assigned_total = max(row.assigned_total, n)
+        row.updated_at = now
+        updated += 1
+    for member, (station, n) in counts.items():
+        db.add(OfficerWorkload(member_id=member, station_id=station, open_cases=n, assigned_total=n, updated_at=now))
+        updated += 1
+    db.commit()
+    return updated
+
+
+if __name__ == "__main__":
+    # python -m app.services.assignment  -> recount every officer's open cases
+    from app.database.connection import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"recounted {rebuild(session)} officers")
+    finally:
+        session.close()
@@ -0,0 +1,175 @@
+# app/services/audit.py
+"""
+Write-behind, hash-chained audit log.
+
+Handlers call ``audit_log.record(...)`` after their commit; that only appends
+to an in-memory buffer. A background thread flushes the buffer as one
+batched INSERT whenever it reaches AUDIT_FLUSH_SIZE entries or every
+AUDIT_FLUSH_SECONDS, and ``stop()`` (run from the app lifespan and at exit)
+drains whatever is left so nothing is lost on a graceful shutdown.
+
+Entries are chained: entry_hash = sha256(prev_hash + canonical entry). The
+previous hash is read inside the flush transaction (locked on MySQL) so
+several worker processes still append to a single chain.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import AUDIT_FLUSH_SIZE, AUDIT_FLUSH_SECONDS
+from app.models.audit import AuditLog
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "0" * 64
+
+
+def entry_hash(prev_hash: str, entry: dict) -> str:
+    body = json.dumps(
+        [
+            entry["created_at"].isoformat(),
+            entry["actor_type"],
+            entry["actor_id"],
+            entry["action"],
+            entry["fir_id"],
+            entry["details"],
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256((prev_hash + body).encode("utf-8")).hexdigest()
+
+
+def _last_hash(db: Session) -> str:
+    q = db.query(AuditLog.entry_hash).order_by(AuditLog.id.desc()).limit(1)
+    if db.get_bind().dialect.name != "sqlite":
+        q = q.with_for_update()
+    row = q.first()
+    return row[0] if row else GENESIS_HASH
+
+
+def verify_chain(db: Session) -> Optional[int]:
+    """Id of the first entry whose hash does not check out, or None if intact."""
+    prev = GENESIS_HASH
+    for row in db.query(AuditLog).order_by(AuditLog.id).yield_per(1000):
+        entry = {
+            "created_at": row.created_at,
+            "actor_type": row.actor_type,
+            "actor_id": row.actor_id,
+            "action": row.action,
+            "fir_id": row.fir_id,
+            "details": row.details,
+        }
+        if row.prev_hash != prev or row.entry_hash != entry_hash(prev, entry):
+            return row.id
+        prev = row.entry_hash
+    return None
+
+
+class AuditLogWriter:
+    def __init__(self, flush_size: int = AUDIT_FLUSH_SIZE, flush_seconds: float = AUDIT_FLUSH_SECONDS):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session_factory = None
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.database.connection import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def record(self, action: str, actor_type: str, actor_id, fir_id: Optional[str] = None, **details):
+        entry = {
+            "created_at": datetime.utcnow().replace(microsecond=0),
+            "actor_type": actor_type,
+            "actor_id": str(actor_id),
+            "action": action,
+            "fir_id": fir_id,
+            "details": json.dumps(details, sort_keys=True, default=str) if details else None,
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self) -> int:
+        """Write everything buffered so far in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            db = self._factory()()
+            try:
+                prev = _last_hash(db)
+                for entry in batch:
+                    entry["prev_hash"] = prev
+                    entry["entry_hash"] = prev = entry_hash(prev, entry)
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+                return len(batch)
+            except Exception:
+                db.rollback()
+                # Keep order: failed batch goes back in front of newer entries
+                with self._lock:
+                    self._buffer[:0] = [
+                        {k: v for k, v in e.items() if k not in ("prev_hash", "entry_hash")} for e in batch
+                    ]
+                raise
+            finally:
+                db.close()
+
+    def start(self, session_factory=None):
+        if session_factory is not None:
+            self._session_factory = session_factory
+        if self._thread and self._thread.is_alive():
+            return
+        atexit.register(self._flush_on_exit)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.pending():
+            self.flush()
+
+    def _flush_on_exit(self):
+        if self.pending():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("audit entries lost at exit")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("audit flush failed; will retry")
+
+
+audit_log = AuditLogWriter()
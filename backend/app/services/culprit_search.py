@@ -0,0 +1,200 @@
+# app/services/culprit_search.py
+"""
+Fuzzy, transliteration-tolerant culprit lookup across stations.
+
+Names are normalised before indexing: common abbreviations are expanded
+("mohd" -> "mohammed"), repeated letters and long vowels are collapsed
+("sharmaa" -> "sharma", "ee" -> "i") and aspirated/variant consonants are
+folded ("bh" -> "b", "w" -> "v", "z" -> "j"). Each culprit then gets
+
+    n:<key>   phonetic key per name word (consonant skeleton)
+    g:<abc>   character trigrams of the normalised full name
+    m:<key>   phonetic key per identity-marks word
+    a:<key>   phonetic key per address word
+
+in ``culprit_search_terms``. Terms are written by a mapper hook in the same
+flush as the culprit, so the index never lags the table. A search turns the
+query into the same terms, counts matches per culprit with one indexed
+GROUP BY (filtered by station/custody status inside the index), and only
+rescores the top candidates in Python.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.firregistation import Culprit
+from app.models.culprit_index import CulpritSearchTerm
+
+ABBREVIATIONS = {
+    "mohd": "mohammed",
+    "md": "mohammed",
+    "mohd.": "mohammed",
+    "muhammad": "mohammed",
+    "mohammad": "mohammed",
+    "s/o": "",
+    "d/o": "",
+    "w/o": "",
+}
+
+_FOLDS = [
+    ("ph", "f"), ("bh", "b"), ("dh", "d"), ("gh", "g"), ("jh", "j"), ("kh", "k"),
+    ("th", "t"), ("sh", "s"), ("ch", "c"), ("ck", "k"), ("q", "k"), ("w", "v"),
+    ("z", "j"), ("ee", "i"), ("oo", "u"), ("ou", "u"), ("y", "i"),
+]
+_NON_ALPHA = re.compile(r"[^a-z/ ]+")
+_REPEATS = re.compile(r"(.)\1+")
+_VOWELS = re.compile(r"[aeiou]")
+
+CANDIDATE_POOL = 200
+
+
+def normalize_word(word: str) -> str:
+    word = ABBREVIATIONS.get(word, word)
+    for a, b in _FOLDS:
+        word = word.replace(a, b)
+    word = _REPEATS.sub(r"\1", word)
+    # Trailing long vowels are the most common spelling drift ("Sharmaa")
+    return word.rstrip("aeiou") or word
+
+
+def words(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    raw = _NON_ALPHA.sub(" ", text.lower()).split()
+    out = []
+    for w in raw:
+        w = ABBREVIATIONS.get(w, w)
+        out.extend(normalize_word(part) for part in w.split() if part)
+    return [w for w in out if w]
+
+
+def phonetic_key(word: str) -> str:
+    """First letter + consonant skeleton of a normalised word."""
+    if not word:
+        return ""
+    return (word[0] + _VOWELS.sub("", word[1:]))[:12]
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def terms_for(name: Optional[str], identity_marks: Optional[str] = None, address: Optional[str] = None) -> Set[str]:
+    terms = set()
+    name_words = words(name)
+    terms.update("n:" + phonetic_key(w) for w in name_words)
+    terms.update("g:" + g for g in trigrams(" ".join(name_words)) if name_words)
+    terms.update("m:" + phonetic_key(w) for w in words(identity_marks) if len(w) > 2)
+    terms.update("a:" + phonetic_key(w) for w in words(address) if len(w) > 2)
+    return {t for t in terms if len(t) > 2}
+
+
+def _rows_for(culprit_id: int, station_id: int, custody_status: Optional[str], terms: Iterable[str]) -> List[dict]:
+    return [
+        {"term": t, "culprit_id": culprit_id, "station_id": station_id, "custody_status": custody_status}
+        for t in terms
+    ]
+
+
+@event.listens_for(Culprit, "after_insert")
+def _index_new_culprit(mapper, connection, target):
+    terms = terms_for(target.name, target.identity_marks, target.address)
+    if terms:
+        connection.execute(
+            insert(CulpritSearchTerm),
+            _rows_for(target.id, target.station_id, target.custody_status, terms),
+        )
+
+
+def rebuild_index(db: Session, batch_size: int = 1000) -> int:
+    """Backfill terms for culprits created before the index existed."""
+    db.query(CulpritSearchTerm).delete(synchronize_session=False)
+    count = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Culprit).filter(Culprit.id > last_id).order_by(Culprit.id).limit(batch_size).all()
+        )
+        if not batch:
+            break
+        rows = []
+        for c in batch:
+            rows += _rows_for(c.id, c.station_id, c.custody_status, terms_for(c.name, c.identity_marks, c.address))
+        if rows:
+            db.execute(insert(CulpritSearchTerm), rows)
+        db.commit()
+        count += len(batch)
+        last_id = batch[-1].id
+    return count
+
+
+def _similarity(query_words: List[str], query_grams: Set[str], c: Culprit) -> float:
+    cand_words = words(c.name)
+    grams = trigrams(" ".join(cand_words)) if cand_words else set()
+    gram_score = len(query_grams & grams) / len(query_grams | grams) if query_grams and grams else 0.0
+    q_keys = {phonetic_key(w) for w in query_words}
+    c_keys = {phonetic_key(w) for w in cand_words}
+    key_score = len(q_keys & c_keys) / len(q_keys) if q_keys else 0.0
+    return round(0.6 * key_score + 0.4 * gram_score, 4)
+
+
+def search(
+    db: Session,
+    name: Optional[str] = None,
+    identity_marks: Optional[str] = None,
+    address: Optional[str] = None,
+    station_id: Optional[int] = None,
+    custody_status: Optional[str] = None,
+    limit: int = 20,
+) -> List[dict]:
+    query_terms = terms_for(name, identity_marks, address)
+    if not query_terms:
+        return []
+
+    hits = func.count(CulpritSearchTerm.id).label("hits")
+    q = db.query(CulpritSearchTerm.culprit_id, hits).filter(CulpritSearchTerm.term.in_(query_terms))
+    if station_id is not None:
+        q = q.filter(CulpritSearchTerm.station_id == station_id)
+    if custody_status:
+        q = q.filter(CulpritSearchTerm.custody_status == custody_status)
+    candidates: Dict[int, int] = dict(
+        q.group_by(CulpritSearchTerm.culprit_id).order_by(hits.desc()).limit(CANDIDATE_POOL).all()
+    )
+    if not candidates:
+        return []
+
+    query_words = words(name)
+    query_grams = trigrams(" ".join(query_words)) if query_words else set()
+    results = []
+    for c in db.query(Culprit).filter(Culprit.id.in_(candidates.keys())).all():
+        score = _similarity(query_words, query_grams, c) if query_words else 0.0
+        # Marks/address matches break ties and carry marks-only queries
+        score += 0.1 * candidates[c.id] / len(query_terms)
+        results.append(
+            {
+                "culprit_id": c.id,
+                "fir_id": c.fir_id,
+                "station_id": c.station_id,
+                "name": c.name,
+                "identity_marks": c.identity_marks,
+                "address": c.address,
+                "custody_status": c.custody_status,
+                "score": round(score, 4),
+            }
+        )
+    results.sort(key=lambda r: (-r["score"], r["culprit_id"]))
+    return results[:limit]
+
+
+if __name__ == "__main__":
+    # python -m app.services.culprit_search  -> rebuild the term index
+    from app.database.connection import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"indexed {rebuild_index(session)} culprits")
+    finally:
+        session.close()
@@ -0,0 +1,231 @@
+# app/services/dedup.py
+"""
+Duplicate-FIR detection.
+
+Each FIR is reduced to blocking keys, stored in ``fir_blocking_keys``:
+
+    b<band>:<hash>   MinHash LSH bands of the case_narrative word shingles
+                     (64 permutations, 16 bands x 4 rows: narratives with
+                     Jaccard ~0.5 and up collide in at least one band)
+    n:<keys>         phonetic keys of the complainant's name
+    l:<hash>         the incident_location words
+    g:<cell>         ~1 km geohash cell, when the FIR is geocoded
+
+A new FIR's keys are looked up with one ``key IN (...)`` query restricted to
+the incident_date window, so the cost depends on bucket sizes rather than on
+the number of FIRs. Only the candidates found that way are scored, using the
+stored signatures, name keys and locations. Keys and signatures are written
+by a mapper hook in the same flush as the FIR.
+
+Changing NUM_PERM/BANDS invalidates stored signatures: run
+``python -m app.services.dedup`` to rebuild.
+"""
+import hashlib
+import random
+import re
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import DEDUP_DATE_WINDOW_DAYS, DEDUP_MIN_SCORE, DEDUP_MAX_RESULTS
+from app.models.fir_dedup import FirBlockingKey, FirSignature
+from app.models.firregistation import FirRegistration
+from app.services.culprit_search import phonetic_key, words
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+CANDIDATE_POOL = 50
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # fixed: signatures must match across processes
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"the", "a", "an", "and", "or", "of", "to", "in", "on", "at", "was", "is", "by", "with", "his", "her"}
+
+
+def _h64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def shingles(text: Optional[str]) -> Set[str]:
+    tokens = [w for w in _WORD.findall((text or "").lower()) if w not in _STOPWORDS]
+    if len(tokens) < 3:
+        return set(tokens)
+    return {" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+
+
+def signature(text: Optional[str]) -> Optional[List[int]]:
+    hashes = [_h64(s) for s in shingles(text)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) & 0xFFFFFFFF for a, b in _PERMS]
+
+
+def pack(sig: List[int]) -> str:
+    return "".join(f"{v:08x}" for v in sig)
+
+
+def unpack(packed: str) -> List[int]:
+    return [int(packed[i:i + 8], 16) for i in range(0, len(packed), 8)]
+
+
+def similarity(sig_a: Optional[List[int]], sig_b: Optional[List[int]]) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _name_keys(name: Optional[str]) -> Set[str]:
+    return {phonetic_key(w) for w in words(name)}
+
+
+def _location_words(location: Optional[str]) -> Set[str]:
+    return set(_WORD.findall((location or "").lower())) - _STOPWORDS
+
+
+def blocking_keys(fir: FirRegistration, sig: Optional[List[int]]) -> Set[str]:
+    keys = set()
+    if sig:
+        for band in range(BANDS):
+            rows = sig[band * ROWS:(band + 1) * ROWS]
+            digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+            keys.add(f"b{band:02d}:{digest}")
+    names = _name_keys(fir.fullname)
+    if names:
+        keys.add(("n:" + " ".join(sorted(names)))[:40])
+    location = _location_words(fir.incident_location)
+    if location:
+        keys.add("l:" + hashlib.blake2b(" ".join(sorted(location)).encode(), digest_size=8).hexdigest())
+    if getattr(fir, "geo_cell", None):
+        keys.add("g:" + fir.geo_cell[:6])
+    return keys
+
+
+def _signature_for(fir: FirRegistration) -> Optional[List[int]]:
+    # find_duplicates() already computed it for a FIR being registered
+    cached = getattr(fir, "_minhash", None)
+    return cached if cached is not None else signature(fir.case_narrative)
+
+
+def _index_rows(fir: FirRegistration, sig: Optional[List[int]]) -> List[dict]:
+    return [
+        {"key": k, "incident_date": fir.incident_date, "fir_id": fir.id}
+        for k in blocking_keys(fir, sig)
+    ]
+
+
+@event.listens_for(FirRegistration, "after_insert")
+def _index_new_fir(mapper, connection, target):
+    sig = _signature_for(target)
+    if sig:
+        connection.execute(insert(FirSignature), [{"fir_id": target.id, "signature": pack(sig)}])
+    rows = _index_rows(target, sig)
+    if rows:
+        connection.execute(insert(FirBlockingKey), rows)
+
+
+def _score(fir: FirRegistration, sig, other: FirRegistration, other_sig) -> Dict[str, float]:
+    narrative = similarity(sig, other_sig)
+    a, b = _name_keys(fir.fullname), _name_keys(other.fullname)
+    name = len(a & b) / len(a | b) if a and b else 0.0
+    if getattr(fir, "geo_cell", None) and other.geo_cell and fir.geo_cell[:6] == other.geo_cell[:6]:
+        location = 1.0
+    else:
+        a, b = _location_words(fir.incident_location), _location_words(other.incident_location)
+        location = len(a & b) / len(a | b) if a and b else 0.0
+    return {
+        "narrative_similarity": round(narrative, 3),
+        "score": round(0.5 * narrative + 0.3 * name + 0.2 * location, 3),
+    }
+
+
+def find_duplicates(db: Session, fir: FirRegistration, limit: int = DEDUP_MAX_RESULTS) -> List[dict]:
+    """Likely duplicates of ``fir`` (which need not be saved yet), best first."""
+    sig = signature(fir.case_narrative)
+    fir._minhash = sig
+    keys = blocking_keys(fir, sig)
+    if not keys or fir.incident_date is None:
+        return []
+
+    window = timedelta(days=DEDUP_DATE_WINDOW_DAYS)
+    hits = func.count(FirBlockingKey.id).label("hits")
+    q = db.query(FirBlockingKey.fir_id, hits).filter(
+        FirBlockingKey.key.in_(keys),
+        FirBlockingKey.incident_date >= fir.incident_date - window,
+        FirBlockingKey.incident_date <= fir.incident_date + window,
+    )
+    if fir.id:
+        q = q.filter(FirBlockingKey.fir_id != fir.id)
+    candidates = dict(q.group_by(FirBlockingKey.fir_id).order_by(hits.desc()).limit(CANDIDATE_POOL).all())
+    if not candidates:
+        return []
+
+    signatures = {
+        row.fir_id: unpack(row.signature)
+        for row in db.query(FirSignature).filter(FirSignature.fir_id.in_(candidates.keys())).all()
+    }
+    results = []
+    for other in db.query(FirRegistration).filter(FirRegistration.id.in_(candidates.keys())).all():
+        scored = _score(fir, sig, other, signatures.get(other.id))
+        if scored["score"] < DEDUP_MIN_SCORE:
+            continue
+        results.append(
+            {
+                "fir_id": other.id,
+                "fullname": other.fullname,
+                "incident_date": other.incident_date,
+                "incident_location": other.incident_location,
+                "station_id": other.Stationid,
+                **scored,
+            }
+        )
+    results.sort(key=lambda r: (-r["score"], r["fir_id"]))
+    return results[:limit]
+
+
+def rebuild_index(db: Session, batch_size: int = 500) -> int:
+    """Recompute signatures and keys for every FIR."""
+    db.query(FirBlockingKey).delete(synchronize_session=False)
+    db.query(FirSignature).delete(synchronize_session=False)
+    count = 0
+    last_id = ""
+    while True:
+        batch = (
+            db.query(FirRegistration)
+            .filter(FirRegistration.id > last_id)
+            .order_by(FirRegistration.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        sigs, keys = [], []
+        for f in batch:
+            sig = signature(f.case_narrative)
+            if sig:
+                sigs.append({"fir_id": f.id, "signature": pack(sig)})
+            keys += _index_rows(f, sig)
+        if sigs:
+            db.execute(insert(FirSignature), sigs)
+        if keys:
+            db.execute(insert(FirBlockingKey), keys)
+        db.commit()
+        count += len(batch)
+        last_id = batch[-1].id
+    return count
+
+
+if __name__ == "__main__":
+    # python -m app.services.dedup  -> rebuild signatures and blocking keys
+    from app.database.connection import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"indexed {rebuild_index(session)} FIRs")
+    finally:
+        session.close()
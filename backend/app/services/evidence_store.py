@@ -0,0 +1,153 @@
+# app/services/evidence_store.py
+"""
+Content-addressed evidence storage.
+
+Blobs are stored once per SHA-256 digest under a two-level sharded tree
+(``ab/cd/abcd...``) so no directory grows unbounded, and identical uploads
+share a single file. Thumbnails are produced off the request path by the
+outbox workers ("evidence.uploaded"); Pillow is optional and thumbnails are
+simply skipped when it is not installed.
+"""
+import hashlib
+import os
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+from app.core.config import (
+    EVIDENCE_STORE_DIR,
+    EVIDENCE_MAX_BYTES,
+    EVIDENCE_CHUNK_BYTES,
+    EVIDENCE_THUMBNAIL_PX,
+)
+from app.models.evidence import Evidence
+from app.services.outbox import register_handler
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails are a nice-to-have
+    Image = None
+
+class EvidenceTooLarge(Exception):
+    pass
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class EvidenceStore:
+    def __init__(self, root: str, max_bytes: int = EVIDENCE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _shard(self, digest: str, base: str) -> str:
+        return os.path.join(base, digest[:2], digest[2:4])
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self._shard(digest, os.path.join(self.root, "blobs")), digest)
+
+    def thumbnail_path(self, digest: str) -> str:
+        return os.path.join(self._shard(digest, os.path.join(self.root, "thumbs")), digest + ".jpg")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self.path_for(digest))
+
+    def put_stream(self, upload) -> Tuple[str, int, bool]:
+        """
+        Stream a binary file object (an UploadFile's ``.file``) into the store
+        chunk by chunk, hashing as it goes. Blocking: call it from a
+        threadpool route. Returns (digest, size, already_stored).
+        """
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        h = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = upload.read(EVIDENCE_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise EvidenceTooLarge(f"Evidence exceeds {self.max_bytes} bytes")
+                    h.update(chunk)
+                    out.write(chunk)
+            digest = h.hexdigest()
+            final = self.path_for(digest)
+            if os.path.exists(final):
+                os.unlink(tmp_path)
+                return digest, size, True
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(tmp_path, final)
+            return digest, size, False
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def iter_range(self, digest: str, start: int, end: int) -> Iterator[bytes]:
+        """Yield bytes [start, end] (inclusive) of a stored blob."""
+        remaining = end - start + 1
+        with open(self.path_for(digest), "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(EVIDENCE_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def make_thumbnail(self, digest: str) -> bool:
+        if Image is None:
+            return False
+        target = self.thumbnail_path(digest)
+        if os.path.exists(target):
+            return True
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with Image.open(self.path_for(digest)) as img:
+            img.thumbnail((EVIDENCE_THUMBNAIL_PX, EVIDENCE_THUMBNAIL_PX))
+            img.convert("RGB").save(target + ".part", "JPEG", quality=80)
+        os.replace(target + ".part", target)
+        return True
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end).
+    Returns None when the whole body should be served (no header, or a
+    multi-range request, which we are allowed to ignore).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    spec = header[len("bytes="):].strip()
+    first, _, last = spec.partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+evidence_store = EvidenceStore(EVIDENCE_STORE_DIR)
+
+
+@register_handler("evidence.uploaded")
+def make_evidence_thumbnail(payload: dict, db):
+    digest = payload["sha256"]
+    if evidence_store.make_thumbnail(digest):
+        db.query(Evidence).filter(Evidence.sha256 == digest).update(
+            {Evidence.thumbnail_ready: True}, synchronize_session=False
+        )
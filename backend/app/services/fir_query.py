@@ -0,0 +1,144 @@
+# app/services/fir_query.py
+"""
+One FIR query for any combination of filters, with keyset paging.
+
+Results are ordered by (incident_date, id), newest first by default, and
+every index in the designed set ends in those two columns. Whichever index
+the planner picks, the database walks it in order from the cursor and
+stops after ``limit`` matches: no sort step, no OFFSET.
+
+    equality filters given              index
+    station_id + offence_type           ix_fir_station_offence_date
+    assigned_member_id                  ix_fir_assignee
+    member_id                           ix_fir_member_date
+    station_id                          ix_fir_station_date
+    offence_type                        ix_fir_offence_date
+    none of the above                   ix_fir_date
+
+The date range is the next column of every one of them. Filters outside
+the chosen index's prefix (status, region, any other ids) are checked on
+the rows the index yields. Region is a substring match on the address,
+as in /government/governmentsearchfir, and can never use an index.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import exists, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.firregistation import FirRegistration, closedFir
+from app.services.read_model import FirSummary, closed_ids
+
+# (index, equality filters it serves), most selective first
+INDEX_PLANS = (
+    ("ix_fir_station_offence_date", ("station_id", "offence_type")),
+    ("ix_fir_assignee", ("assigned_member_id",)),
+    ("ix_fir_member_date", ("member_id",)),
+    ("ix_fir_station_date", ("station_id",)),
+    ("ix_fir_offence_date", ("offence_type",)),
+    ("ix_fir_date", ()),
+)
+_EQUALITY = {
+    "station_id": FirRegistration.Stationid,
+    "offence_type": FirRegistration.offence_type,
+    "member_id": FirRegistration.member_id,
+    "assigned_member_id": FirRegistration.assigned_member_id,
+}
+
+
+@dataclass
+class FirFilters:
+    station_id: Optional[int] = None
+    offence_type: Optional[str] = None
+    member_id: Optional[int] = None
+    assigned_member_id: Optional[int] = None
+    status: Optional[str] = None  # active|closed
+    region: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def given(self) -> List[str]:
+        return [name for name in _EQUALITY if getattr(self, name) is not None]
+
+
+@dataclass
+class QueryPlan:
+    index: str
+    prefix: Tuple[str, ...]
+    residual: List[str] = field(default_factory=list)
+
+
+def plan(filters: FirFilters) -> QueryPlan:
+    given = filters.given()
+    for index, prefix in INDEX_PLANS:
+        if all(name in given for name in prefix):
+            residual = [name for name in given if name not in prefix]
+            residual += [name for name in ("status", "region") if getattr(filters, name)]
+            return QueryPlan(index, prefix, residual)
+    raise AssertionError("ix_fir_date serves every filter combination")
+
+
+def encode_cursor(incident_date: date, fir_id: str) -> str:
+    raw = json.dumps([incident_date.isoformat(), fir_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """Raises ValueError for anything encode_cursor did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        day, fir_id = json.loads(raw)
+        return date.fromisoformat(day), str(fir_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def run(
+    db: Session,
+    filters: FirFilters,
+    newest_first: bool = True,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], QueryPlan]:
+    """One page of summaries, the cursor of the next page (None at the end) and the plan used."""
+    chosen = plan(filters)
+    q = db.query(FirRegistration).with_hint(FirRegistration, f"USE INDEX ({chosen.index})", "mysql")
+    for name in filters.given():
+        q = q.filter(_EQUALITY[name] == getattr(filters, name))
+    if filters.date_from:
+        q = q.filter(FirRegistration.incident_date >= filters.date_from)
+    if filters.date_to:
+        q = q.filter(FirRegistration.incident_date <= filters.date_to)
+    if filters.region:
+        q = q.filter(FirRegistration.address.contains(filters.region))
+    if filters.status:
+        is_closed = exists().where(closedFir.fir_id == FirRegistration.id)
+        q = q.filter(is_closed if filters.status == "closed" else ~is_closed)
+
+    key = tuple_(FirRegistration.incident_date, FirRegistration.id)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        q = q.filter(key < after if newest_first else key > after)
+    if newest_first:
+        q = q.order_by(FirRegistration.incident_date.desc(), FirRegistration.id.desc())
+    else:
+        q = q.order_by(FirRegistration.incident_date, FirRegistration.id)
+
+    firs = q.limit(limit + 1).all()
+    more = len(firs) > limit
+    firs = firs[:limit]
+    if filters.status:
+        closed = {f.id for f in firs} if filters.status == "closed" else set()
+    else:
+        closed = closed_ids(db, [f.id for f in firs])
+    rows = []
+    for f in firs:
+        row = FirSummary.of(f, f.id in closed).row()
+        row["member_id"] = f.member_id
+        row["assigned_member_id"] = f.assigned_member_id
+        rows.append(row)
+    next_cursor = encode_cursor(firs[-1].incident_date, firs[-1].id) if more else None
+    return rows, next_cursor, chosen
@@ -0,0 +1,236 @@
+# app/services/geo.py
+"""
+Offline geocoding and a geohash grid index for incident locations.
+
+Geocoding: ``incident_location`` is free text ("near Downtown Market, gate
+2"), so the gazetteer is matched by the longest run of words that names a
+known place. The gazetteer is a local CSV (``GAZETTEER_PATH``):
+
+    name,latitude,longitude[,alias|alias...]
+
+Spatial index: every geocoded FIR stores the geohash of its coordinates in
+``geo_cell``. A geohash prefix is a rectangular grid cell and all points in
+it share the prefix, so "everything in this cell" is one index range scan
+(``prefix <= geo_cell < prefix + '{'``). A radius or bounding-box query is
+covered by a handful of cells at the finest precision that keeps the cell
+count under ``MAX_COVER_CELLS``; the exact distance/box test then only runs
+on the rows those ranges return.
+"""
+import csv
+import logging
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import GAZETTEER_PATH, GEO_CELL_PRECISION
+from app.models.firregistation import FirRegistration
+
+logger = logging.getLogger(__name__)
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Sorts after every geohash character: upper bound of a prefix range
+_PREFIX_END = "{"
+EARTH_RADIUS_KM = 6371.0088
+MAX_COVER_CELLS = 48
+
+
+# ---------- Geohash ----------
+
+def encode(lat: float, lon: float, precision: int = GEO_CELL_PRECISION) -> str:
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    out, bits, ch, even = [], 0, 0, True
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            ch = (ch << 1) | (lon >= mid)
+            lon_lo, lon_hi = (mid, lon_hi) if lon >= mid else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            ch = (ch << 1) | (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(_BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(out)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    total = 5 * precision
+    lon_bits = (total + 1) // 2
+    lat_bits = total // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(min_lat: float, min_lon: float, max_lat: float, max_lon: float, precision: int) -> List[str]:
+    height, width = cell_size(precision)
+    cells = []
+    lat = math.floor((max(min_lat, -90.0) + 90.0) / height) * height - 90.0
+    while lat <= min(max_lat, 90.0):
+        lon = math.floor((max(min_lon, -180.0) + 180.0) / width) * width - 180.0
+        while lon <= min(max_lon, 180.0):
+            cells.append(encode(min(lat + height / 2, 90.0), min(lon + width / 2, 180.0), precision))
+            lon += width
+        lat += height
+    return sorted(set(cells))
+
+
+def cover(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[str]:
+    """Cells covering the box at the finest precision within MAX_COVER_CELLS."""
+    for precision in range(GEO_CELL_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        estimate = (math.ceil((max_lat - min_lat) / height) + 1) * (math.ceil((max_lon - min_lon) / width) + 1)
+        if estimate <= MAX_COVER_CELLS:
+            return covering_cells(min_lat, min_lon, max_lat, max_lon, precision)
+    return [""]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def radius_bbox(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def cells_filter(cells: List[str]):
+    """One index range per cell prefix."""
+    return or_(
+        *[and_(FirRegistration.geo_cell >= c, FirRegistration.geo_cell < c + _PREFIX_END) for c in cells]
+    )
+
+
+# ---------- Gazetteer ----------
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> Tuple[str, ...]:
+    return tuple(_WORD.findall(text.lower()))
+
+
+class Gazetteer:
+    def __init__(self):
+        self._places: Dict[Tuple[str, ...], Tuple[float, float]] = {}
+        self._longest = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, lat: float, lon: float):
+        key = _tokens(name)
+        if key:
+            self._places[key] = (lat, lon)
+            self._longest = max(self._longest, len(key))
+
+    def load(self, path: str) -> int:
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.reader(fh):
+                if len(row) < 3 or row[0].startswith("#") or row[0].strip().lower() == "name":
+                    continue
+                lat, lon = float(row[1]), float(row[2])
+                self.add(row[0], lat, lon)
+                for alias in (row[3].split("|") if len(row) > 3 else ()):
+                    self.add(alias, lat, lon)
+        self._loaded = True
+        return len(self._places)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(GAZETTEER_PATH):
+                logger.info("gazetteer: %s places from %s", self.load(GAZETTEER_PATH), GAZETTEER_PATH)
+            self._loaded = True
+
+    def geocode(self, text: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Coordinates of the longest known place name inside ``text``."""
+        self._ensure_loaded()
+        words = _tokens(text or "")
+        for n in range(min(self._longest, len(words)), 0, -1):
+            for i in range(len(words) - n + 1):
+                hit = self._places.get(words[i:i + n])
+                if hit:
+                    return hit
+        return None
+
+
+gazetteer = Gazetteer()
+
+
+def locate(fir: FirRegistration, latitude: Optional[float] = None, longitude: Optional[float] = None) -> bool:
+    """Set coordinates and geo_cell on ``fir``; explicit coordinates win over the gazetteer."""
+    point = (latitude, longitude) if latitude is not None and longitude is not None else None
+    point = point or gazetteer.geocode(fir.incident_location)
+    if not point:
+        return False
+    fir.latitude, fir.longitude = point
+    fir.geo_cell = encode(*point)
+    return True
+
+
+# ---------- Queries ----------
+
+def within(db: Session, min_lat, min_lon, max_lat, max_lon, date_from=None, date_to=None) -> List[FirRegistration]:
+    q = db.query(FirRegistration).filter(cells_filter(cover(min_lat, min_lon, max_lat, max_lon)))
+    if date_from:
+        q = q.filter(FirRegistration.incident_date >= date_from)
+    if date_to:
+        q = q.filter(FirRegistration.incident_date <= date_to)
+    return [
+        f for f in q.all()
+        if min_lat <= f.latitude <= max_lat and min_lon <= f.longitude <= max_lon
+    ]
+
+
+def nearby(db: Session, lat, lon, radius_km, date_from=None, date_to=None) -> List[Tuple[FirRegistration, float]]:
+    found = []
+    for f in within(db, *radius_bbox(lat, lon, radius_km), date_from=date_from, date_to=date_to):
+        d = haversine_km(lat, lon, f.latitude, f.longitude)
+        if d <= radius_km:
+            found.append((f, d))
+    found.sort(key=lambda pair: pair[1])
+    return found
+
+
+def backfill(db: Session, batch_size: int = 500) -> int:
+    """Geocode FIRs registered before coordinates existed."""
+    located = 0
+    last_id = ""
+    while True:
+        batch = (
+            db.query(FirRegistration)
+            .filter(FirRegistration.geo_cell.is_(None), FirRegistration.id > last_id)
+            .order_by(FirRegistration.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return located
+        located += sum(locate(f, f.latitude, f.longitude) for f in batch)
+        db.commit()
+        last_id = batch[-1].id
+
+
+if __name__ == "__main__":
+    # python -m app.services.geo  -> geocode FIRs that have no coordinates yet
+    from app.database.connection import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"geocoded {backfill(session)} FIRs")
+    finally:
+        session.close()
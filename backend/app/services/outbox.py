@@ -0,0 +1,239 @@
+# app/services/outbox.py
+"""
+Transactional outbox.
+
+Write paths call ``enqueue(db, topic, payload)`` before their own commit, so
+the event row is persisted atomically with the domain change. Worker threads
+(in-process, or standalone via ``python -m app.services.outbox_worker``)
+drain the table in batches and run the handlers registered for each topic.
+An event whose topic has no handler in this process fails like a handler
+error (and ends up dead) instead of being marked done unprocessed.
+
+Delivery is at-least-once: an event is only marked done after its handlers
+succeed, and a claim is a time-limited lease, so work lost to a crash is
+picked up again once the lease expires. Handlers must be idempotent.
+"""
+import json
+import logging
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    OUTBOX_WORKERS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_BASE_SECONDS,
+    OUTBOX_BACKOFF_MAX_SECONDS,
+)
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict, Session], None]
+_handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def register_handler(topic: str):
+    """Decorator: run ``fn(payload, db)`` for every event on ``topic``."""
+    def _wrap(fn: Handler) -> Handler:
+        _handlers[topic].append(fn)
+        return fn
+    return _wrap
+
+
+def enqueue(db: Session, topic: str, payload: dict) -> OutboxEvent:
+    """Add an event to the caller's transaction; it is sent only if that commits."""
+    evt = OutboxEvent(topic=topic, payload=json.dumps(payload, default=str))
+    db.add(evt)
+    if not db.info.get("outbox_wakeup"):
+        db.info["outbox_wakeup"] = True
+        event.listen(db, "after_commit", _wake_after_commit, once=True)
+    return evt
+
+
+def _wake_after_commit(session):
+    session.info.pop("outbox_wakeup", None)
+    outbox_pool.notify()
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), OUTBOX_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claim(db: Session, batch_size: int) -> List[OutboxEvent]:
+    now = datetime.utcnow()
+    q = (
+        db.query(OutboxEvent)
+        .filter(OutboxEvent.status == "pending", OutboxEvent.available_at <= now)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name != "sqlite":
+        q = q.with_for_update(skip_locked=True)
+    batch = q.all()
+    lease_until = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    for evt in batch:
+        evt.available_at = lease_until
+    db.commit()
+    return batch
+
+
+def drain_once(session_factory, batch_size: int = OUTBOX_BATCH_SIZE, metrics: Optional["OutboxMetrics"] = None) -> int:
+    """Claim and process one batch. Returns the number of events handled."""
+    db = session_factory()
+    # Keep claimed rows loaded across the per-event commits below
+    db.expire_on_commit = False
+    try:
+        batch = _claim(db, batch_size)
+        for evt in batch:
+            try:
+                payload = json.loads(evt.payload)
+                handlers = _handlers.get(evt.topic)
+                if not handlers:
+                    logger.warning("outbox event %s: no handler registered for %s", evt.id, evt.topic)
+                    raise LookupError(f"No handler registered for {evt.topic}")
+                for handler in handlers:
+                    handler(payload, db)
+                evt.status = "done"
+                evt.processed_at = datetime.utcnow()
+                evt.last_error = None
+                db.commit()
+                if metrics:
+                    metrics.record_success(evt)
+            except Exception as exc:
+                db.rollback()
+                evt.attempts += 1
+                evt.last_error = repr(exc)[:1000]
+                if evt.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    evt.status = "dead"
+                    logger.error("outbox event %s (%s) dead after %s attempts", evt.id, evt.topic, evt.attempts)
+                else:
+                    evt.available_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(evt.attempts))
+                db.commit()
+                if metrics:
+                    metrics.record_failure()
+        return len(batch)
+    finally:
+        db.close()
+
+
+class OutboxMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    def record_success(self, evt: OutboxEvent):
+        lag = (evt.processed_at - evt.created_at).total_seconds()
+        with self._lock:
+            self.processed += 1
+            self.last_lag_seconds = lag
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+
+
+class OutboxWorkerPool:
+    def __init__(self, workers: int = OUTBOX_WORKERS, poll_seconds: float = OUTBOX_POLL_SECONDS):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.metrics = OutboxMetrics()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._session_factory = None
+
+    def start(self, session_factory=None):
+        if self._threads:
+            return
+        if session_factory is None:
+            from app.database.connection import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"outbox-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                handled = drain_once(self._session_factory, metrics=self.metrics)
+            except Exception:
+                logger.exception("outbox drain failed")
+                handled = 0
+            if handled == 0:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def stats(self, db: Session) -> dict:
+        pending, oldest = (
+            db.query(func.count(OutboxEvent.id), func.min(OutboxEvent.created_at))
+            .filter(OutboxEvent.status == "pending")
+            .one()
+        )
+        dead = db.query(func.count(OutboxEvent.id)).filter(OutboxEvent.status == "dead").scalar()
+        return {
+            "workers": len(self._threads),
+            "pending": pending,
+            "dead": dead,
+            "oldest_pending_age_seconds": (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0,
+            "processed": self.metrics.processed,
+            "failed": self.metrics.failed,
+            "last_lag_seconds": self.metrics.last_lag_seconds,
+            "max_lag_seconds": self.metrics.max_lag_seconds,
+        }
+
+
+outbox_pool = OutboxWorkerPool()
+
+
+# ---------- Handlers ----------
+
+notification_log = logging.getLogger("app.notifications")
+
+
+@register_handler("fir.progress_added")
+def notify_citizen_of_progress(payload: dict, db: Session):
+    # No SMS/e-mail gateway is wired into this tree yet; the log line is the hook.
+    notification_log.info("progress %s added to FIR %s", payload.get("progress_id"), payload.get("fir_id"))
+
+
+@register_handler("fir.closed")
+def notify_citizen_of_closure(payload: dict, db: Session):
+    notification_log.info("FIR %s closed", payload.get("fir_id"))
+
+
+@register_handler("fir.registered")
+def notify_station_of_registration(payload: dict, db: Session):
+    notification_log.info("FIR %s registered at station %s", payload.get("fir_id"), payload.get("station_id"))
+
+
+@register_handler("fir.assigned")
+def notify_officer_of_assignment(payload: dict, db: Session):
+    notification_log.info("FIR %s assigned to officer %s", payload.get("fir_id"), payload.get("member_id"))
+
@@ -0,0 +1,48 @@
+# app/services/outbox_worker.py
+"""
+Standalone outbox worker pool:
+
+    python -m app.services.outbox_worker
+
+Kept out of app/services/outbox.py on purpose: running that file as
+``__main__`` would load a second copy of the module, and handlers
+registered by other modules would land in the copy the pool does not read.
+Every module that registers handlers is listed in HANDLER_MODULES.
+"""
+import importlib
+import logging
+import signal
+import threading
+import time
+
+from app.services.outbox import outbox_pool
+
+logger = logging.getLogger(__name__)
+
+HANDLER_MODULES = (
+    "app.services.outbox",
+    "app.services.evidence_store",
+)
+
+
+def load_handlers():
+    for name in HANDLER_MODULES:
+        importlib.import_module(name)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    load_handlers()
+
+    outbox_pool.start()
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    logger.info("outbox worker pool running with %s workers", outbox_pool.workers)
+    while not stop.is_set():
+        time.sleep(0.5)
+    outbox_pool.stop()
+
+
+if __name__ == "__main__":
+    main()
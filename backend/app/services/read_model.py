@@ -0,0 +1,430 @@
+# app/services/read_model.py
+"""
+In-process read model of FIR summaries.
+
+``/fir/list``, ``/fir/list_by_station``, ``/fir/list_by_aadhar`` and
+``/fir/search`` only show a handful of short columns per FIR, and those
+columns never change after registration except for the closed flag. Each
+worker therefore keeps every FIR's summary in memory:
+
+- one ``__slots__`` object per FIR in a slot list (freed slots are reused);
+- secondary indexes by station and Aadhaar (``array('l')`` of slot
+  numbers), by status (sets of slots) and by incident_date (a sorted
+  ``array('q')`` of ``ordinal << 32 | slot`` for date-range scans).
+
+The model is warmed by a background thread at startup; until it is ready
+(and whenever it is disabled) the routes query the database as before.
+
+Keeping it current:
+
+- register_incident/close_fir update the local model after their commit;
+- every FIR write already bumps the station's ``StationListVersion``, so
+  every READ_MODEL_SYNC_SECONDS the thread compares those counters with
+  the ones it has seen and reloads the stations that changed, which picks
+  up writes made by other workers. Reloads upsert, and only drop closed
+  FIRs that are gone from the table (moved to the cold archive), so a
+  local update that raced a reload is never lost.
+
+``station_version`` is the counter a station was last loaded at. Until a
+sync catches up with a newer one (another worker's write, or this
+worker's own), /fir/list_by_station reads that station from the database
+so its ETag never labels an older list.
+
+The size of the summaries and indexes is estimated as they are added; if
+it passes READ_MODEL_MAX_BYTES the model clears itself and stays off.
+"""
+import logging
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import READ_MODEL_MAX_BYTES, READ_MODEL_SYNC_SECONDS
+from app.models.firregistation import FirRegistration, closedFir
+from app.models.station_version import StationListVersion
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    FirRegistration.id,
+    FirRegistration.fullname,
+    FirRegistration.offence_type,
+    FirRegistration.incident_location,
+    FirRegistration.incident_date,
+    FirRegistration.Stationid,
+    FirRegistration.id_proof_value,
+)
+_SLOT_MASK = 0xFFFFFFFF
+# Per-FIR overhead beyond the object and its strings: the by_id dict entry
+# and one slot number in each index
+_INDEX_BYTES = 120
+IN_CHUNK = 1000
+
+
+class FirSummary:
+    __slots__ = (
+        "fir_id", "fullname", "offence_type", "incident_location", "incident_date", "station_id", "aadhar", "closed",
+    )
+
+    def __init__(self, fir_id, fullname, offence_type, incident_location, incident_date, station_id, aadhar, closed):
+        self.fir_id = fir_id
+        self.fullname = fullname
+        # A few dozen distinct values shared by every FIR
+        self.offence_type = sys.intern(offence_type) if offence_type else offence_type
+        self.incident_location = incident_location
+        self.incident_date = incident_date
+        self.station_id = station_id
+        self.aadhar = str(aadhar).strip() if aadhar else None
+        self.closed = closed
+
+    @classmethod
+    def of(cls, fir, closed: bool = False) -> "FirSummary":
+        """From a FirRegistration or a row of _COLUMNS."""
+        return cls(
+            fir.id, fir.fullname, fir.offence_type, fir.incident_location, fir.incident_date, fir.Stationid,
+            fir.id_proof_value, closed,
+        )
+
+    @property
+    def status(self) -> str:
+        return "closed" if self.closed else "active"
+
+    def row(self) -> dict:
+        return {
+            "fir_id": self.fir_id,
+            "fullname": self.fullname,
+            "offence_type": self.offence_type,
+            "incident_location": self.incident_location,
+            "status": self.status,
+            "incident_date": self.incident_date,
+            "station_id": self.station_id,
+        }
+
+    def matches(self, needle: str) -> bool:
+        """Case-insensitive substring match, as ILIKE '%needle%' on the three text columns."""
+        return any(needle in (v or "").lower() for v in (self.fullname, self.offence_type, self.incident_location))
+
+    def cost(self) -> int:
+        strings = (self.fir_id, self.fullname, self.incident_location, self.aadhar)
+        return sys.getsizeof(self) + sum(sys.getsizeof(s) for s in strings if s) + _INDEX_BYTES
+
+
+def closed_ids(db: Session, fir_ids: List[str]) -> Set[str]:
+    closed = set()
+    for i in range(0, len(fir_ids), IN_CHUNK):
+        chunk = fir_ids[i:i + IN_CHUNK]
+        closed.update(fid for (fid,) in db.query(closedFir.fir_id).filter(closedFir.fir_id.in_(chunk)).all())
+    return closed
+
+
+def _date_key(d: date, slot: int) -> int:
+    return (d.toordinal() << 32) | slot
+
+
+class FirReadModel:
+    def __init__(self, max_bytes: int = READ_MODEL_MAX_BYTES, sync_seconds: float = READ_MODEL_SYNC_SECONDS):
+        self.max_bytes = max_bytes
+        self.sync_seconds = sync_seconds
+        self.session_factory = None
+        self.over_budget = False
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.ready = False
+            self.bytes = 0
+            self._rows: List[Optional[FirSummary]] = []
+            self._free: List[int] = []
+            self._by_id: Dict[str, int] = {}
+            self._by_station: Dict[int, array] = {}
+            self._by_aadhar: Dict[str, array] = {}
+            self._by_status: Dict[str, Set[int]] = {"active": set(), "closed": set()}
+            self._by_date = array("q")
+            self._station_versions: Dict[int, int] = {}
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.database.connection import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    # ---------- mutation (lock held) ----------
+
+    def _insert(self, s: FirSummary, dated: bool = True):
+        slot = self._free.pop() if self._free else len(self._rows)
+        if slot == len(self._rows):
+            self._rows.append(s)
+        else:
+            self._rows[slot] = s
+        self._by_id[s.fir_id] = slot
+        self._by_station.setdefault(s.station_id, array("l")).append(slot)
+        if s.aadhar:
+            self._by_aadhar.setdefault(s.aadhar, array("l")).append(slot)
+        self._by_status[s.status].add(slot)
+        if dated and s.incident_date:
+            insort(self._by_date, _date_key(s.incident_date, slot))
+        self.bytes += s.cost()
+
+    def _drop(self, slot: int):
+        s = self._rows[slot]
+        self._rows[slot] = None
+        self._free.append(slot)
+        del self._by_id[s.fir_id]
+        self._by_station[s.station_id].remove(slot)
+        if s.aadhar:
+            self._by_aadhar[s.aadhar].remove(slot)
+        self._by_status[s.status].discard(slot)
+        if s.incident_date:
+            key = _date_key(s.incident_date, slot)
+            i = bisect_left(self._by_date, key)
+            if i < len(self._by_date) and self._by_date[i] == key:
+                del self._by_date[i]
+        self.bytes -= s.cost()
+
+    def _replace(self, slot: int, s: FirSummary) -> bool:
+        """Swap in a new version of a row whose index keys did not change; O(1)."""
+        old = self._rows[slot]
+        if (old.station_id, old.aadhar, old.incident_date) != (s.station_id, s.aadhar, s.incident_date):
+            return False
+        if (old.fullname, old.offence_type, old.incident_location, old.closed) == (
+            s.fullname, s.offence_type, s.incident_location, s.closed,
+        ):
+            return True
+        if old.closed != s.closed:
+            self._by_status[old.status].discard(slot)
+            self._by_status[s.status].add(slot)
+        self._rows[slot] = s
+        self.bytes += s.cost() - old.cost()
+        return True
+
+    def _put(self, s: FirSummary, dated: bool = True):
+        slot = self._by_id.get(s.fir_id)
+        if slot is not None:
+            # Closing is one-way: a reload that read the row before the close
+            # committed must not reopen it
+            s.closed = s.closed or self._rows[slot].closed
+            # Nearly every row of a station reload: no array.remove/insort
+            if not self._replace(slot, s):
+                self._drop(slot)
+                self._insert(s, dated)
+        else:
+            self._insert(s, dated)
+        if self.bytes > self.max_bytes:
+            logger.warning(
+                "read model: over budget (%s > %s bytes), serving FIR lists from the database",
+                self.bytes, self.max_bytes,
+            )
+            self.over_budget = True
+            self.reset()
+            self._stop.set()
+
+    # ---------- loading ----------
+
+    def warm(self, db: Session, batch_size: int = 2000) -> bool:
+        """Load every FIR; False if they do not fit in the budget."""
+        self.reset()
+        self.over_budget = False
+        # Versions first: anything committed while the rows load shows up
+        # as a changed station on the next sync
+        versions = dict(db.query(StationListVersion.station_id, StationListVersion.version).all())
+        closed = {fid for (fid,) in db.query(closedFir.fir_id).all()}
+        last_id = ""
+        while True:
+            batch = (
+                db.query(*_COLUMNS).filter(FirRegistration.id > last_id).order_by(FirRegistration.id)
+                .limit(batch_size).all()
+            )
+            if not batch:
+                break
+            with self._lock:
+                for r in batch:
+                    # Rows come in id order, so dates come in random order:
+                    # one insort each would shift half the array every time
+                    self._put(FirSummary.of(r, r.id in closed), dated=False)
+                    if self.over_budget:
+                        return False
+            last_id = batch[-1].id
+        with self._lock:
+            self._by_date = array("q", sorted(
+                _date_key(s.incident_date, slot) for slot, s in enumerate(self._rows) if s and s.incident_date
+            ))
+            self._station_versions = versions
+            self.ready = True
+        logger.info("read model: %s FIRs, ~%s bytes", len(self._by_id), self.bytes)
+        return True
+
+    def reload_station(self, db: Session, station_id: int, version: Optional[int] = None) -> int:
+        rows = db.query(*_COLUMNS).filter(FirRegistration.Stationid == station_id).all()
+        closed = closed_ids(db, [r.id for r in rows])
+        # Built before taking the lock that every list and search read needs
+        summaries = [FirSummary.of(r, r.id in closed) for r in rows]
+        present = {s.fir_id for s in summaries}
+        with self._lock:
+            if not self.ready:
+                return 0
+            for s in summaries:
+                self._put(s)
+                if self.over_budget:
+                    return 0
+            archived = [
+                slot for slot in self._by_station.get(station_id, ())
+                if self._rows[slot].closed and self._rows[slot].fir_id not in present
+            ]
+            for slot in archived:
+                self._drop(slot)
+            if version is not None:
+                self._station_versions[station_id] = version
+        return len(rows)
+
+    def station_version(self, station_id: int) -> Optional[int]:
+        """The StationListVersion this worker last loaded the station at; None while not ready."""
+        with self._lock:
+            if not self.ready:
+                return None
+            return self._station_versions.get(station_id, 0)
+
+    def sync(self, db: Session) -> int:
+        """Reload the stations whose list version moved; returns how many."""
+        if not self.ready:
+            return 0
+        current = db.query(StationListVersion.station_id, StationListVersion.version).all()
+        changed = [(s, v) for s, v in current if self._station_versions.get(s) != v]
+        for station_id, version in changed:
+            self.reload_station(db, station_id, version)
+        return len(changed)
+
+    # ---------- write-path hooks (call after commit) ----------
+
+    def add(self, fir: FirRegistration):
+        with self._lock:
+            if self.ready:
+                self._put(FirSummary.of(fir))
+
+    def mark_closed(self, fir_id: str):
+        with self._lock:
+            slot = self._by_id.get(fir_id) if self.ready else None
+            if slot is None or self._rows[slot].closed:
+                return
+            self._by_status["active"].discard(slot)
+            self._by_status["closed"].add(slot)
+            self._rows[slot].closed = True
+
+    def remove(self, fir_ids: List[str]):
+        """Archived FIRs leave the lists."""
+        with self._lock:
+            if not self.ready:
+                return
+            for fir_id in fir_ids:
+                slot = self._by_id.get(fir_id)
+                if slot is not None:
+                    self._drop(slot)
+
+    # ---------- reads: None means "not available, ask the database" ----------
+
+    def _rows_for(self, slots, date_from: Optional[date], date_to: Optional[date]) -> List[FirSummary]:
+        found = [self._rows[i] for i in slots]
+        if date_from or date_to:
+            lo, hi = date_from or date.min, date_to or date.max
+            found = [s for s in found if s.incident_date and lo <= s.incident_date <= hi]
+        # Same order as the (key, incident_date, id) indexes would give
+        found.sort(key=lambda s: (s.incident_date or date.min, s.fir_id))
+        return found
+
+    def _date_slots(self, date_from: Optional[date], date_to: Optional[date]):
+        lo = bisect_left(self._by_date, _date_key(date_from, 0)) if date_from else 0
+        hi = bisect_left(self._by_date, _date_key(date_to, 0) + (1 << 32)) if date_to else len(self._by_date)
+        return [k & _SLOT_MASK for k in self._by_date[lo:hi]]
+
+    def list_all(self, date_from: Optional[date] = None, date_to: Optional[date] = None) -> Optional[List[dict]]:
+        with self._lock:
+            if not self.ready:
+                return None
+            if date_from or date_to:
+                return [self._rows[i].row() for i in self._date_slots(date_from, date_to)]
+            return [s.row() for s in self._rows if s is not None]
+
+    def by_station(self, station_id: int, date_from=None, date_to=None) -> Optional[List[dict]]:
+        with self._lock:
+            if not self.ready:
+                return None
+            return [s.row() for s in self._rows_for(self._by_station.get(station_id, ()), date_from, date_to)]
+
+    def by_aadhar(self, aadhar: str) -> Optional[List[dict]]:
+        with self._lock:
+            if not self.ready:
+                return None
+            return [s.row() for s in self._rows_for(self._by_aadhar.get(aadhar.strip(), ()), None, None)]
+
+    def by_status(self, status: str) -> Optional[List[dict]]:
+        with self._lock:
+            if not self.ready:
+                return None
+            return [s.row() for s in self._rows_for(self._by_status.get(status, ()), None, None)]
+
+    def search(self, q: str, date_from=None, date_to=None) -> Optional[List[dict]]:
+        # '%' and '_' are LIKE wildcards in the database path; leave those to it
+        if "%" in q or "_" in q:
+            return None
+        needle = q.lower()
+        with self._lock:
+            if not self.ready:
+                return None
+            slots = self._date_slots(date_from, date_to) if date_from or date_to else self._by_id.values()
+            return [self._rows[i].row() for i in slots if self._rows[i].matches(needle)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "over_budget": self.over_budget,
+                "firs": len(self._by_id),
+                "closed": len(self._by_status["closed"]),
+                "stations": len(self._by_station),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    # ---------- background warm + sync ----------
+
+    def _run(self):
+        db = self._session()
+        try:
+            if not self.warm(db):
+                return
+            while not self._stop.wait(self.sync_seconds):
+                try:
+                    self.sync(db)
+                except Exception:
+                    logger.exception("read model: sync failed")
+                    db.rollback()
+                finally:
+                    # Next round must see other workers' commits
+                    db.commit()
+        except Exception:
+            logger.exception("read model: warm-up failed, serving FIR lists from the database")
+            self.reset()
+        finally:
+            db.close()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fir-read-model", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+read_model = FirReadModel()
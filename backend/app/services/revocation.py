@@ -0,0 +1,180 @@
+# app/services/revocation.py
+"""
+Token revocation without a database read per request.
+
+Revocations are rows in ``revoked_tokens`` (see app/models/auth_token.py).
+Every worker keeps the live ones in memory and a background thread tails
+the table every REVOCATION_SYNC_SECONDS (``id > last seen id``), so the
+check on the request path is a couple of hash lookups:
+
+- single tokens (logout, a leaked token) go by ``jti`` into a Bloom filter
+  backed by a dict; nearly every token is not revoked, and the filter
+  answers that without touching the dict. A filter hit is confirmed in the
+  dict, so a false positive never rejects a valid token.
+- a whole subject ("police:12" after a compromise) is one entry holding
+  the newest ``iat`` it covers; tokens issued after it are unaffected.
+
+Entries are dropped (and the filter rebuilt) once every token they cover
+has expired. The worker that revokes applies the entry immediately; the
+others pick it up within one sync interval.
+"""
+import calendar
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import REVOCATION_BLOOM_BITS, REVOCATION_SYNC_SECONDS
+from app.models.auth_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+PRUNE_EVERY_SECONDS = 300
+# Auto-increment ids can commit out of order; re-reading the last few rows
+# each sync (applying is idempotent) keeps a late commit from being skipped
+SYNC_OVERLAP_IDS = 50
+
+
+class BloomFilter:
+    def __init__(self, bits: int = REVOCATION_BLOOM_BITS, hashes: int = 4):
+        self.bits = max(bits, 8)
+        self.hashes = hashes
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.hashes).digest()
+        for i in range(0, len(digest), 4):
+            yield int.from_bytes(digest[i:i + 4], "little") % self.bits
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self._array[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class RevocationList:
+    def __init__(self, sync_seconds: float = REVOCATION_SYNC_SECONDS, bloom_bits: int = REVOCATION_BLOOM_BITS):
+        self.sync_seconds = sync_seconds
+        self.bloom_bits = bloom_bits
+        self.session_factory = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._bloom = BloomFilter(self.bloom_bits)
+            # jti -> expiry (epoch seconds)
+            self._jtis: Dict[str, float] = {}
+            # subject -> (newest revoked iat, expiry)
+            self._subjects: Dict[str, tuple] = {}
+            self._last_id = 0
+            self._last_prune = time.time()
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.database.connection import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    # ---------- hot path ----------
+
+    def is_revoked(self, jti: Optional[str], subject: Optional[str], iat) -> bool:
+        if jti and jti in self._bloom and jti in self._jtis:
+            return True
+        if subject and self._subjects:
+            hit = self._subjects.get(subject)
+            # Tokens from before iat existed count as issued at 0
+            if hit and int(iat or 0) <= hit[0]:
+                return True
+        return False
+
+    # ---------- applying entries ----------
+
+    def _apply(self, kind: str, value: str, not_after_iat: Optional[int], expires_at: datetime):
+        expiry = calendar.timegm(expires_at.utctimetuple())  # naive UTC
+        with self._lock:
+            if kind == "jti":
+                self._jtis[value] = expiry
+                self._bloom.add(value)
+            elif kind == "subject":
+                current = self._subjects.get(value)
+                if current is None or current[0] < (not_after_iat or 0):
+                    self._subjects[value] = (not_after_iat or 0, expiry)
+
+    def prune(self, now: Optional[float] = None):
+        """Forget entries whose tokens have all expired; rebuild the filter."""
+        now = now or time.time()
+        with self._lock:
+            self._jtis = {j: exp for j, exp in self._jtis.items() if exp > now}
+            self._subjects = {s: v for s, v in self._subjects.items() if v[1] > now}
+            bloom = BloomFilter(self.bloom_bits)
+            for j in self._jtis:
+                bloom.add(j)
+            self._bloom = bloom
+            self._last_prune = now
+
+    def revoke(self, db: Session, kind: str, value: str, expires_at: datetime, not_after_iat: Optional[int] = None):
+        """Record a revocation (committed by the caller) and apply it to this worker at once."""
+        db.add(RevokedToken(kind=kind, value=value, not_after_iat=not_after_iat, expires_at=expires_at))
+        self._apply(kind, value, not_after_iat, expires_at)
+
+    # ---------- sync ----------
+
+    def sync(self, db: Session) -> int:
+        """Apply rows added since the last sync (by any worker)."""
+        q = db.query(RevokedToken).filter(RevokedToken.id > self._last_id - SYNC_OVERLAP_IDS)
+        if self._last_id == 0:
+            q = q.filter(RevokedToken.expires_at > datetime.utcnow())
+        rows = q.order_by(RevokedToken.id).all()
+        for r in rows:
+            self._apply(r.kind, r.value, r.not_after_iat, r.expires_at)
+        if rows:
+            self._last_id = max(self._last_id, rows[-1].id)
+        if time.time() - self._last_prune >= PRUNE_EVERY_SECONDS:
+            self.prune()
+            db.query(RevokedToken).filter(RevokedToken.expires_at < datetime.utcnow()).delete(
+                synchronize_session=False
+            )
+            db.commit()
+        return len(rows)
+
+    def _run(self):
+        db = self._session()
+        try:
+            while True:
+                try:
+                    self.sync(db)
+                except Exception:
+                    logger.exception("revocation sync failed")
+                    db.rollback()
+                finally:
+                    # End the transaction so the next read sees new rows
+                    db.commit()
+                if self._stop.wait(self.sync_seconds):
+                    return
+        finally:
+            db.close()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocations", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,218 @@
+# app/services/suggest.py
+"""
+Prefix typeahead for offence types, incident locations and complainant
+names, ranked by how many FIRs use each value.
+
+Per field, values are grouped by a normalised key (case-folded, inner
+whitespace collapsed) so "Chain  snatching" and "chain snatching" count
+as one; the spelling shown is the one used most often. Each field keeps
+
+- a sorted list of keys: a prefix is the range [bisect(p), bisect(p+max));
+- for every prefix of up to CACHED_PREFIX_LEN characters, its TOP_K keys
+  by count, maintained as counts change. Short prefixes match the most
+  keys, so they are never answered by scanning the range; longer ones
+  match few keys and are ranked on the spot.
+
+Counts only grow (one insert = +1), so a cached top list is kept exact by
+re-ranking it whenever one of its prefixes' keys is incremented.
+
+The index is built with one GROUP BY per field by a background thread at
+startup and rebuilt every SUGGEST_REFRESH_SECONDS, which picks up other
+workers' registrations (and any local one that landed while a rebuild
+was reading). register_incident adds to it after its commit. Until it is
+ready the route answers from the database.
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import SUGGEST_REFRESH_SECONDS
+from app.models.firregistation import FirRegistration
+
+logger = logging.getLogger(__name__)
+
+FIELDS = {
+    "offence_type": FirRegistration.offence_type,
+    "incident_location": FirRegistration.incident_location,
+    "fullname": FirRegistration.fullname,
+}
+TOP_K = 20
+CACHED_PREFIX_LEN = 3
+_END = "\U0010ffff"
+
+
+def normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+class PrefixIndex:
+    def __init__(self, top_k: int = TOP_K, cached_prefix_len: int = CACHED_PREFIX_LEN):
+        self.top_k = top_k
+        self.cached_prefix_len = cached_prefix_len
+        self._keys: List[str] = []
+        self._counts: Dict[str, int] = {}
+        # key -> {spelling: count}; the most used spelling is displayed
+        self._spellings: Dict[str, Dict[str, int]] = {}
+        self._top: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _rank(self, key: str):
+        return (-self._counts[key], key)
+
+    def _prefixes(self, key: str):
+        return (key[:n] for n in range(1, min(len(key), self.cached_prefix_len) + 1))
+
+    def _count(self, key: str, value: str, n: int):
+        self._counts[key] = self._counts.get(key, 0) + n
+        spellings = self._spellings.setdefault(key, {})
+        spelling = " ".join(value.split())
+        spellings[spelling] = spellings.get(spelling, 0) + n
+
+    @classmethod
+    def build(cls, counts, **kwargs) -> "PrefixIndex":
+        """From (value, count) pairs, e.g. a GROUP BY result."""
+        index = cls(**kwargs)
+        for value, n in counts:
+            key = normalize(value)
+            if key:
+                index._count(key, value, n)
+        index._keys = sorted(index._counts)
+        for key in index._keys:
+            for p in index._prefixes(key):
+                index._top.setdefault(p, []).append(key)
+        for p, keys in index._top.items():
+            index._top[p] = heapq.nsmallest(index.top_k, keys, key=index._rank)
+        return index
+
+    def add(self, value: Optional[str], n: int = 1):
+        key = normalize(value)
+        if not key:
+            return
+        if key not in self._counts:
+            insort(self._keys, key)
+        self._count(key, value, n)
+        for p in self._prefixes(key):
+            top = self._top.setdefault(p, [])
+            if key not in top:
+                top.append(key)
+            top.sort(key=self._rank)
+            del top[self.top_k:]
+
+    def _display(self, key: str) -> str:
+        spellings = self._spellings[key]
+        return max(spellings, key=lambda s: (spellings[s], s))
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        p = normalize(prefix)
+        if not p:
+            return []
+        if len(p) <= self.cached_prefix_len and limit <= self.top_k:
+            keys = self._top.get(p, [])[:limit]
+        else:
+            lo = bisect_left(self._keys, p)
+            hi = bisect_left(self._keys, p + _END, lo)
+            keys = heapq.nsmallest(limit, self._keys[lo:hi], key=self._rank)
+        return [{"value": self._display(k), "count": self._counts[k]} for k in keys]
+
+
+class Suggester:
+    def __init__(self, refresh_seconds: float = SUGGEST_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.session_factory = None
+        self.ready = False
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.database.connection import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def warm(self, db: Session):
+        indexes = {
+            name: PrefixIndex.build(db.query(column, func.count()).group_by(column).all())
+            for name, column in FIELDS.items()
+        }
+        with self._lock:
+            self._indexes = indexes
+            self.ready = True
+
+    def reset(self):
+        with self._lock:
+            self._indexes = {}
+            self.ready = False
+
+    def add(self, fir: FirRegistration):
+        """Count a newly registered FIR's values; call after the commit."""
+        with self._lock:
+            if not self.ready:
+                return
+            for name, index in self._indexes.items():
+                index.add(getattr(fir, FIELDS[name].key))
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> Optional[List[dict]]:
+        """None when not warmed yet: ask the database."""
+        with self._lock:
+            if not self.ready:
+                return None
+            return self._indexes[field].suggest(prefix, limit)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"ready": self.ready, **{name: len(index) for name, index in self._indexes.items()}}
+
+    def _run(self):
+        while True:
+            db = self._session()
+            try:
+                self.warm(db)
+            except Exception:
+                logger.exception("suggest: building the index failed")
+            finally:
+                db.close()
+            if self._stop.wait(self.refresh_seconds):
+                return
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fir-suggest", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def suggest_from_db(db: Session, field: str, prefix: str, limit: int = 10) -> List[dict]:
+    """Fallback while the index warms: LIKE 'prefix%' with the same ranking (spellings not merged)."""
+    column = FIELDS[field]
+    escaped = prefix.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if not escaped:
+        return []
+    n = func.count().label("n")
+    rows = (
+        db.query(column, n)
+        .filter(column.ilike(escaped + "%", escape="\\"))
+        .group_by(column)
+        .order_by(n.desc(), column)
+        .limit(limit)
+        .all()
+    )
+    return [{"value": value, "count": count} for value, count in rows]
+
+
+suggester = Suggester()
@@ -0,0 +1,115 @@
+# app/services/tokens.py
+"""
+Refresh-token rotation and revocation.
+
+Login returns a short-lived access token (ACCESS_TOKEN_EXPIRE_MINUTES) and
+a refresh token. ``/auth/refresh`` trades a refresh token for a new pair;
+the old refresh token is marked used in the same transaction, so presenting
+it again means two parties hold it and the whole family is revoked.
+
+These paths read the database; the per-request access-token check does
+not (see app/services/revocation.py).
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from app.models.auth_token import RefreshToken
+from app.services.revocation import revocation_list
+from app.utils.security import ALGORITHM, SECRET_KEY, create_access_token, create_refresh_token, subject_of
+
+
+def issue(db: Session, claims: dict, family: Optional[str] = None) -> dict:
+    """Access + refresh token for ``claims``; the caller commits."""
+    jti, family = uuid.uuid4().hex, family or uuid.uuid4().hex
+    subject = subject_of(claims)
+    db.add(RefreshToken(
+        jti=jti, family=family, subject=subject, claims=json.dumps(claims, default=str),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return {
+        "access_token": create_access_token(claims),
+        "refresh_token": create_refresh_token(jti, family, subject),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+def _decode_refresh(token: str) -> dict:
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("typ") != "refresh":
+        raise JWTError("Not a refresh token")
+    if revocation_list.is_revoked(payload.get("jti"), payload.get("subj"), payload.get("iat")):
+        raise JWTError("Token has been revoked")
+    return payload
+
+
+def refresh(db: Session, token: str) -> dict:
+    """Rotate ``token``; raises JWTError if it is invalid, expired, revoked or reused."""
+    payload = _decode_refresh(token)
+    now = datetime.utcnow()
+    row = db.query(RefreshToken).filter(RefreshToken.jti == payload["jti"]).first()
+    if row is None or row.revoked_at is not None or row.expires_at < now:
+        raise JWTError("Refresh token is no longer valid")
+    claimed = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == row.id, RefreshToken.used_at.is_(None))
+        .update({RefreshToken.used_at: now}, synchronize_session=False)
+    )
+    if not claimed:
+        revoke_family(db, row.family)
+        db.commit()
+        raise JWTError("Refresh token reuse detected; please sign in again")
+    pair = issue(db, json.loads(row.claims), family=row.family)
+    db.commit()
+    return pair
+
+
+def revoke_family(db: Session, family: str) -> int:
+    return (
+        db.query(RefreshToken)
+        .filter(RefreshToken.family == family, RefreshToken.revoked_at.is_(None))
+        .update({RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    )
+
+
+def logout(db: Session, access_payload: dict, refresh_token: Optional[str] = None):
+    """Revoke the presented access token and, if given, its refresh family."""
+    if access_payload.get("jti"):
+        revocation_list.revoke(
+            db, "jti", access_payload["jti"], datetime.utcfromtimestamp(int(access_payload["exp"])),
+        )
+    if refresh_token:
+        try:
+            payload = _decode_refresh(refresh_token)
+        except JWTError:
+            payload = None
+        if payload and payload.get("subj") == subject_of(access_payload):
+            revoke_family(db, payload["fam"])
+    db.commit()
+
+
+def revoke_subject(db: Session, subject: str) -> int:
+    """
+    Invalidate every token ``subject`` holds now: access tokens through the
+    in-memory list, refresh tokens in the table. Tokens issued in the same
+    second as the revocation are covered too (iat has 1 s resolution).
+    Returns the number of refresh tokens revoked.
+    """
+    revocation_list.revoke(
+        db, "subject", subject, datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        not_after_iat=int(time.time()),
+    )
+    revoked = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.subject == subject, RefreshToken.revoked_at.is_(None))
+        .update({RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return revoked
@@ -0,0 +1,79 @@
+# app/services/versions.py
+"""
+Change counters behind the FIR ETags and optimistic concurrency.
+
+``FirRegistration.version`` covers one FIR and everything shown with it
+(progress, culprits, status); ``StationListVersion`` covers a station's FIR
+list. Writers bump them in the same transaction as the change, so a reader
+can validate a cached copy by reading one counter instead of rebuilding
+the response.
+
+The FIR version is SQLAlchemy's ``version_id_col``: bumping it is a
+compare-and-swap on the version the writer read, so of two writers that
+read the same version only the first to flush succeeds.
+"""
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.firregistation import FirRegistration
+from app.models.station_version import StationListVersion
+
+
+def touch_fir(fir: FirRegistration):
+    """Mark ``fir`` changed; the flush bumps version (and fails if someone else did first)."""
+    fir.updated_at = datetime.utcnow()
+
+
+def touch_firs(db: Session, read_versions: Dict[str, int]) -> bool:
+    """
+    Compare-and-swap several FIRs in one statement:
+    UPDATE ... WHERE (id, version) IN ((?, ?), ...). False if any of them
+    changed since ``read_versions`` was read; the caller must roll back.
+    """
+    pairs = list(read_versions.items())
+    updated = (
+        db.query(FirRegistration)
+        .filter(tuple_(FirRegistration.id, FirRegistration.version).in_(pairs))
+        .update(
+            {FirRegistration.version: FirRegistration.version + 1, FirRegistration.updated_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+    )
+    return updated == len(pairs)
+
+
+def bump_station(db: Session, station_id: int):
+    now = datetime.utcnow()
+    values = {StationListVersion.version: StationListVersion.version + 1, StationListVersion.updated_at: now}
+    q = db.query(StationListVersion).filter(StationListVersion.station_id == station_id)
+    if q.update(values, synchronize_session=False):
+        return
+    try:
+        with db.begin_nested():
+            db.add(StationListVersion(station_id=station_id, version=1, updated_at=now))
+    except IntegrityError:
+        # Another writer created the row first
+        q.update(values, synchronize_session=False)
+
+
+def fir_version(db: Session, fir_id: str) -> Optional[Tuple[int, Optional[datetime]]]:
+    """(version, updated_at) of an FIR without loading it, or None if it does not exist."""
+    row = (
+        db.query(FirRegistration.version, FirRegistration.updated_at)
+        .filter(FirRegistration.id == fir_id)
+        .first()
+    )
+    return (row.version, row.updated_at) if row else None
+
+
+def station_version(db: Session, station_id: int) -> Tuple[int, Optional[datetime]]:
+    row = (
+        db.query(StationListVersion.version, StationListVersion.updated_at)
+        .filter(StationListVersion.station_id == station_id)
+        .first()
+    )
+    return (row.version, row.updated_at) if row else (0, None)
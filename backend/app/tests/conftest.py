@@ -3,6 +3,9 @@ import os
 import pytest
 from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import os, sys
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))           # .../backend/app/tests
 APP_DIR = os.path.dirname(THIS_DIR)                              # .../backend/app
@@ -11,7 +14,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from app.main import app
-from app.database.connection import get_db
+from app.database.connection import get_db, Base
 
 @pytest.fixture(scope="session", autouse=True)
 def _unit_env():
@@ -61,3 +64,19 @@ def dep_override():
     yield _set
     for d in regs:
         app.dependency_overrides.pop(d, None)
+
+# ---------- Real in-memory SQLite session ----------
+# For routes whose value is in the SQL itself (joins, aggregates, IN lists),
+# a MagicMock chain proves nothing; run them against a throwaway database.
+@pytest.fixture
+def sqlite_db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    app.dependency_overrides[get_db] = lambda: session
+    yield session
+    app.dependency_overrides.pop(get_db, None)
+    session.close()
+    engine.dispose()
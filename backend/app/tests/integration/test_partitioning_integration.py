@@ -0,0 +1,69 @@
+# backend/app/tests/integration/test_partitioning_integration.py
+"""
+Runs the partitioning DDL against a real MySQL server. Point
+MYSQL_TEST_URL at an empty, throwaway database, e.g.
+
+    MYSQL_TEST_URL=mysql+pymysql://root:pw@localhost/dps_partition_test pytest tests/integration
+"""
+import os
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import partitioning
+from app.database.connection import Base
+
+MYSQL_TEST_URL = os.getenv("MYSQL_TEST_URL")
+
+pytestmark = pytest.mark.skipif(not MYSQL_TEST_URL, reason="MYSQL_TEST_URL is not set")
+
+# Created after the migration, all with FKs to a partitioned table
+ADDED_LATER = ("culprit_search_terms", "fir_signatures", "fir_blocking_keys")
+
+
+@pytest.fixture
+def mysql_engine():
+    engine = create_engine(MYSQL_TEST_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    # guard_foreign_keys switched FKs off on the shared metadata
+    for table in Base.metadata.tables.values():
+        for fk in table.foreign_key_constraints:
+            fk._ddl_if = None
+    with engine.begin() as conn:
+        conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for table in inspect(engine).get_table_names():
+            conn.execute(text(f"DROP TABLE `{table}`"))
+    engine.dispose()
+
+
+@pytest.mark.parametrize("subpartitions", [0, 4])
+def test_migrate_then_create_tables_added_later(mysql_engine, subpartitions):
+    with mysql_engine.begin() as conn:
+        conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for table in ADDED_LATER:
+            conn.execute(text(f"DROP TABLE `{table}`"))
+
+    assert partitioning.migrate(mysql_engine, 2023, 2025, station_subpartitions=subpartitions)
+    assert partitioning.partitioned_tables(mysql_engine) == set(partitioning.PARTITIONED_TABLES)
+    pk = inspect(mysql_engine).get_pk_constraint("Fir_Registration")["constrained_columns"]
+    assert list(pk) == list(partitioning.primary_key("Fir_Registration", subpartitions))
+
+    # What init_schema does on every start of a partitioned database
+    assert partitioning.guard_foreign_keys(Base.metadata, mysql_engine) > 0
+    Base.metadata.create_all(mysql_engine)
+    assert set(ADDED_LATER) <= set(inspect(mysql_engine).get_table_names())
+
+    with mysql_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO `Fir_Registration` (id, fullname, age, gender, address, contact_number, "
+                "id_proof_type, incident_date, incident_time, offence_type, incident_location, "
+                "case_narrative, Stationid, version) VALUES ('F1', 'p', 30, 'M', 'a', '1', 'Aadhar', "
+                ":d, :t, 'Theft', 'x', 'n', 5, 1)"
+            ),
+            {"d": date(2024, 5, 1), "t": time(10, 0)},
+        )
+    assert partitioning.add_year(mysql_engine, 2026)
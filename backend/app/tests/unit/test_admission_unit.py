@@ -0,0 +1,109 @@
+# backend/app/tests/unit/test_admission_unit.py
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController, AdmissionMiddleware, RouteClass, classify
+
+
+def _controller(capacity=1, **queues):
+    return AdmissionController(
+        capacity=capacity,
+        classes=(
+            RouteClass("write", priority=0, limit=4, max_queue=queues.get("write", 4), max_wait=1.0),
+            RouteClass("bulk", priority=2, limit=4, max_queue=queues.get("bulk", 4), max_wait=1.0),
+        ),
+    )
+
+
+def test_classify_routes():
+    assert classify("POST", "/citizen/citizenAuth") == "auth"
+    assert classify("POST", "/fir/register_incident") == "write"
+    assert classify("GET", "/fir/list") == "bulk"
+    assert classify("GET", "/fir/list_by_station") == "read"
+    assert classify("GET", "/") is None
+
+
+def test_writes_are_served_before_queued_bulk_reads():
+    async def scenario():
+        ctl = _controller(capacity=1)
+        assert await ctl.acquire("bulk")
+        order = []
+
+        async def run(name):
+            assert await ctl.acquire(name)
+            order.append(name)
+
+        bulk = asyncio.ensure_future(run("bulk"))
+        await asyncio.sleep(0)
+        write = asyncio.ensure_future(run("write"))
+        await asyncio.sleep(0)
+        assert ctl.stats()["classes"]["bulk"]["queue_depth"] == 1
+
+        ctl.release("bulk")
+        await write
+        ctl.release("write")
+        await bulk
+        return order
+
+    assert asyncio.run(scenario()) == ["write", "bulk"]
+
+
+
+def test_cancelled_waiters_never_keep_a_slot():
+    async def scenario():
+        ctl = _controller(capacity=1)
+        assert await ctl.acquire("write")
+
+        # Cancelled while queued: it leaves the queue and is never granted
+        queued = asyncio.ensure_future(ctl.acquire("bulk"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert ctl.stats()["classes"]["bulk"]["queue_depth"] == 0
+        ctl.release("write")
+        assert ctl.in_flight == 0
+
+        # Granted and cancelled in the same tick: either the caller got the
+        # slot (and releases it) or acquire gave it back
+        assert await ctl.acquire("write")
+        granted = asyncio.ensure_future(ctl.acquire("bulk"))
+        await asyncio.sleep(0)
+        ctl.release("write")
+        granted.cancel()
+        await asyncio.gather(granted, return_exceptions=True)
+        if not granted.cancelled():
+            ctl.release("bulk")
+        return ctl.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_flight"] == 0
+    assert stats["classes"]["bulk"]["in_flight"] == 0
+
+def test_full_queue_and_timeout_are_counted():
+    async def scenario():
+        ctl = _controller(capacity=1, bulk=0)
+        ctl.classes["write"].max_wait = 0.01
+        assert await ctl.acquire("write")
+        assert await ctl.acquire("bulk") is False
+        assert await ctl.acquire("write") is False
+        return ctl.stats()["classes"]
+
+    stats = asyncio.run(scenario())
+    assert stats["bulk"]["rejected_queue_full"] == 1
+    assert stats["write"]["rejected_timeout"] == 1
+    assert stats["write"]["queue_depth"] == 0
+
+
+def test_middleware_sheds_with_503_and_retry_after():
+    app = FastAPI()
+
+    @app.get("/fir/list")
+    def bulk():
+        return []
+
+    app.add_middleware(AdmissionMiddleware, controller=_controller(capacity=0, bulk=0), enabled=True)
+    res = TestClient(app).get("/fir/list")
+    assert res.status_code == 503
+    assert int(res.headers["retry-after"]) > 0
@@ -0,0 +1,132 @@
+# backend/app/tests/unit/test_archive_unit.py
+import os
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.archive import ArchivedFir
+from app.models.evidence import Evidence
+from app.models.firregistation import FirRegistration, FIRProgress, Culprit, closedFir
+from app.models.government import Escalation
+from app.models.policemember import PoliceMember
+from app.services import archive
+from app.services.read_model import read_model
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+OWNER = {"Authorization": "Bearer " + create_access_token({"citizen_id": 7, "aadhar_no": "123412341234"})}
+FIR = dict(
+    fullname="p", age=30, gender="M", address="a", contact_number="1", id_proof_type="Aadhar",
+    id_proof_value="123412341234", incident_date=date(2020, 1, 1), incident_time=time(10, 0),
+    offence_type="Theft", incident_location="x", case_narrative="n", Stationid=5, member_id=1,
+    updated_at=datetime(2020, 3, 1, 12, 0, 0, 123456),
+)
+CLOSED = {k: v for k, v in FIR.items() if k != "updated_at"}
+
+
+@pytest.fixture
+def cases(sqlite_db):
+    # OLD0..OLD2 closed long ago, RECENT closed last year, OPEN never closed;
+    # OLD1 has evidence and OLD2 a pending escalation, so only OLD0 qualifies
+    sqlite_db.execute(insert(PoliceMember), [dict(member_id=1, name="Raj", password="pw", station_id=5)])
+    ids = ["OLD0", "OLD1", "OLD2", "RECENT", "OPEN"]
+    sqlite_db.execute(insert(FirRegistration), [dict(FIR, id=i) for i in ids])
+    sqlite_db.execute(insert(closedFir), [
+        dict(CLOSED, fir_id=i, closed_at=date(2021, 1, 1) if i.startswith("OLD") else date(2025, 6, 1))
+        for i in ids[:4]
+    ])
+    for i in ids:
+        sqlite_db.add(Culprit(fir_id=i, station_id=5, member_id=1, name=f"culprit of {i}"))
+        sqlite_db.add(FIRProgress(fir_id=i, progress_text="first", created_at=datetime(2020, 1, 2)))
+        sqlite_db.add(FIRProgress(fir_id=i, progress_text="second", created_at=datetime(2020, 1, 3)))
+    sqlite_db.add(Evidence(fir_id="OLD1", sha256="0" * 64, size=1, content_type="image/png"))
+    sqlite_db.add(Escalation(fir_id="OLD2", aadhar_no="123412341234", reason="slow", status="pending"))
+    sqlite_db.add(Escalation(fir_id="OLD0", aadhar_no="123412341234", reason="done", status="resolved"))
+    sqlite_db.commit()
+    return sqlite_db
+
+
+@pytest.fixture
+def cold(tmp_path, monkeypatch):
+    store = archive.ColdArchive(directory=str(tmp_path), cache_size=2, codec="gzip", block_records=2)
+    monkeypatch.setattr(archive, "cold_archive", store)
+    return store
+
+
+def _hot(db):
+    db.expire_all()
+    return sorted(fid for (fid,) in db.query(FirRegistration.id).all())
+
+
+def test_only_old_settled_cases_without_evidence_move(cases, cold):
+    totals = cold.run(cases, retention_days=365 * 3)
+    assert totals == {"archived": 1, "deleted": 1, "unarchived": 0}
+    assert _hot(cases) == ["OLD1", "OLD2", "OPEN", "RECENT"]
+    assert cases.query(FIRProgress).filter(FIRProgress.fir_id == "OLD0").count() == 0
+    assert cases.query(Escalation).filter(Escalation.fir_id == "OLD0").count() == 0
+
+    entry = cases.query(ArchivedFir).one()
+    assert entry.fir_id == "OLD0" and entry.closed_at == date(2021, 1, 1) and entry.segment.endswith(".jsonl.gz")
+    assert os.path.exists(os.path.join(cold.directory, entry.segment + ".idx"))
+
+    # A second run finds nothing new
+    assert cold.run(cases, retention_days=365 * 3) == {"archived": 0, "deleted": 0, "unarchived": 0}
+
+
+def test_segment_blocks_are_read_one_at_a_time(tmp_path):
+    cases = [(f"F{i}", {"fir": {"id": f"F{i}"}, "n": i}) for i in range(5)]
+    segment, entries = archive.write_segment(str(tmp_path), cases, "gzip", block_records=2)
+    # 5 cases in blocks of 2: three independently compressed blocks
+    assert len({offset for _, offset, _, _ in entries}) == 3
+    for fir_id, offset, length, line in entries:
+        assert archive.read_case(str(tmp_path), segment, offset, length, line)["fir"]["id"] == fir_id
+    assert len((tmp_path / (segment + ".idx")).read_text().splitlines()) == 5
+
+
+def test_detail_rehydrates_archived_case(client, cases, cold):
+    cold.run(cases, retention_days=365 * 3)
+
+    res = client.get("/fir/detail/OLD0", headers=OWNER)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "closed" and body["fir_id"] == "OLD0"
+    assert [p["progress_text"] for p in body["progress"]] == ["second", "first"]
+    assert [c["name"] for c in body["culprits"]] == ["culprit of OLD0"]
+
+    # Same validators as before archiving; the second read comes from the cache
+    etag = res.headers["etag"]
+    assert client.get("/fir/detail/OLD0", headers={**OWNER, "If-None-Match": etag}).status_code == 304
+    assert cold.stats()["misses"] == 1 and cold.stats()["hits"] == 1
+
+    assert client.get("/fir/details", params={"fir_id": "OLD0"}).json()["status"] == "closed"
+    assert client.get("/fir/detail/NOPE", headers=POLICE).status_code == 404
+
+
+def test_case_changed_after_archiving_stays_hot(cases, cold):
+    assert cold.archive_batch(cases, date(2024, 1, 1)) == 1
+    cases.query(FirRegistration).filter(FirRegistration.id == "OLD0").update(
+        {FirRegistration.version: FirRegistration.version + 1}
+    )
+    cases.commit()
+
+    assert cold.purge(cases) == (0, 1)
+    assert "OLD0" in _hot(cases)
+    assert cases.query(ArchivedFir).count() == 0
+
+    # Picked up again, at its new version, by the next run
+    assert cold.run(cases, retention_days=365 * 3)["deleted"] == 1
+    assert "OLD0" not in _hot(cases)
+
+
+def test_archived_cases_leave_the_read_model(cases, cold):
+    read_model.warm(cases)
+    try:
+        cold.run(cases, retention_days=365 * 3)
+        assert "OLD0" not in {r["fir_id"] for r in read_model.by_station(5)}
+        # A reload of the station does not bring it back, nor drop open cases
+        read_model.remove(["OPEN"])
+        read_model.reload_station(cases, 5)
+        assert sorted(r["fir_id"] for r in read_model.by_station(5)) == ["OLD1", "OLD2", "OPEN", "RECENT"]
+    finally:
+        read_model.reset()
@@ -0,0 +1,109 @@
+# backend/app/tests/unit/test_assignment_unit.py
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models.firregistation import FirRegistration
+from app.models.policemember import PoliceMember
+from app.models.workload import OfficerWorkload
+from app.services import assignment
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+FIR = dict(
+    fullname="p", age=30, gender="M", address="a", contact_number="1", id_proof_type="Aadhar",
+    incident_date=date(2025, 1, 1), incident_time=time(10, 0), offence_type="Theft", incident_location="x",
+    case_narrative="n",
+)
+
+
+@pytest.fixture
+def station(sqlite_db):
+    sqlite_db.execute(insert(PoliceMember), [
+        dict(member_id=m, name=f"Officer {m}", password="pw", station_id=6 if m == 9 else 5) for m in (1, 2, 3, 9)
+    ])
+    sqlite_db.execute(insert(FirRegistration), [
+        dict(FIR, id=f"F{i}", Stationid=6 if i == 4 else 5, member_id=1) for i in range(5)
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def _open_cases(db):
+    db.expire_all()
+    return {w.member_id: w.open_cases for w in db.query(OfficerWorkload).all()}
+
+
+def _assign(client, fir_id, member_id=None):
+    body = {"fir_id": fir_id} if member_id is None else {"fir_id": fir_id, "member_id": member_id}
+    return client.post("/fir/assign", json=body, headers=POLICE)
+
+
+def test_assign_reassign_and_auto_assign_keep_counters(client, station):
+    res = _assign(client, "F0", 2)
+    assert res.status_code == 200
+    assert res.json()["assigned_member_id"] == 2 and res.json()["previous_member_id"] is None
+
+    # Least loaded first, lowest member id on a tie
+    assert [_assign(client, f).json()["assigned_member_id"] for f in ("F1", "F2", "F3")] == [1, 3, 1]
+    assert _open_cases(station) == {1: 2, 2: 1, 3: 1}
+
+    res = _assign(client, "F0", 3)
+    assert res.json()["message"] == "FIR reassigned" and res.json()["previous_member_id"] == 2
+    assert _open_cases(station) == {1: 2, 2: 0, 3: 2}
+
+    # Auto-reassignment never picks the current assignee
+    assert _assign(client, "F0").json()["assigned_member_id"] == 2
+    assert _open_cases(station) == {1: 2, 2: 1, 3: 1}
+    assert client.get("/fir/details", params={"fir_id": "F0"}).json()["assigned_member_id"] == 2
+
+
+def test_close_releases_the_assignee_and_closed_cases_cannot_be_assigned(client, station):
+    _assign(client, "F1", 2)
+    assert client.post("/fir/close_fir", json={"fir_id": "F1"}, headers=POLICE).status_code == 200
+    assert _open_cases(station) == {2: 0}
+
+    res = _assign(client, "F1", 3)
+    assert res.status_code == 409
+    assert _open_cases(station) == {2: 0}
+
+
+def test_assignment_is_limited_to_the_station(client, station):
+    assert _assign(client, "F0", 9).status_code == 400
+    assert _assign(client, "F0", 404).status_code == 400
+    assert _assign(client, "F4", 1).status_code == 403
+    assert _open_cases(station) == {}
+
+
+def test_allmembers_reads_counters_not_firs(client, station):
+    for fir_id, member in (("F0", 2), ("F1", 2), ("F2", 3)):
+        _assign(client, fir_id, member)
+
+    seen = []
+
+    def _before(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(station.get_bind(), "before_cursor_execute", _before)
+    try:
+        res = client.get("/policeauth/allmembers", headers=POLICE)
+    finally:
+        event.remove(station.get_bind(), "before_cursor_execute", _before)
+
+    assert res.status_code == 200
+    assert [(m["member_id"], m["open_cases"], m["assigned_total"]) for m in res.json()] == [
+        (1, 0, 0), (2, 2, 2), (3, 1, 1),
+    ]
+    assert not any("Fir_Registration" in s for s in seen)
+
+
+def test_rebuild_recounts_open_cases(client, station):
+    for fir_id, member in (("F0", 2), ("F1", 2), ("F2", 3)):
+        _assign(client, fir_id, member)
+    client.post("/fir/close_fir", json={"fir_id": "F2"}, headers=POLICE)
+    station.query(OfficerWorkload).update({OfficerWorkload.open_cases: 7})
+    station.commit()
+
+    assert assignment.rebuild(station) == 2
+    assert _open_cases(station) == {2: 2, 3: 0}
@@ -0,0 +1,74 @@
+# backend/app/tests/unit/test_audit_unit.py
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes.governmentroutes import get_current_government
+from app.models.audit import AuditLog
+from app.services.audit import AuditLogWriter, GENESIS_HASH, audit_log, verify_chain
+from app.utils.security import create_access_token
+
+
+def _writer(sqlite_db, **kw):
+    w = AuditLogWriter(**kw)
+    w._session_factory = sessionmaker(bind=sqlite_db.get_bind())
+    return w
+
+
+def test_record_buffers_until_flush_and_chains_hashes(sqlite_db):
+    w = _writer(sqlite_db)
+    w.record("fir.registered", "police", 7, fir_id="F1", station_id=2)
+    w.record("fir.closed", "police", 7, fir_id="F1")
+    assert sqlite_db.query(AuditLog).count() == 0
+
+    assert w.flush() == 2
+    rows = sqlite_db.query(AuditLog).order_by(AuditLog.id).all()
+    assert rows[0].prev_hash == GENESIS_HASH
+    assert rows[1].prev_hash == rows[0].entry_hash
+    assert verify_chain(sqlite_db) is None
+
+
+def test_tampering_breaks_the_chain(sqlite_db):
+    w = _writer(sqlite_db)
+    for i in range(3):
+        w.record("fir.progress_added", "police", 1, fir_id="F1", progress_id=i)
+    w.flush()
+    second = sqlite_db.query(AuditLog).order_by(AuditLog.id).all()[1]
+    second.actor_id = "999"
+    sqlite_db.commit()
+    assert verify_chain(sqlite_db) == second.id
+
+
+def test_stop_drains_buffer(sqlite_db):
+    w = _writer(sqlite_db, flush_size=1000, flush_seconds=60)
+    w.start()
+    w.record("escalation.created", "citizen", 9, fir_id="F2")
+    w.stop()
+    assert w.pending() == 0
+    assert sqlite_db.query(AuditLog).count() == 1
+
+
+def test_query_by_fir_and_actor(client, sqlite_db, dep_override, monkeypatch):
+    monkeypatch.setattr(audit_log, "_session_factory", sessionmaker(bind=sqlite_db.get_bind()))
+    monkeypatch.setattr(audit_log, "_buffer", [])
+    dep_override(get_current_government, lambda: {"government_member_id": 5})
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "4", "name": "A", "station_id": 1})}
+    res = client.post(
+        "/fir/register_incident",
+        json={
+            "fullname": "John", "age": 30, "gender": "M", "address": "a", "contact_number": "1",
+            "id_proof_type": "Aadhar", "id_proof_value": "A1", "incident_date": "2025-01-01",
+            "incident_time": "10:00", "offence_type": "Theft", "incident_location": "Market",
+            "case_narrative": "n",
+        },
+        headers=headers,
+    )
+    fir_id = res.json()["report_id"]
+    client.post("/fir/close_fir", json={"fir_id": fir_id}, headers=headers)
+
+    by_fir = client.get("/audit/events", params={"fir_id": fir_id}).json()["entries"]
+    assert [e["action"] for e in by_fir] == ["fir.registered", "fir.closed"]
+
+    by_actor = client.get("/audit/events", params={"actor_type": "police", "actor_id": "4"}).json()
+    assert len(by_actor["entries"]) == 2
+    assert client.get("/audit/verify").json() == {"intact": True, "first_broken_id": None}
+    assert client.get("/audit/events").status_code == 422
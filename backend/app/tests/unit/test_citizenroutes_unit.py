@@ -74,3 +74,60 @@ def test_citizen_escalate_unauthorized_if_not_owner(client, override_db, dep_ove
     res = client.post("/citizen/escalatefir", json={"fir_id": "F9", "reason": "x"})
     assert res.status_code == 403
     assert res.json()["detail"] == "You are not authorized to escalate this FIR"
+
+def _seed_dashboard(db):
+    from datetime import date, time
+    from app.models.firregistation import FirRegistration, FIRProgress, closedFir
+    from app.models.government import Escalation
+
+    def fir(fid, day):
+        return FirRegistration(
+            id=fid, fullname="John", age=30, gender="M", address="addr",
+            contact_number="1", id_proof_type="Aadhar", id_proof_value="A1",
+            incident_date=date(2025, 1, day), incident_time=time(10, 0),
+            offence_type="Theft", incident_location="Market", case_narrative="n",
+            Stationid=3,
+        )
+    db.add_all([fir("F1", 1), fir("F2", 2), fir("F3", 3)])
+    db.flush()
+    db.add_all([
+        FIRProgress(fir_id="F1", progress_text="first"),
+        FIRProgress(fir_id="F1", progress_text="second"),
+        closedFir(
+            fir_id="F2", fullname="John", age=30, gender="M", address="addr",
+            contact_number="1", id_proof_type="Aadhar", id_proof_value="A1",
+            incident_date=date(2025, 1, 2), incident_time=time(10, 0),
+            offence_type="Theft", incident_location="Market", case_narrative="n",
+            Stationid=3,
+        ),
+        Escalation(fir_id="F1", aadhar_no="A1", reason="Delay", status="in_review"),
+    ])
+    db.commit()
+
+def test_citizen_dashboard_aggregates_and_paginates(client, sqlite_db, dep_override):
+    dep_override(get_current_citizen, lambda: {"citizen_id": 9, "aadhar_no": "A1"})
+    _seed_dashboard(sqlite_db)
+
+    res = client.get("/citizen/dashboard", params={"limit": 2})
+    assert res.status_code == 200
+    j = res.json()
+    assert j["total"] == 3
+    assert [f["fir_id"] for f in j["firs"]] == ["F3", "F2"]
+    assert j["firs"][1]["status"] == "closed"
+
+    page2 = client.get("/citizen/dashboard", params={"limit": 2, "offset": 2}).json()
+    f1 = page2["firs"][0]
+    assert f1["fir_id"] == "F1"
+    assert f1["progress_count"] == 2
+    assert f1["latest_progress"]["progress_text"] == "second"
+    assert f1["escalation_status"] == "in_review"
+
+def test_citizen_dashboard_etag_revalidation(client, sqlite_db, dep_override):
+    dep_override(get_current_citizen, lambda: {"citizen_id": 9, "aadhar_no": "A1"})
+    _seed_dashboard(sqlite_db)
+
+    first = client.get("/citizen/dashboard")
+    etag = first.headers["etag"]
+    again = client.get("/citizen/dashboard", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
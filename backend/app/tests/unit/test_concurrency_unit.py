@@ -0,0 +1,150 @@
+# backend/app/tests/unit/test_concurrency_unit.py
+#
+# Parallel writers against one database file: optimistic concurrency on
+# FirRegistration.version must never lose a progress entry, never close an
+# FIR twice, and must not make writers on different FIRs conflict.
+import threading
+from datetime import date, time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.api.routes.firroutes import add_progress, close_fir
+from app.database.connection import Base
+from app.models.firregistation import FirRegistration, FIRProgress, closedFir
+from app.schemas.Fir import FIRCloseRequest, FIRProgressUpdate
+
+OFFICER = {"id": 1, "name": "A", "station_id": 1}
+WRITERS = 8
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with factory() as db:
+        for i in range(WRITERS):
+            db.add(FirRegistration(
+                id=f"F{i}", fullname="x", age=1, gender="M", address="a", contact_number="1",
+                id_proof_type="Aadhar", incident_date=date(2025, 1, 1), incident_time=time(10, 0),
+                offence_type="Theft", incident_location="Market", case_narrative="n", Stationid=1,
+            ))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def _parallel(fn, n=WRITERS):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+    errors = []
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except BaseException as exc:  # pytest.fail raises a BaseException
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(60)
+    if errors:
+        raise errors[0]
+    return results
+
+
+def _call(Session, endpoint, request):
+    """Status code of one request in its own session, as the route would return it."""
+    with Session() as db:
+        try:
+            endpoint(request, OFFICER, db)
+            return 200
+        except HTTPException as exc:
+            return exc.status_code
+
+
+# A write can lose to every other writer's commit at most once each
+MAX_ATTEMPTS = WRITERS * 3 + 1
+
+
+def _add_with_retry(Session, fir_id, text):
+    """Conflicts seen before the write landed; fails instead of spinning on a 409 regression."""
+    for conflicts in range(MAX_ATTEMPTS):
+        status = _call(Session, add_progress, FIRProgressUpdate(fir_id=fir_id, progress_text=text))
+        if status != 409:
+            assert status == 200
+            return conflicts
+    pytest.fail(f"progress on {fir_id} still conflicting after {MAX_ATTEMPTS} attempts")
+
+
+def test_version_is_compare_and_swap(Session):
+    a, b = Session(), Session()
+    fa, fb = a.get(FirRegistration, "F0"), b.get(FirRegistration, "F0")
+    fa.updated_at = fb.updated_at = None
+    a.commit()
+    with pytest.raises(StaleDataError):
+        b.commit()
+    b.rollback()
+    assert b.get(FirRegistration, "F0").version == 2
+    a.close(), b.close()
+
+
+def test_parallel_progress_on_one_fir_loses_nothing(Session):
+    per_writer = 3
+
+    def writer(i):
+        return sum(_add_with_retry(Session, "F0", f"w{i}-{n}") for n in range(per_writer))
+
+    conflicts = _parallel(writer)
+    with Session() as db:
+        assert db.query(FIRProgress).filter(FIRProgress.fir_id == "F0").count() == WRITERS * per_writer
+        assert db.get(FirRegistration, "F0").version == 1 + WRITERS * per_writer
+    # Retries are bounded by the number of competing commits
+    assert sum(conflicts) < WRITERS * WRITERS * per_writer
+
+
+def test_writers_on_different_firs_never_conflict(Session):
+    conflicts = _parallel(lambda i: sum(_add_with_retry(Session, f"F{i}", str(n)) for n in range(3)))
+    assert conflicts == [0] * WRITERS
+
+
+def test_parallel_close_creates_one_closed_row(Session):
+    codes = _parallel(lambda i: _call(Session, close_fir, FIRCloseRequest(fir_id="F1")))
+    assert sorted(codes) == [200] + [409] * (WRITERS - 1)
+    with Session() as db:
+        assert db.query(closedFir).filter(closedFir.fir_id == "F1").count() == 1
+
+
+def test_progress_racing_a_close_is_rejected(Session):
+    # Deterministic interleaving: the close commits while add_progress is
+    # between reading the FIR and flushing its update.
+    db = Session()
+    fired = []
+
+    def close_first(session, flush_context, instances):
+        if not fired:
+            fired.append(_call(Session, close_fir, FIRCloseRequest(fir_id="F2")))
+
+    event.listen(db, "before_flush", close_first)
+    with pytest.raises(HTTPException) as exc:
+        add_progress(FIRProgressUpdate(fir_id="F2", progress_text="late"), OFFICER, db)
+    db.close()
+    assert fired == [200] and exc.value.status_code == 409
+    with Session() as check:
+        assert check.query(FIRProgress).filter(FIRProgress.fir_id == "F2").count() == 0
+        assert _call(Session, add_progress, FIRProgressUpdate(fir_id="F2", progress_text="x")) == 409
+
+
+def test_expected_version_mismatch_is_409(Session):
+    assert _call(Session, add_progress, FIRProgressUpdate(fir_id="F3", progress_text="a", expected_version=1)) == 200
+    assert _call(Session, add_progress, FIRProgressUpdate(fir_id="F3", progress_text="b", expected_version=1)) == 409
+    assert _call(Session, close_fir, FIRCloseRequest(fir_id="F3", expected_version=2)) == 200
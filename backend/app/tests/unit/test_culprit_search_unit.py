@@ -0,0 +1,59 @@
+# backend/app/tests/unit/test_culprit_search_unit.py
+from datetime import date, time
+
+from app.api.routes.firroutes import get_current_police
+from app.models.culprit_index import CulpritSearchTerm
+from app.models.firregistation import FirRegistration, Culprit
+from app.services import culprit_search
+from app.services.culprit_search import phonetic_key, words
+
+
+def test_transliteration_variants_share_keys():
+    assert phonetic_key(words("Mohd")[0]) == phonetic_key(words("Mohammed")[0])
+    assert phonetic_key(words("Sharmaa")[0]) == phonetic_key(words("Sharma")[0])
+    assert phonetic_key(words("Bhatt")[0]) == phonetic_key(words("Bhat")[0])
+
+
+def _seed(db):
+    db.add(FirRegistration(
+        id="F1", fullname="x", age=1, gender="M", address="a", contact_number="1",
+        id_proof_type="Aadhar", incident_date=date(2025, 1, 1), incident_time=time(10, 0),
+        offence_type="Theft", incident_location="Market", case_narrative="n", Stationid=1,
+    ))
+    db.add_all([
+        Culprit(fir_id="F1", station_id=1, name="Mohammed Iqbal", identity_marks="scar on left cheek",
+                custody_status="absconding"),
+        Culprit(fir_id="F1", station_id=2, name="Mohd Ikbal", address="Old City", custody_status="in custody"),
+        Culprit(fir_id="F1", station_id=2, name="Ravi Sharmaa", custody_status="absconding"),
+    ])
+    db.commit()
+
+
+def test_terms_are_maintained_on_insert(sqlite_db):
+    _seed(sqlite_db)
+    assert sqlite_db.query(CulpritSearchTerm).count() > 0
+    assert culprit_search.rebuild_index(sqlite_db) == 3
+
+
+def test_search_endpoint_fuzzy_with_filters(client, sqlite_db, dep_override):
+    dep_override(get_current_police, lambda: {"id": 1, "name": "A", "station_id": 1})
+    _seed(sqlite_db)
+
+    res = client.get("/fir/culprits/search", params={"name": "Mohd Iqbal"})
+    assert res.status_code == 200
+    names = [r["name"] for r in res.json()]
+    assert names[:2] == ["Mohammed Iqbal", "Mohd Ikbal"] or names[:2] == ["Mohd Ikbal", "Mohammed Iqbal"]
+    assert "Ravi Sharmaa" not in names
+
+    only_station_2 = client.get("/fir/culprits/search", params={"name": "Mohammad Iqbal", "station_id": 2}).json()
+    assert [r["name"] for r in only_station_2] == ["Mohd Ikbal"]
+
+    absconding = client.get(
+        "/fir/culprits/search", params={"name": "sharma", "custody_status": "absconding"}
+    ).json()
+    assert [r["name"] for r in absconding] == ["Ravi Sharmaa"]
+
+    by_marks = client.get("/fir/culprits/search", params={"identity_marks": "scar cheek"}).json()
+    assert by_marks[0]["name"] == "Mohammed Iqbal"
+
+    assert client.get("/fir/culprits/search").status_code == 422
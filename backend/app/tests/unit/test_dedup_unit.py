@@ -0,0 +1,61 @@
+# backend/app/tests/unit/test_dedup_unit.py
+from app.api.routes.firroutes import get_current_police
+from app.models.fir_dedup import FirBlockingKey, FirSignature
+from app.services import dedup
+
+NARRATIVE = (
+    "Complainant reports that two men on a black motorcycle snatched her gold chain "
+    "near the bus stop at around ten in the morning and fled towards the railway station"
+)
+REWORDED = (
+    "Complainant reports that two men on a black motorcycle snatched her gold chain "
+    "near the bus stop at around 10 am and then fled towards the railway station"
+)
+UNRELATED = "Shop owner found the rear shutter broken and cash missing from the counter drawer overnight"
+
+
+def test_signature_similarity_tracks_jaccard():
+    a, b, c = dedup.signature(NARRATIVE), dedup.signature(REWORDED), dedup.signature(UNRELATED)
+    assert dedup.similarity(a, a) == 1.0
+    assert dedup.similarity(a, b) > 0.5
+    assert dedup.similarity(a, c) < 0.2
+    assert dedup.unpack(dedup.pack(a)) == a
+    assert dedup.signature("") is None
+
+
+def _register(client, fullname, narrative, incident_date="2025-03-10", location="Central Bus Stand"):
+    payload = {
+        "fullname": fullname, "age": 30, "gender": "F", "address": "addr", "contact_number": "1",
+        "id_proof_type": "Aadhar", "incident_date": incident_date, "incident_time": "10:00",
+        "offence_type": "Chain snatching", "incident_location": location, "case_narrative": narrative,
+    }
+    res = client.post("/fir/register_incident", json=payload)
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_register_incident_returns_candidate_duplicates(client, sqlite_db, dep_override):
+    dep_override(get_current_police, lambda: {"id": 1, "name": "A", "station_id": 1})
+    first = _register(client, "Sunita Sharma", NARRATIVE)
+    assert first["possible_duplicates"] == []
+    assert sqlite_db.query(FirSignature).count() == 1
+    assert sqlite_db.query(FirBlockingKey).count() > dedup.BANDS
+
+    _register(client, "Ramesh Gupta", UNRELATED, location="Old Market")
+    # same incident, reported at another station with a transliterated name
+    dep_override(get_current_police, lambda: {"id": 2, "name": "B", "station_id": 2})
+    second = _register(client, "Suneeta Sharmaa", REWORDED, incident_date="2025-03-11")
+    assert [d["fir_id"] for d in second["possible_duplicates"]] == [first["report_id"]]
+    assert second["possible_duplicates"][0]["narrative_similarity"] > 0.5
+
+    # same story but outside the date window is not a candidate
+    later = _register(client, "Sunita Sharma", NARRATIVE, incident_date="2025-06-01")
+    assert later["possible_duplicates"] == []
+
+
+def test_rebuild_index(sqlite_db, client, dep_override):
+    dep_override(get_current_police, lambda: {"id": 1, "name": "A", "station_id": 1})
+    _register(client, "Sunita Sharma", NARRATIVE)
+    before = sqlite_db.query(FirBlockingKey).count()
+    assert dedup.rebuild_index(sqlite_db) == 1
+    assert sqlite_db.query(FirBlockingKey).count() == before
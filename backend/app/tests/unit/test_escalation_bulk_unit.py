@@ -0,0 +1,131 @@
+# backend/app/tests/unit/test_escalation_bulk_unit.py
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.api.routes import governmentroutes
+from app.api.routes.governmentroutes import get_current_government
+from app.models.firregistation import FirRegistration
+from app.models.government import Escalation
+
+STATUSES = {1: "pending", 2: "in_review", 3: "resolved", 4: "rejected", 5: "pending"}
+
+
+@pytest.fixture
+def escalations(sqlite_db, dep_override):
+    dep_override(get_current_government, lambda: {"government_member_id": 5})
+    sqlite_db.execute(insert(FirRegistration), [dict(
+        id="F1", fullname="p", age=30, gender="M", address="a", contact_number="1", id_proof_type="Aadhar",
+        incident_date=date(2025, 1, 1), incident_time=time(10, 0), offence_type="Theft", incident_location="x",
+        case_narrative="n", Stationid=5,
+    )])
+    sqlite_db.execute(insert(Escalation), [
+        dict(id=i, fir_id="F1", aadhar_no="A", reason="r", status=s) for i, s in STATUSES.items()
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def _statuses(db):
+    db.expire_all()
+    return {e.id: e.status for e in db.query(Escalation).all()}
+
+
+def _statements(db):
+    seen = []
+
+    def _before(conn, cursor, statement, *args):
+        seen.append(statement.lstrip().split()[0].upper())
+
+    event.listen(db.get_bind(), "before_cursor_execute", _before)
+    return seen, lambda: event.remove(db.get_bind(), "before_cursor_execute", _before)
+
+
+def test_bulk_status_reports_every_id_and_updates_in_one_statement(client, escalations):
+    seen, stop = _statements(escalations)
+    try:
+        res = client.patch(
+            "/government/escalations/status", json={"ids": [1, 2, 3, 4, 99, 1], "status": "resolved"},
+        )
+    finally:
+        stop()
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["updated"] == 2
+    assert [(r["id"], r["outcome"], r["from_status"]) for r in body["results"]] == [
+        (1, "updated", "pending"),
+        (2, "updated", "in_review"),
+        (3, "unchanged", "resolved"),
+        (4, "invalid_transition", "rejected"),
+        (99, "not_found", None),
+    ]
+    assert seen.count("SELECT") == 1 and seen.count("UPDATE") == 1
+    assert _statuses(escalations) == {1: "resolved", 2: "resolved", 3: "resolved", 4: "rejected", 5: "pending"}
+
+
+def test_rows_changed_after_validation_are_reported_as_conflicts(client, escalations):
+    engine = escalations.get_bind()
+    raced = []
+
+    def _race(conn, cursor, statement, *args):
+        # Another reviewer rejects escalation 5 between our SELECT and UPDATE
+        if not raced and statement.lstrip().upper().startswith("UPDATE ESCALATIONS"):
+            raced.append(statement)
+            conn.connection.cursor().execute("UPDATE escalations SET status = 'rejected' WHERE id = 5")
+
+    event.listen(engine, "before_cursor_execute", _race)
+    try:
+        res = client.patch("/government/escalations/status", json={"ids": [1, 5], "status": "resolved"})
+    finally:
+        event.remove(engine, "before_cursor_execute", _race)
+
+    assert res.status_code == 200
+    assert res.json()["updated"] == 1
+    assert [(r["id"], r["outcome"]) for r in res.json()["results"]] == [(1, "updated"), (5, "conflict")]
+    assert _statuses(escalations)[5] == "rejected"
+
+
+def test_bulk_status_validates_the_request(client, escalations):
+    assert client.patch("/government/escalations/status", json={"ids": [], "status": "resolved"}).status_code == 422
+    assert client.patch("/government/escalations/status", json={"ids": [1], "status": "closed"}).status_code == 422
+    assert _statuses(escalations) == STATUSES
+
+
+def test_rows_another_request_moved_to_the_target_are_not_claimed(client, escalations, monkeypatch):
+    audited = []
+    monkeypatch.setattr(governmentroutes.audit_log, "record", lambda *a, **kw: audited.append(kw))
+    engine = escalations.get_bind()
+    raced = []
+
+    def _race(conn, cursor, statement, *args):
+        # Another reviewer resolves escalation 5 between our SELECT and UPDATE
+        if not raced and statement.lstrip().upper().startswith("UPDATE ESCALATIONS"):
+            raced.append(statement)
+            conn.connection.cursor().execute("UPDATE escalations SET status = 'resolved' WHERE id = 5")
+
+    event.listen(engine, "before_cursor_execute", _race)
+    try:
+        res = client.patch("/government/escalations/status", json={"ids": [1, 5], "status": "resolved"})
+    finally:
+        event.remove(engine, "before_cursor_execute", _race)
+
+    # Which of the two resolved rows is ours cannot be told apart: nothing is claimed
+    assert res.json()["updated"] == 0
+    assert [(r["id"], r["outcome"]) for r in res.json()["results"]] == [(1, "conflict"), (5, "conflict")]
+    assert audited == []
+
+
+def test_single_status_change_follows_the_same_transitions(client, escalations, monkeypatch):
+    audited = []
+    monkeypatch.setattr(governmentroutes.audit_log, "record", lambda *a, **kw: audited.append(kw))
+
+    res = client.patch("/government/escalations/3/status", params={"new_status": "pending"})
+    assert res.status_code == 409 and "resolved" in res.json()["detail"]
+    assert client.patch("/government/escalations/3/status", params={"new_status": "resolved"}).status_code == 200
+    assert audited == []
+
+    assert client.patch("/government/escalations/3/status", params={"new_status": "in_review"}).json()["status"] == "in_review"
+    assert [(a["from_status"], a["to_status"]) for a in audited] == [("resolved", "in_review")]
+    assert _statuses(escalations)[3] == "in_review"
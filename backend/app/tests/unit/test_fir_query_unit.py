@@ -0,0 +1,97 @@
+# backend/app/tests/unit/test_fir_query_unit.py
+from datetime import date, time
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.firregistation import FirRegistration, closedFir
+from app.services.fir_query import FirFilters, decode_cursor, encode_cursor, plan
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+GOVERNMENT = {"Authorization": "Bearer " + create_access_token({"government_member_id": 7})}
+FIR = dict(
+    fullname="p", age=30, gender="M", contact_number="1", id_proof_type="Aadhar", incident_time=time(10, 0),
+    incident_location="x", case_narrative="n",
+)
+
+
+@pytest.fixture
+def firs(sqlite_db):
+    rows = [
+        dict(
+            FIR, id=f"F{i:02d}", Stationid=5 if i % 2 else 6, offence_type="Theft" if i % 3 else "Assault",
+            address=f"Ward {i % 4}", member_id=1 + i % 3, assigned_member_id=2 if i % 5 == 0 else None,
+            # Several FIRs share a date, so paging has to break ties on id
+            incident_date=date(2025, 1, 1 + i // 3),
+        )
+        for i in range(30)
+    ]
+    sqlite_db.execute(insert(FirRegistration), rows)
+    sqlite_db.execute(insert(closedFir), [
+        dict(FIR, fir_id=r["id"], address=r["address"], offence_type=r["offence_type"],
+             incident_date=r["incident_date"], Stationid=r["Stationid"], member_id=r["member_id"])
+        for r in rows if int(r["id"][1:]) % 4 == 0
+    ])
+    sqlite_db.commit()
+    return rows
+
+
+def _all_pages(client, headers=POLICE, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        res = client.get("/fir/query", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert res.status_code == 200, res.text
+        ids += [r["fir_id"] for r in res.json()["items"]]
+        pages += 1
+        cursor = res.json()["next_cursor"]
+        if not cursor:
+            return ids, pages
+
+
+def _expected(rows, newest_first=True, **match):
+    picked = [r for r in rows if all(match_fn(r) for match_fn in match.values())]
+    picked.sort(key=lambda r: (r["incident_date"], r["id"]), reverse=newest_first)
+    return [r["id"] for r in picked]
+
+
+def test_keyset_pages_cover_every_match_once_in_order(client, firs):
+    ids, pages = _all_pages(client, limit=4)
+    assert ids == _expected(firs) and pages == 8
+
+    ids, _ = _all_pages(client, limit=3, sort="oldest", station_id=5, offence_type="Theft")
+    assert ids == _expected(
+        firs, newest_first=False, station=lambda r: r["Stationid"] == 5, offence=lambda r: r["offence_type"] == "Theft",
+    )
+
+
+def test_filters_combine(client, firs):
+    ids, _ = _all_pages(
+        client, headers=GOVERNMENT, limit=2, status="active", region="Ward 1", member_id=2,
+        date_from="2025-01-02", date_to="2025-01-09",
+    )
+    assert ids == _expected(
+        firs,
+        active=lambda r: int(r["id"][1:]) % 4 != 0,
+        region=lambda r: "Ward 1" in r["address"],
+        member=lambda r: r["member_id"] == 2,
+        dates=lambda r: date(2025, 1, 2) <= r["incident_date"] <= date(2025, 1, 9),
+    )
+
+    res = client.get("/fir/query", params={"assigned_member_id": 2, "status": "closed"}, headers=POLICE)
+    assert [(r["fir_id"], r["status"], r["assigned_member_id"]) for r in res.json()["items"]] == [
+        ("F20", "closed", 2), ("F00", "closed", 2),
+    ]
+
+
+def test_rejects_bad_cursor_and_missing_token(client, firs):
+    assert client.get("/fir/query", params={"cursor": "not-a-cursor"}, headers=POLICE).status_code == 400
+    assert client.get("/fir/query").status_code == 401
+
+
+def test_planner_prefers_the_longest_matching_prefix():
+    both = plan(FirFilters(station_id=5, offence_type="Theft", member_id=2, region="Ward"))
+    assert (both.index, both.residual) == ("ix_fir_station_offence_date", ["member_id", "region"])
+    assert plan(FirFilters(station_id=5, member_id=2)).index == "ix_fir_member_date"
+    assert plan(FirFilters(status="closed")).index == "ix_fir_date"
+    assert decode_cursor(encode_cursor(date(2025, 1, 2), "F07")) == (date(2025, 1, 2), "F07")
@@ -43,7 +43,7 @@ def test_get_progress_404_when_fir_missing(client, override_db, db_mock):
 def test_get_progress_returns_records(client, override_db, db_mock):
     override_db()
     # FIR exists
-    db_mock.query.return_value.first.return_value = SimpleNamespace(id="F1")
+    db_mock.query.return_value.first.return_value = SimpleNamespace(id="F1", version=1, updated_at=None)
 
     # Records must satisfy FIRProgress schema fields (not MagicMocks)
     rec1 = SimpleNamespace(
@@ -84,3 +84,110 @@ def test_list_all_firs_unauthorized(client, override_db, db_mock):
     assert res.status_code == 401
     # When no Authorization header is present, OAuth2PasswordBearer yields:
     assert res.json()["detail"] == "Not authenticated"
+
+
+def test_list_by_station_date_bounds(client, sqlite_db, dep_override):
+    from datetime import date, time
+    from app.models.firregistation import FirRegistration
+
+    dep_override(get_current_police, lambda: {"id": 1, "name": "Raj", "station_id": 5})
+    for i, d in enumerate([date(2023, 6, 1), date(2024, 6, 1), date(2025, 6, 1)]):
+        sqlite_db.add(FirRegistration(
+            id=f"F{i}", fullname="John", age=30, gender="M", address="a", contact_number="1",
+            id_proof_type="Aadhar", id_proof_value="A1", incident_date=d, incident_time=time(10, 0),
+            offence_type="Theft", incident_location="Market", case_narrative="n", Stationid=5,
+        ))
+    sqlite_db.commit()
+
+    res = client.get("/fir/list_by_station", params={"date_from": "2024-01-01", "date_to": "2024-12-31"})
+    assert [f["fir_id"] for f in res.json()["all"]] == ["F1"]
+    assert len(client.get("/fir/list_by_station").json()["all"]) == 3
+
+
+def test_add_progress_batch_single_transaction(client, sqlite_db, dep_override):
+    from datetime import date, time
+    from sqlalchemy import event
+    from app.models.firregistation import FirRegistration, FIRProgress, Culprit
+    from app.models.outbox import OutboxEvent
+
+    dep_override(get_current_police, lambda: {"id": 1, "name": "Raj", "station_id": 5})
+    for fid, station in (("F1", 5), ("F2", 6)):
+        sqlite_db.add(FirRegistration(
+            id=fid, fullname="John", age=30, gender="M", address="a", contact_number="1",
+            id_proof_type="Aadhar", incident_date=date(2025, 1, 1), incident_time=time(10, 0),
+            offence_type="Theft", incident_location="Market", case_narrative="n", Stationid=station,
+        ))
+    sqlite_db.commit()
+
+    commits = []
+    event.listen(sqlite_db, "after_commit", lambda s: commits.append(1))
+    res = client.post("/fir/add_progress_batch", json={
+        "progress": [
+            {"fir_id": "F1", "progress_text": "witness examined", "witness_info": "shopkeeper"},
+            {"fir_id": "F2", "progress_text": "suspect seen", "culprit": {"name": "Ravi", "custody_status": "absconding"}},
+            {"fir_id": "F1", "progress_text": "CCTV collected"},
+        ],
+        "culprits": [{"fir_id": "F1", "name": "Mohan"}],
+    })
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert len(body["progress_ids"]) == 3 and len(body["culprit_ids"]) == 1
+    assert body["progress_culprit_ids"][0] is None and body["progress_culprit_ids"][2] is None
+    assert len(commits) == 1
+
+    ravi = sqlite_db.get(Culprit, body["progress_culprit_ids"][1])
+    assert (ravi.name, ravi.station_id) == ("Ravi", 6)
+    assert sqlite_db.get(Culprit, body["culprit_ids"][0]).fir_id == "F1"
+    assert sqlite_db.query(FIRProgress).filter(FIRProgress.fir_id == "F1").count() == 2
+    assert sqlite_db.query(OutboxEvent).filter(OutboxEvent.topic == "fir.progress_added").count() == 3
+
+    # One unknown FIR rejects the whole batch
+    res = client.post("/fir/add_progress_batch", json={
+        "progress": [{"fir_id": "F1", "progress_text": "x"}, {"fir_id": "NOPE", "progress_text": "y"}],
+    })
+    assert res.status_code == 404 and res.json()["detail"] == "FIR not found: NOPE"
+    assert sqlite_db.query(FIRProgress).count() == 3
+    assert client.post("/fir/add_progress_batch", json={}).status_code == 422
+
+
+def test_conditional_requests_on_fir_detail_and_lists(client, sqlite_db, dep_override):
+    from app.utils.security import create_access_token
+
+    police = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+    res = client.post("/fir/register_incident", headers=police, json={
+        "fullname": "John", "age": 30, "gender": "M", "address": "a", "contact_number": "1",
+        "id_proof_type": "Aadhar", "incident_date": "2025-01-01", "incident_time": "10:00",
+        "offence_type": "Theft", "incident_location": "Market", "case_narrative": "bag stolen",
+    })
+    fir_id = res.json()["report_id"]
+
+    def revalidate(method, path, etag, **kwargs):
+        return getattr(client, method)(path, headers={**police, "If-None-Match": etag}, **kwargs)
+
+    detail = client.get(f"/fir/detail/{fir_id}", headers=police)
+    details = client.get("/fir/details", params={"fir_id": fir_id})
+    progress = client.post("/fir/get_progress", json={"fir_id": fir_id})
+    station = client.get("/fir/list_by_station", headers=police)
+    for r in (detail, details, progress, station):
+        assert r.status_code == 200 and r.headers["etag"] and r.headers["last-modified"]
+
+    assert revalidate("get", f"/fir/detail/{fir_id}", detail.headers["etag"]).status_code == 304
+    assert revalidate("get", "/fir/details", details.headers["etag"], params={"fir_id": fir_id}).status_code == 304
+    assert revalidate("post", "/fir/get_progress", progress.headers["etag"], json={"fir_id": fir_id}).status_code == 304
+    assert revalidate("get", "/fir/list_by_station", station.headers["etag"]).status_code == 304
+    since = client.get(
+        "/fir/details", params={"fir_id": fir_id}, headers={"If-Modified-Since": details.headers["last-modified"]}
+    )
+    assert since.status_code == 304
+
+    # add_progress invalidates the FIR but not the station list
+    client.post("/fir/add_progress", headers=police, json={"fir_id": fir_id, "progress_text": "CCTV checked"})
+    changed = revalidate("get", f"/fir/detail/{fir_id}", detail.headers["etag"])
+    assert changed.status_code == 200 and len(changed.json()["progress"]) == 1
+    assert revalidate("post", "/fir/get_progress", progress.headers["etag"], json={"fir_id": fir_id}).status_code == 200
+    assert revalidate("get", "/fir/list_by_station", station.headers["etag"]).status_code == 304
+
+    # closing changes both
+    client.post("/fir/close_fir", headers=police, json={"fir_id": fir_id})
+    assert revalidate("get", "/fir/list_by_station", station.headers["etag"]).status_code == 200
+    assert revalidate("get", f"/fir/detail/{fir_id}", changed.headers["etag"]).status_code == 200
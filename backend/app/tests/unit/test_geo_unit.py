@@ -0,0 +1,82 @@
+# backend/app/tests/unit/test_geo_unit.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.api.routes.firroutes import get_current_police
+from app.models.firregistation import FirRegistration
+from app.services import geo
+
+
+def test_geohash_encode_and_cover():
+    assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    cells = geo.cover(*geo.radius_bbox(12.97, 77.59, 2.0))
+    assert len(cells) <= geo.MAX_COVER_CELLS
+    # the centre point falls inside one of the covering cells
+    assert any(geo.encode(12.97, 77.59).startswith(c) for c in cells)
+
+
+def test_gazetteer_matches_longest_place_name(tmp_path):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text("name,latitude,longitude,aliases\nMarket,1,1\nDowntown Market,12.97,77.59,DT Market|Main Bazaar\n")
+    g = geo.Gazetteer()
+    assert g.load(str(path)) == 4
+    assert g.geocode("near Downtown Market, gate 2") == (12.97, 77.59)
+    assert g.geocode("main bazaar") == (12.97, 77.59)
+    assert g.geocode("fish market") == (1.0, 1.0)
+    assert g.geocode("somewhere else") is None
+
+
+@pytest.fixture
+def gazetteer(monkeypatch):
+    g = geo.Gazetteer()
+    g._loaded = True
+    g.add("Downtown Market", 12.9716, 77.5946)
+    g.add("Lake View", 12.9900, 77.5946)   # ~2.1 km north
+    g.add("Airport", 13.1986, 77.7066)     # ~28 km away
+    monkeypatch.setattr(geo, "gazetteer", g)
+    return g
+
+
+def _register(client, location, incident_date, **coords):
+    payload = {
+        "fullname": "John Doe", "age": 30, "gender": "M", "address": "addr", "contact_number": "1",
+        "id_proof_type": "Aadhar", "incident_date": incident_date.isoformat(), "incident_time": "10:00",
+        "offence_type": "Theft", "incident_location": location, "case_narrative": "desc", **coords,
+    }
+    res = client.post("/fir/register_incident", json=payload)
+    assert res.status_code == 200, res.text
+    return res.json()["report_id"]
+
+
+def test_nearby_and_within(client, sqlite_db, dep_override, gazetteer):
+    dep_override(get_current_police, lambda: {"id": 1, "name": "A", "station_id": 1})
+    today = date.today()
+    market = _register(client, "Downtown Market, gate 2", today - timedelta(days=3))
+    lake = _register(client, "Lake View road", today - timedelta(days=5))
+    _register(client, "Airport terminal", today)
+    old = _register(client, "Downtown Market", today - timedelta(days=90))
+    explicit = _register(client, "unknown lane", today, latitude=12.9720, longitude=77.5950)
+    unknown = _register(client, "unknown lane", today)
+
+    assert sqlite_db.get(FirRegistration, unknown).geo_cell is None
+    assert sqlite_db.get(FirRegistration, market).geo_cell == geo.encode(12.9716, 77.5946)
+
+    res = client.get("/fir/nearby", params={"lat": 12.9716, "lon": 77.5946, "radius_km": 2, "days": 30})
+    assert res.status_code == 200
+    rows = res.json()
+    assert [r["fir_id"] for r in rows] == [market, explicit]
+    assert rows[0]["distance_km"] == 0
+
+    wider = client.get("/fir/nearby", params={"lat": 12.9716, "lon": 77.5946, "radius_km": 3}).json()
+    assert {r["fir_id"] for r in wider} == {market, explicit, lake, old}
+
+    box = client.get(
+        "/fir/within",
+        params={"min_lat": 12.96, "min_lon": 77.58, "max_lat": 13.0, "max_lon": 77.6,
+                "date_from": (today - timedelta(days=30)).isoformat()},
+    ).json()
+    assert {r["fir_id"] for r in box} == {market, explicit, lake}
+
+    reversed_box = client.get("/fir/within", params={"min_lat": 13, "min_lon": 77, "max_lat": 12, "max_lon": 78})
+    assert reversed_box.status_code == 422
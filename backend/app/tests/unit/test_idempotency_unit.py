@@ -0,0 +1,140 @@
+# backend/app/tests/unit/test_idempotency_unit.py
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.idempotency import IdempotencyStore, idempotency_store
+from app.models.citizen import citizen
+from app.models.firregistation import FirRegistration
+from app.models.idempotency import IdempotencyRecord
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "A", "station_id": 1})}
+FIR = {
+    "fullname": "John", "age": 30, "gender": "M", "address": "a", "contact_number": "1",
+    "id_proof_type": "Aadhar", "incident_date": "2025-01-01", "incident_time": "10:00",
+    "offence_type": "Theft", "incident_location": "Market", "case_narrative": "bag stolen",
+}
+
+
+@pytest.fixture
+def store(sqlite_db, monkeypatch):
+    monkeypatch.setattr(idempotency_store, "session_factory", sessionmaker(bind=sqlite_db.get_bind()))
+    idempotency_store.clear()
+    yield idempotency_store
+    idempotency_store.clear()
+
+
+def test_retry_replays_original_response(client, sqlite_db, store):
+    headers = {**POLICE, "Idempotency-Key": "k-1"}
+    first = client.post("/fir/register_incident", json=FIR, headers=headers)
+    retry = client.post("/fir/register_incident", json=FIR, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert sqlite_db.query(FirRegistration).count() == 1
+
+    # The stored copy serves retries that miss the in-memory cache (other workers)
+    store.clear()
+    again = client.post("/fir/register_incident", json=FIR, headers=headers)
+    assert again.json()["report_id"] == first.json()["report_id"]
+    assert sqlite_db.query(FirRegistration).count() == 1
+
+    # Without a key, or with a new one, the request runs again
+    client.post("/fir/register_incident", json=FIR, headers=POLICE)
+    client.post("/fir/register_incident", json=FIR, headers={**POLICE, "Idempotency-Key": "k-2"})
+    assert sqlite_db.query(FirRegistration).count() == 3
+
+
+def test_key_reused_with_different_body_is_rejected(client, store):
+    headers = {"Idempotency-Key": "citizen-1"}
+    assert client.post("/citizen/addcitizen", json={"aadhar_no": "111111111111", "password": "p"}, headers=headers).status_code == 200
+    res = client.post("/citizen/addcitizen", json={"aadhar_no": "222222222222", "password": "p"}, headers=headers)
+    assert res.status_code == 422
+
+
+def test_error_responses_are_stored_but_5xx_released(client, sqlite_db, store):
+    headers = {**POLICE, "Idempotency-Key": "p-1"}
+    missing = client.post("/fir/add_progress", json={"fir_id": "NOPE"}, headers=headers)
+    assert missing.status_code == 404
+    assert client.post("/fir/add_progress", json={"fir_id": "NOPE"}, headers=headers).headers["idempotent-replayed"]
+
+    store.release("never-claimed")  # no-op
+    assert sqlite_db.query(IdempotencyRecord).filter(IdempotencyRecord.status == "in_progress").count() == 0
+
+
+def test_duplicate_waits_for_the_in_flight_original(client, sqlite_db, store):
+    # Another worker holds the claim; the duplicate polls until it completes
+    headers = {"Idempotency-Key": "slow"}
+    body = {"aadhar_no": "999999999999", "password": "p"}
+    client.post("/citizen/addcitizen", json=body, headers=headers)
+    rec = sqlite_db.query(IdempotencyRecord).one()
+    stored = (rec.status_code, rec.content_type, rec.body)
+    rec.status, rec.status_code, rec.body = "in_progress", None, None
+    sqlite_db.commit()
+    store.clear()
+
+    def finish():
+        time.sleep(0.3)
+        store.complete(rec.scope_hash, (stored[0], stored[1], stored[2].encode()))
+
+    t = threading.Thread(target=finish)
+    t.start()
+    started = time.monotonic()
+    res = client.post("/citizen/addcitizen", json=body, headers=headers)
+    t.join()
+    assert time.monotonic() - started >= 0.25
+    assert res.status_code == 200 and res.headers["idempotent-replayed"] == "true"
+    assert sqlite_db.query(citizen).count() == 1
+
+
+def test_memory_cache_ttl_and_size():
+    s = IdempotencyStore(ttl=60, cache_size=2)
+    for k in ("a", "b", "c"):
+        s.remember(k, "h", (200, "application/json", b"{}"))
+    assert s.cached("a") is None and s.cached("c")
+    s.ttl = -1
+    s.remember("d", "h", (200, "application/json", b"{}"))
+    assert s.cached("d") is None
+
+
+def test_purge_expired(sqlite_db, store):
+    now = datetime.utcnow()
+    sqlite_db.add_all([
+        IdempotencyRecord(scope_hash=f"s{i}", request_hash="h", status="done",
+                          expires_at=now + timedelta(seconds=-10 if i % 2 else 10))
+        for i in range(6)
+    ])
+    sqlite_db.commit()
+    assert store.purge_expired(batch_size=2) == 3
+    assert sqlite_db.query(IdempotencyRecord).count() == 3
+
+
+def test_retry_with_refreshed_token_is_the_same_caller(client, sqlite_db, store):
+    body = {**FIR, "case_narrative": "retried after a token refresh"}
+    first = client.post("/fir/register_incident", json=body, headers={**POLICE, "Idempotency-Key": "r-1"})
+    refreshed = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "A", "station_id": 1})}
+    assert refreshed != POLICE
+    retry = client.post("/fir/register_incident", json=body, headers={**refreshed, "Idempotency-Key": "r-1"})
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json()["report_id"] == first.json()["report_id"]
+    assert sqlite_db.query(FirRegistration).count() == 1
+
+    # Another officer with the same key is a different caller
+    other = {"Authorization": "Bearer " + create_access_token({"sub": "2", "name": "B", "station_id": 1})}
+    client.post("/fir/register_incident", json=body, headers={**other, "Idempotency-Key": "r-1"})
+    assert sqlite_db.query(FirRegistration).count() == 2
+
+
+def test_conflict_is_not_replayed(client, sqlite_db, store):
+    fir_id = client.post("/fir/register_incident", json=FIR, headers=POLICE).json()["report_id"]
+    headers = {**POLICE, "Idempotency-Key": "c-1"}
+    stale = {"fir_id": fir_id, "progress_text": "update", "expected_version": 99}
+    assert client.post("/fir/add_progress", json=stale, headers=headers).status_code == 409
+    # Same key, same body: runs again instead of replaying the stale 409
+    res = client.post("/fir/add_progress", json=stale, headers=headers)
+    assert res.status_code == 409 and "idempotent-replayed" not in res.headers
+    assert sqlite_db.query(IdempotencyRecord).count() == 0
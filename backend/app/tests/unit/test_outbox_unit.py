@@ -0,0 +1,123 @@
+# backend/app/tests/unit/test_outbox_unit.py
+import json
+import pathlib
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.outbox import OutboxEvent
+from app.services import outbox, outbox_worker
+from app.services.outbox import OutboxMetrics, OutboxWorkerPool, drain_once, enqueue, register_handler
+from app.utils.security import create_access_token
+
+
+def _factory(sqlite_db):
+    return sessionmaker(bind=sqlite_db.get_bind())
+
+
+def test_event_is_written_only_with_the_domain_commit(sqlite_db):
+    enqueue(sqlite_db, "test.rolled_back", {"n": 1})
+    sqlite_db.rollback()
+    assert sqlite_db.query(OutboxEvent).count() == 0
+
+    enqueue(sqlite_db, "test.committed", {"n": 2})
+    sqlite_db.commit()
+    evt = sqlite_db.query(OutboxEvent).one()
+    assert evt.topic == "test.committed" and json.loads(evt.payload) == {"n": 2}
+
+
+def test_register_incident_enqueues_in_same_transaction(client, sqlite_db):
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "A", "station_id": 3})}
+    res = client.post(
+        "/fir/register_incident",
+        json={
+            "fullname": "John", "age": 30, "gender": "M", "address": "a", "contact_number": "1",
+            "id_proof_type": "Aadhar", "id_proof_value": "A1", "incident_date": "2025-01-01",
+            "incident_time": "10:00", "offence_type": "Theft", "incident_location": "Market",
+            "case_narrative": "n",
+        },
+        headers=headers,
+    )
+    assert res.status_code == 200
+    evt = sqlite_db.query(OutboxEvent).one()
+    assert evt.topic == "fir.registered"
+    assert json.loads(evt.payload)["fir_id"] == res.json()["report_id"]
+
+
+def test_drain_delivers_and_retries_with_backoff(sqlite_db, monkeypatch):
+    calls = []
+
+    @register_handler("test.flaky")
+    def _flaky(payload, db):
+        calls.append(payload["n"])
+        if len(calls) == 1:
+            raise RuntimeError("downstream unavailable")
+
+    try:
+        enqueue(sqlite_db, "test.flaky", {"n": 7})
+        sqlite_db.commit()
+        metrics = OutboxMetrics()
+
+        assert drain_once(_factory(sqlite_db), metrics=metrics) == 1
+        sqlite_db.expire_all()
+        evt = sqlite_db.query(OutboxEvent).one()
+        assert evt.status == "pending" and evt.attempts == 1
+        assert evt.available_at > datetime.utcnow()
+        assert metrics.failed == 1
+
+        # Not due yet: nothing is claimed until the backoff elapses
+        assert drain_once(_factory(sqlite_db)) == 0
+        evt.available_at = datetime.utcnow() - timedelta(seconds=1)
+        sqlite_db.commit()
+
+        assert drain_once(_factory(sqlite_db), metrics=metrics) == 1
+        sqlite_db.expire_all()
+        assert sqlite_db.query(OutboxEvent).one().status == "done"
+        assert calls == [7, 7]
+        assert metrics.processed == 1
+    finally:
+        outbox._handlers.pop("test.flaky", None)
+
+
+def test_gives_up_after_max_attempts(sqlite_db, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 1)
+
+    @register_handler("test.broken")
+    def _broken(payload, db):
+        raise ValueError("bad payload")
+
+    try:
+        enqueue(sqlite_db, "test.broken", {})
+        sqlite_db.commit()
+        drain_once(_factory(sqlite_db))
+        sqlite_db.expire_all()
+        evt = sqlite_db.query(OutboxEvent).one()
+        assert evt.status == "dead"
+        assert "bad payload" in evt.last_error
+        assert OutboxWorkerPool().stats(sqlite_db)["dead"] == 1
+    finally:
+        outbox._handlers.pop("test.broken", None)
+
+
+def test_event_without_handler_is_not_marked_done(sqlite_db, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 1)
+    enqueue(sqlite_db, "test.unhandled", {})
+    sqlite_db.commit()
+    drain_once(_factory(sqlite_db))
+    sqlite_db.expire_all()
+    evt = sqlite_db.query(OutboxEvent).one()
+    assert evt.status == "dead" and "No handler" in evt.last_error
+
+
+def test_standalone_worker_loads_a_handler_for_every_topic():
+    outbox_worker.load_handlers()
+    app_dir = pathlib.Path(outbox.__file__).resolve().parents[1]
+    topics = {
+        m
+        for path in app_dir.rglob("*.py")
+        if "tests" not in path.parts
+        for m in re.findall(r"enqueue\(\s*db,\s*\"([\w.]+)\"", path.read_text())
+    }
+    assert {"fir.registered", "fir.assigned", "evidence.uploaded"} <= topics
+    assert [t for t in sorted(topics) if not outbox._handlers.get(t)] == []
@@ -0,0 +1,60 @@
+# backend/app/tests/unit/test_partitioning_unit.py
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from app.database import partitioning
+
+
+def test_partition_ddl_ranges_and_keys():
+    ddl = partitioning.partition_ddl(2023, 2025, station_subpartitions=4)
+    fir = ddl[1]
+    # Every unique key must hold every partitioning column (MySQL error 1503)
+    assert "PRIMARY KEY (`id`, `incident_date`, `Stationid`)" in ddl[0]
+    assert "RANGE COLUMNS(`incident_date`)" in fir
+    assert "SUBPARTITION BY HASH(`Stationid`) SUBPARTITIONS 4" in fir
+    assert "PARTITION p2025 VALUES LESS THAN ('2026-01-01')" in fir
+    assert fir.rstrip().endswith("PARTITION pmax VALUES LESS THAN (MAXVALUE)\n)")
+    plain = partitioning.partition_ddl(2023, 2025)
+    assert "SUBPARTITION" not in plain[1]
+    assert "PRIMARY KEY (`id`, `incident_date`)" in plain[0]
+
+
+def test_detach_exchanges_every_leaf_then_drops():
+    plain = partitioning.detach_ddl("Fir_Registration", "p2016")
+    assert "EXCHANGE PARTITION `p2016` WITH TABLE `Fir_Registration_p2016`" in plain[2]
+    assert plain[-1] == "ALTER TABLE `Fir_Registration` DROP PARTITION `p2016`"
+
+    sub = partitioning.detach_ddl("Fir_Registration", "p2016", subpartitions=2)
+    assert sum("EXCHANGE PARTITION" in s for s in sub) == 2
+    assert "`p2016sp1`" in sub[5]
+
+
+def test_noop_outside_mysql():
+    engine = create_engine("sqlite://")
+    assert partitioning.migrate(engine, 2020) == []
+    assert partitioning.add_year(engine, 2030) == []
+    assert partitioning.detach(engine, "Fir_Registration", "p2020") == []
+
+
+def test_foreign_keys_to_partitioned_tables_are_left_out(monkeypatch):
+    metadata = MetaData()
+    Table("Fir_Registration", metadata, Column("id", String(36), primary_key=True))
+    Table("station_notes", metadata, Column("id", Integer, primary_key=True))
+    added_later = Table(
+        "fir_signatures", metadata,
+        Column("fir_id", String(36), ForeignKey("Fir_Registration.id"), primary_key=True),
+        Column("note_id", Integer, ForeignKey("station_notes.id")),
+    )
+    engine = create_engine("sqlite://")
+
+    # Not partitioned: nothing changes
+    assert partitioning.guard_foreign_keys(metadata, engine) == 0
+
+    monkeypatch.setattr(partitioning, "partitioned_tables", lambda engine: {"Fir_Registration"})
+    assert partitioning.guard_foreign_keys(metadata, engine) == 1
+    ddl = str(CreateTable(added_later).compile(dialect=mysql.dialect()))
+    assert "REFERENCES `Fir_Registration`" not in ddl
+    assert "REFERENCES station_notes" in ddl
+    # Still known to the metadata, so relationships can join on it
+    assert len(added_later.foreign_keys) == 2
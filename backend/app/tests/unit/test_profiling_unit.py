@@ -0,0 +1,98 @@
+# backend/app/tests/unit/test_profiling_unit.py
+import logging
+import threading
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import ProfilingMiddleware, by_package, collapsed, top_frames
+from app.services import dedup
+
+# Enough shingles to keep dedup.signature (app code) busy for a while
+NARRATIVE = " ".join(f"word{i}" for i in range(1500))
+
+
+def _app(tmp_path, **kwargs):
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow():
+        return {"n": len(dedup.signature(NARRATIVE))}
+
+    app.add_middleware(ProfilingMiddleware, directory=str(tmp_path), interval_ms=1, **kwargs)
+    return app
+
+
+def test_header_selects_request_and_writes_folded_profile(tmp_path, caplog):
+    client = TestClient(_app(tmp_path, token="s3cret", sample_rate=0))
+
+    with caplog.at_level(logging.INFO, logger="app.profiling"):
+        res = client.get("/slow", headers={"X-Profile": "s3cret"})
+
+    assert res.status_code == 200
+    profile_id = res.headers["x-profile-id"]
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1 and profile_id in files[0].name and files[0].suffix == ".folded"
+    lines = files[0].read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("signature (app/services/dedup.py" in line for line in lines)
+    assert profile_id in caplog.text and "top frames" in caplog.text
+
+
+def test_unselected_requests_are_not_profiled(tmp_path):
+    client = TestClient(_app(tmp_path, token="s3cret", sample_rate=0))
+
+    assert "x-profile-id" not in client.get("/slow").headers
+    assert "x-profile-id" not in client.get("/slow", headers={"X-Profile": "wrong"}).headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sample_rate_selects_without_header(tmp_path):
+    client = TestClient(_app(tmp_path, token="", sample_rate=1.0))
+
+    assert "x-profile-id" in client.get("/slow").headers
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_summaries():
+    counts = Counter({
+        "main (app/main.py:1);decode (jose/jwt.py:10)": 3,
+        "main (app/main.py:1);execute (sqlalchemy/engine/base.py:5)": 1,
+    })
+
+    assert top_frames(counts)[0] == ("decode (jose/jwt.py:10)", 75.0, 75.0)
+    assert ("main (app/main.py:1)", 0.0, 100.0) not in top_frames(counts)  # no self time
+    assert by_package(counts) == [("jose", 75.0), ("sqlalchemy", 25.0)]
+    assert collapsed(counts).splitlines()[0].endswith(" 3")
+
+
+
+def test_only_request_threads_are_sampled(monkeypatch):
+    # Count this module as app code, so its parked threads look like the
+    # outbox/audit threads waiting in Event.wait inside app modules
+    monkeypatch.setattr(profiling, "_TESTS_DIR", "/nonexistent")
+    stop = threading.Event()
+
+    def parked():
+        stop.wait(5)
+
+    threads = [
+        threading.Thread(target=parked, name=name, daemon=True)
+        for name in ("outbox-0", "audit-writer", profiling.THREADPOOL_NAME)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        sampler = profiling.Sampler(0.001, loop_thread=threading.get_ident())
+        sampler.sample()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    # This thread (the "loop") and the threadpool worker, not the background threads
+    assert sum(sampler.counts.values()) == 2
+    assert any("test_only_request_threads_are_sampled" in stack for stack in sampler.counts)
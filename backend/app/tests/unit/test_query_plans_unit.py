@@ -0,0 +1,215 @@
+# backend/app/tests/unit/test_query_plans_unit.py
+#
+# Every SELECT a hot-path route issues must be served by an index: no full
+# table scans and no filesorts. Routes are exercised end to end against a
+# seeded SQLite database, their SQL is captured from cursor events and each
+# statement is run through EXPLAIN QUERY PLAN.
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.database.explain import explain, plan_problems
+from app.database.migrations import apply_column_migrations, apply_index_migrations
+from app.models.citizen import citizen
+from app.models.firregistation import FirRegistration, FIRProgress, Culprit, closedFir
+from app.models.government import Escalation
+from app.models.policemember import PoliceMember
+from app.services import fir_query
+from app.utils.security import create_access_token
+
+AADHAAR = "123456789012"
+
+
+def _seed(db):
+    fir_row = dict(
+        age=30, gender="M", contact_number="1", id_proof_type="Aadhar", incident_time=time(10, 0),
+        offence_type="Theft", incident_location="Market", case_narrative="n",
+    )
+    db.execute(insert(PoliceMember), [
+        {"name": f"Officer {i}", "password": "pw", "station_id": i % 4} for i in range(1, 21)
+    ])
+    db.execute(insert(citizen), [
+        {"aadhar_no": f"{100000000000 + i}", "password": "pw"} for i in range(500)
+    ] + [{"aadhar_no": AADHAAR, "password": "pw"}])
+    db.execute(insert(FirRegistration), [
+        dict(
+            fir_row, id=f"F{i:04d}", fullname=f"Person {i}", address=f"Ward {i % 7}",
+            id_proof_value=AADHAAR if i % 250 == 0 else f"{200000000000 + i}",
+            incident_date=date(2025, 1 + i % 12, 1 + i % 28), Stationid=i % 4, member_id=1 + i % 20,
+            assigned_member_id=1 + i % 20 if i % 3 == 0 else None,
+        )
+        for i in range(2000)
+    ])
+    db.execute(insert(FIRProgress), [{"fir_id": f"F{i:04d}", "progress_text": "p"} for i in range(0, 2000, 2)])
+    db.execute(insert(Culprit), [
+        {"fir_id": f"F{i:04d}", "station_id": i % 4, "name": f"C{i}"} for i in range(0, 2000, 2)
+    ])
+    db.execute(insert(Escalation), [
+        {"fir_id": f"F{i:04d}", "aadhar_no": AADHAAR, "reason": "Delay", "status": "pending"}
+        for i in range(0, 2000, 2)
+    ])
+    db.execute(insert(closedFir), [
+        dict(
+            fir_row, fir_id=f"F{i:04d}", fullname="x", address="a", id_proof_value=AADHAAR,
+            incident_date=date(2025, 1, 1), Stationid=1,
+        )
+        for i in range(5, 2000, 10)
+    ])
+    db.commit()
+    db.connection().exec_driver_sql("ANALYZE")
+
+
+def _bearer(claims):
+    return {"Authorization": "Bearer " + create_access_token(claims)}
+
+
+POLICE = {"sub": "1", "name": "Officer 1", "station_id": 1}
+CITIZEN = {"citizen_id": 51, "aadhar_no": AADHAAR}
+GOVERNMENT = {"government_member_id": 7}
+
+# (method, path, request kwargs, claims)
+HOT_ROUTES = [
+    ("post", "/citizen/citizenAuth", {"json": {"aadhar_no": AADHAAR, "password": "pw"}}, None),
+    ("get", "/citizen/dashboard", {}, CITIZEN),
+    ("post", "/citizen/escalatefir", {"json": {"fir_id": "F0500", "reason": "Delay"}}, CITIZEN),
+    ("post", "/policeauth/policeauth", {"json": {"member_id": 1, "station_id": 1, "password": "pw"}}, None),
+    ("get", "/policeauth/allmembers", {}, POLICE),
+    ("get", "/fir/list_by_station", {}, POLICE),
+    ("get", "/fir/list_by_station", {"params": {"date_from": "2025-03-01", "date_to": "2025-05-31"}}, POLICE),
+    ("get", "/fir/list_by_aadhar", {}, CITIZEN),
+    ("get", "/fir/nearby", {"params": {"lat": 12.97, "lon": 77.59, "radius_km": 2, "days": 30}}, POLICE),
+    ("get", "/fir/within", {"params": {"min_lat": 12.9, "min_lon": 77.5, "max_lat": 13.0, "max_lon": 77.6}}, POLICE),
+    ("get", "/fir/detail/F0500", {}, CITIZEN),
+    ("get", "/fir/details", {"params": {"fir_id": "F0500"}}, POLICE),
+    ("post", "/fir/get_progress", {"json": {"fir_id": "F0500"}}, POLICE),
+    ("post", "/fir/add_progress", {"json": {"fir_id": "F0500", "progress_text": "x", "culprit": {"name": "Y"}}}, POLICE),
+    ("post", "/fir/close_fir", {"json": {"fir_id": "F0100"}}, POLICE),
+    ("get", "/government/escalations", {"params": {"status": "pending"}}, GOVERNMENT),
+    ("patch", "/government/escalations/1/status", {"params": {"new_status": "in_review"}}, GOVERNMENT),
+    ("post", "/government/escalatefir/lookup", {"json": {"fir_id": "F0500"}}, GOVERNMENT),
+]
+
+# Deliberately unindexed: full listings and substring (LIKE '%q%') search.
+SCAN_ALLOWED = {"/fir/list", "/fir/search", "/government/governmentsearchfir"}
+
+
+@pytest.fixture
+def seeded(sqlite_db):
+    _seed(sqlite_db)
+    return sqlite_db
+
+
+def _capture(db):
+    engine = db.get_bind()
+    seen = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    return engine, seen, lambda: event.remove(engine, "before_cursor_execute", _before)
+
+
+@pytest.mark.parametrize("method,path,kwargs,claims", HOT_ROUTES, ids=[f"{m} {p}" for m, p, _, _ in HOT_ROUTES])
+def test_hot_route_queries_use_indexes(client, seeded, method, path, kwargs, claims):
+    assert path not in SCAN_ALLOWED
+    engine, seen, stop = _capture(seeded)
+    try:
+        headers = _bearer(claims) if claims else {}
+        res = getattr(client, method)(path, headers=headers, **kwargs)
+    finally:
+        stop()
+    assert res.status_code < 400, res.text
+    assert seen, f"{path} issued no SELECT"
+
+    failures = []
+    with engine.connect() as conn:
+        for statement, parameters in seen:
+            problems = plan_problems(engine.dialect.name, explain(conn, statement, parameters))
+            if problems:
+                failures.append(f"{statement}\n  -> {problems}")
+    assert not failures, f"{path}:\n" + "\n".join(failures)
+
+
+# /fir/query filter combinations and the index the planner maps each onto
+QUERY_COMBOS = [
+    ({}, "ix_fir_date"),
+    ({"station_id": 1}, "ix_fir_station_date"),
+    ({"station_id": 2, "date_from": "2025-03-01", "date_to": "2025-05-31"}, "ix_fir_station_date"),
+    ({"station_id": 1, "status": "active"}, "ix_fir_station_date"),
+    ({"station_id": 1, "offence_type": "Theft"}, "ix_fir_station_offence_date"),
+    ({"offence_type": "Theft", "status": "closed"}, "ix_fir_offence_date"),
+    ({"member_id": 3}, "ix_fir_member_date"),
+    ({"station_id": 2, "member_id": 3, "sort": "oldest"}, "ix_fir_member_date"),
+    ({"assigned_member_id": 3}, "ix_fir_assignee"),
+    ({"region": "Ward 3"}, "ix_fir_date"),
+]
+
+
+@pytest.mark.parametrize("params,index", QUERY_COMBOS, ids=[str(p) for p, _ in QUERY_COMBOS])
+def test_fir_query_plans_follow_the_planner(client, seeded, params, index):
+    """First and second page both walk the planned index in order: no sort, no other index."""
+    filters = fir_query.FirFilters(**{k: v for k, v in params.items() if k != "sort" and "date" not in k})
+    assert fir_query.plan(filters).index == index
+
+    engine, seen, stop = _capture(seeded)
+    try:
+        first = client.get("/fir/query", params={**params, "limit": 5}, headers=_bearer(POLICE))
+        assert first.status_code == 200, first.text
+        cursor = first.json()["next_cursor"]
+        assert cursor
+        assert client.get(
+            "/fir/query", params={**params, "limit": 5, "cursor": cursor}, headers=_bearer(POLICE)
+        ).status_code == 200
+    finally:
+        stop()
+
+    pages = [(st, p) for st, p in seen if "FROM \"Fir_Registration\"" in st]
+    assert len(pages) == 2
+    with engine.connect() as conn:
+        for statement, parameters in pages:
+            plan = explain(conn, statement, parameters)
+            details = [row["detail"] for row in plan]
+            assert f"USING INDEX {index} " in details[0] + " ", details
+            # An unfiltered first page reads the date index in order and stops at the limit
+            allowed = {f"full scan: SCAN Fir_Registration USING INDEX {index}"}
+            assert set(plan_problems(engine.dialect.name, plan)) <= allowed, details
+
+
+def test_fir_query_plans_name_declared_indexes():
+    declared = {ix.name for ix in FirRegistration.__table__.indexes}
+    assert {index for index, _ in fir_query.INDEX_PLANS} <= declared
+
+
+def test_plan_problems_flags_scan_and_filesort():
+    plan = [
+        {"detail": "SCAN Fir_Registration"},
+        {"detail": "SCAN anon_1"},
+        {"detail": "USE TEMP B-TREE FOR ORDER BY"},
+    ]
+    assert plan_problems("sqlite", plan) == [
+        "full scan: SCAN Fir_Registration",
+        "filesort: USE TEMP B-TREE FOR ORDER BY",
+    ]
+    mysql_plan = [{"table": "culprit", "type": "ALL", "Extra": "Using where; Using filesort"}]
+    assert len(plan_problems("mysql", mysql_plan)) == 2
+
+
+def test_index_migrations_backfill_missing_indexes(sqlite_db):
+    engine = sqlite_db.get_bind()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_fir_station_date")
+    assert "ix_fir_station_date" in apply_index_migrations(engine)
+    assert apply_index_migrations(engine) == []
+
+
+def test_column_migrations_add_nullable_columns(sqlite_db):
+    engine = sqlite_db.get_bind()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_fir_geo_cell_date")
+        conn.exec_driver_sql('ALTER TABLE "Fir_Registration" DROP COLUMN geo_cell')
+    assert apply_column_migrations(engine) == ["Fir_Registration.geo_cell"]
+    assert "ix_fir_geo_cell_date" in apply_index_migrations(engine)
+    assert apply_column_migrations(engine) == []
@@ -0,0 +1,183 @@
+# backend/app/tests/unit/test_read_model_unit.py
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.api.routes.firroutes import get_current_citizen, get_current_police
+from app.models.firregistation import FirRegistration, closedFir
+from app.services import versions
+from app.services.read_model import FirReadModel, read_model
+from app.utils.http_cache import version_etag
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+FIR = dict(
+    age=30, gender="M", address="a", contact_number="1", id_proof_type="Aadhar", incident_time=time(10, 0),
+    case_narrative="n",
+)
+PAYLOAD = {
+    "fullname": "Meena Rao", "age": 41, "gender": "F", "address": "addr", "contact_number": "123",
+    "id_proof_type": "Aadhar", "id_proof_value": "999900001111", "incident_date": "2025-02-03",
+    "incident_time": "10:00", "offence_type": "Burglary", "incident_location": "Lake Road",
+    "case_narrative": "house broken into at night",
+}
+
+
+def _seed(db):
+    db.execute(insert(FirRegistration), [
+        dict(
+            FIR, id=f"F{i}", fullname=f"Person {i}", offence_type="Theft" if i % 2 else "Assault",
+            incident_location="Market" if i < 3 else "Station Road", id_proof_value="111122223333" if i < 2 else None,
+            incident_date=date(2025, 1, 1 + i), Stationid=5 if i < 4 else 6,
+        )
+        for i in range(6)
+    ])
+    db.execute(insert(closedFir), [dict(
+        FIR, fir_id="F1", fullname="Person 1", offence_type="Theft", incident_location="Market",
+        incident_date=date(2025, 1, 2), Stationid=5,
+    )])
+    db.commit()
+
+
+@pytest.fixture
+def warm(sqlite_db):
+    _seed(sqlite_db)
+    assert read_model.warm(sqlite_db)
+    yield sqlite_db
+    read_model.reset()
+
+
+def _selects(db):
+    seen = []
+
+    def _before(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _before)
+    return seen, lambda: event.remove(db.get_bind(), "before_cursor_execute", _before)
+
+
+def test_lists_are_served_from_memory(client, warm, dep_override):
+    dep_override(get_current_citizen, lambda: {"citizen_id": 1, "aadhar_no": "111122223333"})
+    seen, stop = _selects(warm)
+    try:
+        everything = client.get("/fir/list", headers=POLICE).json()
+        bounded = client.get("/fir/list", headers=POLICE, params={"date_from": "2025-01-02", "date_to": "2025-01-03"})
+        mine = client.get("/fir/list_by_aadhar").json()
+        found = client.get("/fir/search", params={"q": "station"}).json()
+        station = client.get("/fir/list_by_station", headers=POLICE).json()
+    finally:
+        stop()
+
+    assert len(everything) == 6
+    assert [r["fir_id"] for r in bounded.json()] == ["F1", "F2"]
+    assert [(r["fir_id"], r["status"]) for r in mine] == [("F0", "active"), ("F1", "closed")]
+    assert sorted(r["fir_id"] for r in found) == ["F3", "F4", "F5"]
+    assert [r["fir_id"] for r in station["all"]] == ["F0", "F1", "F2", "F3"]
+    assert [r["fir_id"] for r in station["closed"]] == ["F1"]
+    # Only list_by_station's ETag counter is read from the database
+    assert len(seen) == 1 and "station_list_versions" in seen[0]
+
+
+def test_write_paths_update_the_model(client, warm, dep_override):
+    dep_override(get_current_police, lambda: {"id": 1, "name": "Raj", "station_id": 5})
+
+    fir_id = client.post("/fir/register_incident", json=PAYLOAD).json()["report_id"]
+    assert [r["fir_id"] for r in read_model.by_aadhar("999900001111")] == [fir_id]
+    assert client.post("/fir/close_fir", json={"fir_id": fir_id}).status_code == 200
+
+    assert {r["fir_id"] for r in read_model.by_status("closed")} == {"F1", fir_id}
+    assert read_model.by_station(5)[-1] == {**read_model.by_aadhar("999900001111")[0], "status": "closed"}
+
+
+def test_sync_picks_up_other_workers_writes(warm):
+    versions.bump_station(warm, 6)
+    warm.execute(insert(FirRegistration), [dict(
+        FIR, id="F9", fullname="Elsewhere", offence_type="Theft", incident_location="Pier",
+        incident_date=date(2025, 3, 1), Stationid=6,
+    )])
+    warm.commit()
+
+    assert read_model.search("pier") == []
+    assert read_model.sync(warm) == 1
+    assert [r["fir_id"] for r in read_model.search("pier")] == ["F9"]
+    assert read_model.sync(warm) == 0
+
+
+def test_like_wildcards_and_cold_model_fall_back_to_database(client, sqlite_db):
+    _seed(sqlite_db)
+
+    assert read_model.list_all() is None
+    assert len(client.get("/fir/list", headers=POLICE).json()) == 6
+    # Same rows from the database: status comes from closed_fir there too
+    assert {r["fir_id"]: r["status"] for r in client.get("/fir/search", params={"q": "Market"}).json()} == {
+        "F0": "active", "F1": "closed", "F2": "active",
+    }
+    assert read_model.search("50%") is None
+
+
+def test_memory_budget_switches_model_off(sqlite_db):
+    _seed(sqlite_db)
+    model = FirReadModel(max_bytes=1000)
+
+    assert not model.warm(sqlite_db)
+    assert model.over_budget and not model.ready
+    assert model.list_all() is None and model.stats()["firs"] == 0
+
+
+def test_station_reload_updates_unchanged_rows_in_place(warm, monkeypatch):
+    reindexed = []
+    monkeypatch.setattr(read_model, "_drop", lambda slot, _drop=read_model._drop: (reindexed.append(slot), _drop(slot)))
+
+    warm.query(FirRegistration).filter(FirRegistration.id == "F2").update({FirRegistration.fullname: "Renamed"})
+    warm.query(FirRegistration).filter(FirRegistration.id == "F3").update({FirRegistration.incident_date: date(2024, 6, 1)})
+    warm.add(closedFir(
+        **FIR, fir_id="F0", fullname="Person 0", offence_type="Assault", incident_location="Market",
+        incident_date=date(2025, 1, 1), Stationid=5,
+    ))
+    warm.commit()
+    assert read_model.reload_station(warm, 5) == 4
+
+    # Only F3 moved in the date index; the rename and the close were in-place swaps
+    assert reindexed == [read_model._by_id["F3"]]
+    assert [r["fir_id"] for r in read_model.by_station(5, date_to=date(2024, 12, 31))] == ["F3"]
+    assert {r["fir_id"]: r["fullname"] for r in read_model.search("renamed")} == {"F2": "Renamed"}
+    assert {r["fir_id"] for r in read_model.by_status("closed")} == {"F0", "F1"}
+
+
+def test_warm_builds_the_date_index_in_one_sort(sqlite_db, monkeypatch):
+    _seed(sqlite_db)
+    model = FirReadModel()
+    monkeypatch.setattr("app.services.read_model.insort", lambda *a: pytest.fail("warm-up must not insort"))
+
+    assert model.warm(sqlite_db, batch_size=4)
+    assert list(model._by_date) == sorted(model._by_date)
+    assert [r["fir_id"] for r in model.list_all(date(2025, 1, 2), date(2025, 1, 5))] == ["F1", "F2", "F3", "F4"]
+
+
+def test_station_list_behind_the_database_is_not_served_under_its_etag(client, warm):
+    # Another worker registered F9 and bumped the counter; this worker has not synced yet
+    versions.bump_station(warm, 5)
+    warm.execute(insert(FirRegistration), [dict(
+        FIR, id="F9", fullname="Newcomer", offence_type="Theft", incident_location="Pier",
+        incident_date=date(2025, 3, 1), Stationid=5,
+    )])
+    warm.commit()
+    assert read_model.station_version(5) == 0
+
+    res = client.get("/fir/list_by_station", headers=POLICE)
+    assert res.headers["etag"] == version_etag("station", 5, 1)
+    assert "F9" in [r["fir_id"] for r in res.json()["all"]]
+
+    # Once synced, the model serves it again under the same ETag
+    read_model.sync(warm)
+    assert read_model.station_version(5) == 1
+    seen, stop = _selects(warm)
+    try:
+        again = client.get("/fir/list_by_station", headers=POLICE)
+    finally:
+        stop()
+    assert again.headers["etag"] == res.headers["etag"] and again.json() == res.json()
+    assert len(seen) == 1
@@ -0,0 +1,85 @@
+# backend/app/tests/unit/test_replica_routing_unit.py
+# Primary and replica are two SQLite files; rows differ on purpose so each
+# response shows which database served it.
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.database.connection as connection
+from app.database.connection import Base
+from app.database.routing import ReplicaRouter
+from app.models.firregistation import FirRegistration
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "A", "station_id": 1})}
+OTHER_POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "2", "name": "B", "station_id": 1})}
+
+
+def _engine(path, fir_id):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    s = sessionmaker(bind=engine)()
+    s.add(
+        FirRegistration(
+            id=fir_id, fullname="John", age=30, gender="M", address="a", contact_number="1",
+            id_proof_type="Aadhar", id_proof_value="A1", incident_date=date(2025, 1, 1),
+            incident_time=time(10, 0), offence_type="Theft", incident_location="Market",
+            case_narrative="n", Stationid=1,
+        )
+    )
+    s.commit()
+    s.close()
+    return engine
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    primary = _engine(tmp_path / "primary.db", "PRIMARY")
+    replica = _engine(tmp_path / "replica.db", "REPLICA")
+    r = ReplicaRouter(max_lag=5, sticky_seconds=30, probe_seconds=0)
+    monkeypatch.setattr(connection, "SessionLocal", sessionmaker(bind=primary, autoflush=False))
+    monkeypatch.setattr(connection, "replica_engine", replica)
+    monkeypatch.setattr(connection, "ReplicaSessionLocal", sessionmaker(bind=replica, autoflush=False))
+    monkeypatch.setattr(connection, "replica_router", r)
+    yield r
+    primary.dispose()
+    replica.dispose()
+
+
+def _served_by(client, headers=POLICE):
+    return client.get("/fir/list_by_station", headers=headers).json()["all"][0]["fir_id"]
+
+
+def test_reads_go_to_replica(client, router):
+    assert _served_by(client) == "REPLICA"
+
+
+def test_read_your_writes_after_commit(client, router):
+    res = client.post("/fir/close_fir", json={"fir_id": "PRIMARY"}, headers=POLICE)
+    assert res.status_code == 200
+    assert _served_by(client) == "PRIMARY"
+    # Stickiness is per client; others keep reading from the replica
+    assert _served_by(client, OTHER_POLICE) == "REPLICA"
+
+
+def test_lagging_or_unhealthy_replica_falls_back_to_primary(client, router):
+    router.lag_probe = lambda conn: 60.0
+    assert _served_by(client) == "PRIMARY"
+
+    router.lag_probe = lambda conn: None  # replication stopped
+    assert _served_by(client) == "PRIMARY"
+
+    def _down(conn):
+        raise ConnectionError("replica unreachable")
+    router.lag_probe = _down
+    assert _served_by(client) == "PRIMARY"
+
+    router.lag_probe = lambda conn: 0.5
+    assert _served_by(client) == "REPLICA"
+
+
+def test_read_only_post_uses_replica(client, router):
+    res = client.post("/fir/get_progress", json={"fir_id": "REPLICA"}, headers=POLICE)
+    assert res.status_code == 200
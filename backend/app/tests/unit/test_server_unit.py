@@ -0,0 +1,32 @@
+# backend/app/tests/unit/test_server_unit.py
+from app import server
+from app.database import connection
+
+
+def test_default_workers_is_capped_by_db_connections(monkeypatch):
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 0)
+    monkeypatch.setattr(server, "DB_MAX_CONNECTIONS", 150)
+    monkeypatch.setattr(server, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(server, "DB_MAX_OVERFLOW", 10)
+    assert server.default_workers(cpus=2) == 5
+    assert server.default_workers(cpus=16) == 10  # 150 // 15
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 3)
+    assert server.default_workers(cpus=16) == 3
+
+
+def test_child_forgets_inherited_connections(monkeypatch):
+    calls = []
+
+    class FakeEngine:
+        def __init__(self, name):
+            self.name = name
+
+        def dispose(self, close=True):
+            calls.append((self.name, close))
+
+    monkeypatch.setattr(connection, "engine", FakeEngine("primary"))
+    monkeypatch.setattr(connection, "replica_engine", FakeEngine("replica"))
+    connection.dispose_engines_after_fork()
+    # close=False: the parent still owns those sockets
+    assert calls == [("primary", False), ("replica", False)]
+
@@ -0,0 +1,69 @@
+# backend/app/tests/unit/test_slow_queries_unit.py
+import pytest
+
+from app.api.routes.firroutes import get_current_citizen
+from app.database import slow_queries
+from app.database.slow_queries import SlowQueryLog, fingerprint, rank, read_entries, redact
+
+AADHAAR = "123456789012"
+
+
+@pytest.fixture
+def recorder(sqlite_db, tmp_path):
+    log = SlowQueryLog(threshold_ms=0, path=str(tmp_path / "slow.jsonl"), max_bytes=10 ** 6, backups=2)
+    engine = sqlite_db.get_bind()
+    log.install(engine)
+    yield log
+    log.uninstall(engine)
+
+
+def test_slow_statements_are_logged_with_route_redacted_params_and_plan(client, recorder, dep_override):
+    dep_override(get_current_citizen, lambda: {"citizen_id": 1, "aadhar_no": AADHAAR})
+
+    assert client.get("/fir/list_by_aadhar").status_code == 200
+    recorder.flush()
+
+    raw = open(recorder.path).read()
+    assert AADHAAR not in raw
+    entries = read_entries(recorder.path)
+    select = next(e for e in entries if "Fir_Registration" in e["statement"])
+    assert select["route"] == "GET /fir/list_by_aadhar"
+    assert select["params"] == ["***"]
+    assert select["plan"] and "ix_fir_aadhar_date" in str(select["plan"])
+    assert select["plan_problems"] == []
+
+
+def test_redaction():
+    assert redact({"aadhar_no_1": AADHAAR, "station_id_1": 5, "fullname_1": "Asha"}) == {
+        "aadhar_no_1": "***", "station_id_1": 5, "fullname_1": "***",
+    }
+    # Unnamed values are still scrubbed of anything Aadhaar-shaped
+    assert redact(("x", f"%{AADHAAR}%", 123456789012)) == ["x", "%***%", "***"]
+    assert redact([{"contact_number": "9"}, {"contact_number": "8"}]) == {
+        "first": {"contact_number": "***"}, "rows": 2,
+    }
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    a = fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND n = 5")
+    b = fingerprint("SELECT *  FROM t\nWHERE id IN (?) AND n = 7")
+    assert a == b
+    assert a != fingerprint("SELECT * FROM u WHERE id IN (?)")
+
+
+def test_rank_orders_by_total_time_across_rotated_files(tmp_path, capsys):
+    log = SlowQueryLog(threshold_ms=0, path=str(tmp_path / "slow.jsonl"), max_bytes=600, backups=5)
+    for i in range(6):
+        log._write({"fingerprint": "a", "duration_ms": 10.0, "route": "GET /fir/search", "statement": "SELECT a"})
+    log._write({"fingerprint": "b", "duration_ms": 45.0, "route": "POST /government/governmentsearchfir",
+                "statement": "SELECT b"})
+    log.flush()
+    assert len(list(tmp_path.iterdir())) > 1
+
+    ranked = rank(read_entries(log.path))
+    assert [(g["fingerprint"], g["count"], g["total_ms"]) for g in ranked] == [("a", 6, 60.0), ("b", 1, 45.0)]
+    assert [g["fingerprint"] for g in rank(read_entries(log.path), route="government")] == ["b"]
+
+    slow_queries.main(["--log", log.path, "--top", "1"])
+    out = capsys.readouterr().out
+    assert "count     6" in out and "GET /fir/search" in out and "SELECT b" not in out
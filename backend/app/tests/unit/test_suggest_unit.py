@@ -0,0 +1,106 @@
+# backend/app/tests/unit/test_suggest_unit.py
+import random
+import time as clock
+from datetime import date, time
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.firregistation import FirRegistration
+from app.services.suggest import PrefixIndex, suggester
+from app.utils.security import create_access_token
+
+POLICE = {"Authorization": "Bearer " + create_access_token({"sub": "1", "name": "Raj", "station_id": 5})}
+FIR = dict(
+    age=30, gender="M", address="a", contact_number="1", id_proof_type="Aadhar", incident_date=date(2025, 1, 1),
+    incident_time=time(10, 0), case_narrative="n", Stationid=5,
+)
+OFFENCES = ["Theft"] * 5 + ["theft "] * 2 + ["Theft of vehicle"] * 3 + ["Trespass"] * 4 + ["Chain  snatching"]
+
+
+@pytest.fixture
+def seeded(sqlite_db):
+    sqlite_db.execute(insert(FirRegistration), [
+        dict(FIR, id=f"F{i}", fullname=f"Person {i % 3}", offence_type=o, incident_location="MG Road")
+        for i, o in enumerate(OFFENCES)
+    ])
+    sqlite_db.commit()
+    yield sqlite_db
+    suggester.reset()
+
+
+def _values(res):
+    return [(s["value"], s["count"]) for s in res.json()["suggestions"]]
+
+
+def test_ranked_by_frequency_with_spellings_merged(client, seeded):
+    suggester.warm(seeded)
+    res = client.get("/fir/suggest/offence_type", params={"q": "t"}, headers=POLICE)
+    assert res.status_code == 200
+    assert _values(res) == [("Theft", 7), ("Trespass", 4), ("Theft of vehicle", 3)]
+    res = client.get("/fir/suggest/offence_type", params={"q": "chain sn"}, headers=POLICE)
+    assert _values(res) == [("Chain snatching", 1)]
+
+
+def test_registration_updates_the_index(client, seeded):
+    suggester.warm(seeded)
+    payload = {
+        "fullname": "Meena Rao", "age": 41, "gender": "F", "address": "addr", "contact_number": "123",
+        "id_proof_type": "Aadhar", "id_proof_value": "999900001111", "incident_date": "2025-02-03",
+        "incident_time": "10:00", "offence_type": "Trespass", "incident_location": "Lake Road",
+        "case_narrative": "entered the compound at night",
+    }
+    for _ in range(4):
+        assert client.post("/fir/register_incident", json=payload, headers=POLICE).status_code == 200
+
+    assert _values(client.get("/fir/suggest/offence_type", params={"q": "t", "limit": 2}, headers=POLICE)) == [
+        ("Trespass", 8), ("Theft", 7),
+    ]
+    assert _values(client.get("/fir/suggest/incident_location", params={"q": "l"}, headers=POLICE)) == [
+        ("Lake Road", 4),
+    ]
+    assert _values(client.get("/fir/suggest/fullname", params={"q": "meena"}, headers=POLICE)) == [
+        ("Meena Rao", 4),
+    ]
+
+
+def test_database_fallback_until_warm(client, seeded):
+    assert not suggester.ready
+    res = client.get("/fir/suggest/offence_type", params={"q": "theft"}, headers=POLICE)
+    assert _values(res)[0] == ("Theft", 5)
+    # LIKE wildcards in the prefix are literal
+    assert _values(client.get("/fir/suggest/offence_type", params={"q": "%"}, headers=POLICE)) == []
+
+
+def test_route_validation(client, seeded):
+    assert client.get("/fir/suggest/offence_type", params={"q": "t"}).status_code == 401
+    assert client.get("/fir/suggest/address", params={"q": "t"}, headers=POLICE).status_code == 422
+    assert client.get("/fir/suggest/fullname", params={"q": "t", "limit": 50}, headers=POLICE).status_code == 422
+
+
+def test_cached_and_scanned_prefixes_agree():
+    rng = random.Random(7)
+    words = ["ram", "raj", "rani", "ravi", "rahul", "rakesh", "rajesh", "ramesh"]
+    values = [f"{rng.choice(words)} {rng.choice(words)}" for _ in range(3000)]
+    built = PrefixIndex.build([(v, values.count(v)) for v in set(values)], top_k=5)
+    grown = PrefixIndex(top_k=5)
+    for v in values:
+        grown.add(v)
+    for prefix in ("r", "ra", "raj", "rajesh r", "ram ra"):
+        expected = built.suggest(prefix, 5)
+        assert grown.suggest(prefix, 5) == expected
+        # Past the cache: ranked from the sorted key range
+        assert grown.suggest(prefix, 6)[:5] == expected
+
+
+def test_suggest_stays_under_a_millisecond():
+    rng = random.Random(1)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    index = PrefixIndex.build(
+        ("".join(rng.choice(letters) for _ in range(rng.randint(4, 12))), rng.randint(1, 50)) for _ in range(100000)
+    )
+    prefixes = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 5))) for _ in range(500)]
+    started = clock.perf_counter()
+    for p in prefixes:
+        index.suggest(p, 10)
+    assert (clock.perf_counter() - started) / len(prefixes) < 0.001
@@ -0,0 +1,110 @@
+# backend/app/tests/unit/test_tokens_unit.py
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.auth_token import RefreshToken, RevokedToken
+from app.models.government import government
+from app.models.policemember import PoliceMember
+from app.services.revocation import BloomFilter, RevocationList, revocation_list
+from app.utils.security import create_access_token, verify_access_token
+
+
+@pytest.fixture(autouse=True)
+def _clean_revocations():
+    yield
+    revocation_list.reset()
+
+
+def _login(client, db):
+    db.add(PoliceMember(member_id=1, name="Raj", password="pw", station_id=5))
+    db.commit()
+    res = client.post("/policeauth/policeauth", json={"member_id": 1, "station_id": 5, "password": "pw"})
+    assert res.status_code == 200
+    return res.json()
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_refresh_rotates_and_reuse_revokes_the_family(client, sqlite_db):
+    first = _login(client, sqlite_db)
+    assert first["refresh_token"] and first["expires_in"] == 15 * 60
+
+    second = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert second.status_code == 200
+    pair = second.json()
+    assert client.get("/policeauth/allmembers", headers=_bearer(pair["access_token"])).status_code == 200
+
+    # The first token is replayed: someone else has it, so the family dies
+    replay = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert replay.status_code == 401 and "reuse" in replay.json()["detail"]
+    assert client.post("/auth/refresh", json={"refresh_token": pair["refresh_token"]}).status_code == 401
+    assert sqlite_db.query(RefreshToken).filter(RefreshToken.revoked_at.is_(None)).count() == 0
+
+
+def test_refresh_token_is_not_an_access_token(client, sqlite_db):
+    tokens = _login(client, sqlite_db)
+    assert client.get("/fir/list_by_station", headers=_bearer(tokens["refresh_token"])).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["access_token"]}).status_code == 401
+
+
+def test_revoked_officer_is_rejected_without_a_database_read(client, sqlite_db):
+    tokens = _login(client, sqlite_db)
+    sqlite_db.add(government(government_member_id=9, password="pw"))
+    sqlite_db.commit()
+    gov = client.post("/government/governmentAuth", json={"government_member_id": 9, "password": "pw"}).json()
+
+    res = client.post("/auth/revoke", json={"subject_type": "police", "subject_id": "1"},
+                      headers=_bearer(gov["access_token"]))
+    assert res.json() == {"subject": "police:1", "refresh_tokens_revoked": 1}
+
+    seen = []
+    listener = lambda conn, cursor, statement, *a: seen.append(statement)  # noqa: E731
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert client.get("/fir/list_by_station", headers=_bearer(tokens["access_token"])).status_code == 401
+    finally:
+        event.remove(sqlite_db.get_bind(), "before_cursor_execute", listener)
+    assert seen == []
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    # Other officers are unaffected
+    assert verify_access_token(create_access_token({"sub": "2", "name": "B", "station_id": 5}))
+
+
+def test_logout_revokes_the_presented_token(client, sqlite_db):
+    tokens = _login(client, sqlite_db)
+    headers = _bearer(tokens["access_token"])
+
+    assert client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers).status_code == 200
+    assert client.get("/policeauth/allmembers", headers=headers).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_other_workers_pick_up_revocations_on_sync(sqlite_db):
+    other = RevocationList(bloom_bits=1024)
+    token = create_access_token({"sub": "3", "name": "C", "station_id": 1})
+    payload = verify_access_token(token)
+    sqlite_db.add(RevokedToken(kind="jti", value=payload["jti"], expires_at=datetime.utcnow() + timedelta(minutes=5)))
+    sqlite_db.add(RevokedToken(kind="jti", value="gone", expires_at=datetime.utcnow() - timedelta(minutes=5)))
+    sqlite_db.commit()
+
+    assert not other.is_revoked(payload["jti"], "police:3", payload["iat"])
+    assert other.sync(sqlite_db) == 1  # the expired row is skipped on the first load
+    assert other.is_revoked(payload["jti"], "police:3", payload["iat"])
+    assert not other.is_revoked("unrelated", "police:3", payload["iat"])
+
+    other.prune(now=time.time() + 3600)
+    assert not other.is_revoked(payload["jti"], "police:3", payload["iat"])
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(bits=4096)
+    keys = [f"jti-{i}" for i in range(200)]
+    for k in keys:
+        bloom.add(k)
+    assert all(k in bloom for k in keys)
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 100
@@ -1 +1,2 @@
-from app.utils import security
\ No newline at end of file
+from app.utils import security
+from app.utils import http_cache
@@ -1,10 +1,15 @@
 from datetime import datetime, timedelta
+from typing import Optional
+import uuid
+
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from app.services.revocation import revocation_list
+
 SECRET_KEY = "hackathon-secret-key"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -14,14 +19,48 @@ def hash_password(password: str):
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
-def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+def subject_of(claims: dict) -> Optional[str]:
+    """"police:12" / "citizen:7" / "government:3": what a subject revocation is keyed on."""
+    if claims.get("subj"):
+        return claims["subj"]
+    if claims.get("government_member_id"):
+        return f"government:{claims['government_member_id']}"
+    if claims.get("citizen_id") is not None:
+        return f"citizen:{claims['citizen_id']}"
+    if claims.get("sub") is not None:
+        return f"police:{claims['sub']}"
+    return None
+
+def _encode(claims: dict, lifetime: timedelta) -> str:
+    now = datetime.utcnow()
+    to_encode = {**claims, "iat": now, "exp": now + lifetime}
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def create_access_token(data: dict):
+    return _encode(data, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+def create_refresh_token(jti: str, family: str, subject: str):
+    # Carries no role claims: those are re-read from refresh_tokens on use
+    return _encode(
+        {"typ": "refresh", "jti": jti, "fam": family, "subj": subject},
+        timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+def decode_access_token(token: str) -> dict:
+    """
+    Signature, expiry and revocation check; raises JWTError. Runs on every
+    authenticated request, so it never touches the database.
+    """
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("typ") == "refresh":
+        raise JWTError("Refresh tokens cannot be used as access tokens")
+    if revocation_list.is_revoked(payload.get("jti"), subject_of(payload), payload.get("iat")):
+        raise JWTError("Token has been revoked")
+    return payload
+
 def verify_access_token(token: str):
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return decode_access_token(token)
     except JWTError:
         return None
@@ -376,7 +376,11 @@ export default function PoliceDashboard() {
         <div className="member-list">
           {members?.length ? (
             members.map((m, i) => (
-              <div key={`${m.name}-${i}`} className="member-card" title={m.name}>
+              <div
+                key={`${m.name}-${i}`}
+                className="member-card"
+                title={m.open_cases != null ? `${m.name} · ${m.open_cases} open cases` : m.name}
+              >
                 {m.name}
               </div>
             ))
@@ -8,4 +8,42 @@ const api = axios.create({
   headers: { "Content-Type": "application/json" },
 });
 
+// Access tokens are short-lived: on a 401, trade the stored refresh token
+// for a new pair once and replay the request. Concurrent 401s share one
+// refresh, since each refresh token can only be used once.
+let refreshing = null;
+
+api.interceptors.response.use(
+  (res) => res,
+  async (error) => {
+    const original = error.config;
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (
+      error.response?.status !== 401 ||
+      !refreshToken ||
+      !original ||
+      original._retried ||
+      original.url === "/auth/refresh"
+    ) {
+      return Promise.reject(error);
+    }
+    original._retried = true;
+    refreshing =
+      refreshing ||
+      api.post("/auth/refresh", { refresh_token: refreshToken }).finally(() => {
+        refreshing = null;
+      });
+    try {
+      const { data } = await refreshing;
+      localStorage.setItem("token", data.access_token);
+      localStorage.setItem("refresh_token", data.refresh_token);
+      original.headers = { ...original.headers, Authorization: `Bearer ${data.access_token}` };
+      return api(original);
+    } catch {
+      localStorage.removeItem("refresh_token");
+      return Promise.reject(error);
+    }
+  }
+);
+
 export default api;
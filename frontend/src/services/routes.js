@@ -19,6 +19,7 @@ export async function citizenAuth(payload) {
   if (data?.access_token) {
     localStorage.setItem("token", data.access_token);
     localStorage.setItem("role", "citizen");
+    if (data.refresh_token) localStorage.setItem("refresh_token", data.refresh_token);
   }
 
   if (data?.citizen_id || data?.aadhar_no) {
@@ -34,6 +35,11 @@ export async function citizenAuth(payload) {
   return data;
 }
 
+export async function getCitizenDashboard(params = {}) {
+  const res = await api.get("/citizen/dashboard", { params, headers: authHeaders() });
+  return res.data; // { total, limit, offset, firs: [...] }
+}
+
 /* ====================== POLICE ====================== */
 export async function addPoliceMember(payload) {
   const res = await api.post("/policeauth/addpolicemember", payload);
@@ -47,6 +53,7 @@ export async function policeAuth(payload) {
   if (data?.access_token) {
     localStorage.setItem("token", data.access_token);
     localStorage.setItem("role", "police");
+    if (data.refresh_token) localStorage.setItem("refresh_token", data.refresh_token);
   }
   if (data?.name || data?.station_id || data?.police_member_id) {
     localStorage.setItem(
@@ -77,11 +84,25 @@ export async function addProgress(payload) {
   return res.data; // { progress: [...] }
 }
 
+export async function addProgressBatch(payload) {
+  const res = await api.post("/fir/add_progress_batch", payload, { headers: authHeaders() });
+  return res.data; // { progress_ids, progress_culprit_ids, culprit_ids }
+}
+
 export async function getProgress(payload) {
   const res = await api.post("/fir/get_progress", payload, { headers: authHeaders() });
   return res.data; // { progress: [...] }
 }
 
+// field: "offence_type" | "incident_location" | "fullname"
+export async function suggest(field, q, limit = 10) {
+  const res = await api.get(`/fir/suggest/${field}`, {
+    params: { q, limit },
+    headers: authHeaders(),
+  });
+  return res.data?.suggestions || []; // [{ value, count }]
+}
+
 export async function getFIRDetails(fir_id) {
   const res = await api.get(`/fir/details`, {
     params: { fir_id },
@@ -144,6 +165,7 @@ export async function governmentAuth(payload) {
   if (data?.access_token) {
     localStorage.setItem("token", data.access_token);
     localStorage.setItem("role", "government");
+    if (data.refresh_token) localStorage.setItem("refresh_token", data.refresh_token);
   }
   return data;
 }
@@ -159,6 +181,7 @@ const routes = {
   // Citizen
   addCitizen,
   citizenAuth,
+  getCitizenDashboard,
 
   // Police
   addPoliceMember,
@@ -168,7 +191,9 @@ const routes = {
   // FIR
   registerIncident,
   addProgress,
+  addProgressBatch,
   getProgress,
+  suggest,
   getFIRDetails,
   closeFIR,
   getFIRsByStation,